@@ -0,0 +1,228 @@
+"""
+Benchmark every stage of the fitting pipeline, for each root type 41, ..., 49.
+
+Moment vectors of each type are generated from a density of that type: the roots of
+c0 + c1 x + ... + c4 x^4 are placed at a distance from 0, such that near 0 the
+density is close to the standard normal, and the first eight moments are integrated
+numerically. Types 41, 43, 45, 46, 47 and 48 have repeated roots, which a fit from
+moments resolves only to about 1e-8, so those moment vectors are fitted as one of
+the types 42, 44 and 49, see the column ``fitted``. The stages after the roots are
+therefore also timed on the exact roots and coefficients of the generating density,
+such that every type-specific code path is covered.
+
+The stages ``Pdf``, ``Support8`` and ``Pearson8`` build a new object on every call,
+so ``Support8`` includes ``Pdf`` and ``Pearson8`` is the full fit with its support.
+
+Usage::
+
+    python script/benchmark.py --out bench-1.0.json
+    python script/benchmark.py --out bench-1.1.json --compare bench-1.0.json
+
+The stored JSON holds the time per call of every (type, stage), the versions and the
+platform, such that runs of different releases can be compared.
+"""
+import argparse
+import json
+import platform
+import time
+import timeit
+import warnings
+
+import numpy as np
+
+import pearsondist
+from pearsondist import Pearson8, Pearson8Batch, Support8
+from pearsondist.adjust_lb_ub import adjust_lb_ub
+from pearsondist.pdf import Pdf
+from pearsondist.pfdecom4 import PFDecom4
+from pearsondist.quadrature import adaptive_quad
+from pearsondist.quartic import quartic_roots
+from pearsondist.rootcatalog4 import RootCatalog4
+
+TYPES = (41, 42, 43, 44, 45, 46, 47, 48, 49)
+
+STAGES = ('mom_to_coef', 'quartic_roots', 'RootCatalog4', 'PFDecom4', 'Pdf', 'pdf_scalar',
+          'pdf_grid', 'Support8', 'adjust_lb_ub', 'Pearson8', 'fit_many')
+
+
+def roots_of_type(type_no, rng):
+    """Roots of the given type, away from 0
+
+    Real roots bounding the support on both sides are 6 to 10 away from 0, the other
+    roots 15 to 30, such that the density is negligible where Q(x) departs from 1.
+    """
+    def near():
+        return rng.uniform(6, 10)
+
+    def far():
+        return rng.uniform(15, 25)
+
+    def pair():
+        w = complex(rng.uniform(-20, 20), rng.uniform(20, 30))
+        return [w, w.conjugate()]
+
+    if type_no == 41:
+        z = pair() * 2
+    elif type_no == 42:
+        z = pair() + pair()
+    elif type_no == 43:
+        x1 = far() * rng.choice([-1, 1])
+        z = [x1, x1] + pair()
+    elif type_no == 44:
+        z = [-near(), near()] + pair()
+    elif type_no == 45:
+        z = [far() * rng.choice([-1, 1])] * 4
+    elif type_no == 46:
+        x1, x4 = -near(), near()
+        z = [x1, x1, x1, x4] if rng.random() < 0.5 else [x4, x4, x4, x1]
+    elif type_no == 47:
+        x1, x3 = -near(), near()
+        z = [x1, x1, x3, x3]
+    elif type_no == 48:
+        x1, x3 = -near(), near()
+        z = [x1, x1, x3, x3 + near()]
+    elif type_no == 49:
+        x1, x2 = -near(), near()
+        z = [x1 - near(), x1, x2, x2 + near()]
+    else:
+        raise ValueError(f'unknown root type: {type_no}')
+    return np.array(z, dtype=complex)
+
+
+def density_of_type(type_no, rng):
+    """Coefficients, exact roots and PDF of a density of the given type
+
+    :return: coefficients a, c0, ..., c4, roots ordered as by RootCatalog4, and the Pdf.
+    :rtype: tuple
+    """
+    z = roots_of_type(type_no, rng)
+    c4 = 1.0 / np.prod(-z).real  # such that c0 = 1
+    c = (np.poly(z).real * c4)[::-1]  # c0, ..., c4
+    coef = [rng.normal(0, 0.3)] + list(c)
+    pfd = PFDecom4(coef, z, type_no).pfd
+    return coef, z, Pdf(pfd, coef)
+
+
+def integration_range(z, pdf_obj, tiny=1e-30):
+    """Where the density is above ``tiny``, up to the real roots nearest to 0"""
+    real = z.real[z.imag == 0]
+    ends = []
+    for side in (-1, 1):
+        roots = real[real * side > 0]
+        limit = np.min(np.abs(roots)) if len(roots) else 2 * np.max(np.abs(z))
+        x = side * np.linspace(0, limit, 4001)[1:]
+        small = np.flatnonzero(~(pdf_obj.pdf(x) > tiny))
+        ends.append(x[small[0]] if len(small) else x[-1])
+    return ends
+
+
+def moments_of_type(type_no, rng):
+    """The first eight raw moments of a density of the given type, and its coefficients"""
+    coef, z, pdf_obj = density_of_type(type_no, rng)
+    lb, ub = integration_range(z, pdf_obj)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # tolerances at the limit of double precision
+        norm, _ = adaptive_quad(pdf_obj.pdf, lb, ub, rtol=1e-14)
+        mom = [adaptive_quad(lambda x, n=n: x ** n * pdf_obj.pdf(x), lb, ub, rtol=1e-14)[0]
+               / norm for n in range(1, 9)]
+    return mom, coef, z, pdf_obj
+
+
+def per_call(stmt, repeat):
+    """Best time per call of ``stmt`` over ``repeat`` rounds, in seconds"""
+    timer = timeit.Timer(stmt)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def bench_type(type_no, rng, grid_size, batch_size, repeat):
+    """Time per call of every stage for one density of the given type"""
+    mom, coef, z, pdf_obj = moments_of_type(type_no, rng)
+    fitted = Pearson8(mom)
+    shuffled = z[rng.permutation(4)]
+    support = Support8(pdf_obj)
+    lb, ub = support.lower_bound, support.upper_bound
+    grid = np.linspace(*adjust_lb_ub(lb, ub, pdf_obj.pfd), grid_size)
+    batch = np.tile(mom, (batch_size, 1))
+    bare = Pearson8.__new__(Pearson8)
+    bare.mom = mom
+
+    stages = {
+        'mom_to_coef': bare.mom_to_coef,
+        'quartic_roots': lambda: quartic_roots(coef[:0:-1]),
+        'RootCatalog4': lambda: RootCatalog4(shuffled),
+        'PFDecom4': lambda: PFDecom4(coef, z, type_no),
+        # a fresh Pdf or Pearson8 per call, the terms, scale, is_max, extrema of dpdf
+        # and bounds of one are computed once, then kept
+        'Pdf': lambda: Pdf(pdf_obj.pfd, coef).pdf(0.1),
+        'pdf_scalar': lambda: pdf_obj.pdf(0.1),
+        'pdf_grid': lambda: pdf_obj.pdf(grid),
+        'Support8': lambda: Support8(Pdf(pdf_obj.pfd, coef)),
+        'adjust_lb_ub': lambda: adjust_lb_ub(lb, ub, pdf_obj.pfd),
+        'Pearson8': lambda: Pearson8(mom).determine_bounds(),
+        'fit_many': lambda: Pearson8Batch(batch),
+    }
+    times = {name: per_call(stmt, repeat) for name, stmt in stages.items()}
+    times['fit_many'] /= batch_size  # per moment vector
+    return {'fitted': fitted.pfd['type'], 'seconds': times}
+
+
+def compare(results, baseline):
+    """Print the ratio of every time to that of the baseline run"""
+    print(f"\nratio to {baseline['meta']['version']} ({baseline['meta']['date']}), "
+          f"> 1 is slower")
+    print('stage'.ljust(14) + ''.join(str(t).rjust(8) for t in TYPES))
+    for stage in STAGES:
+        row = []
+        for t in TYPES:
+            old = baseline['results'].get(str(t), {}).get('seconds', {}).get(stage)
+            new = results[str(t)]['seconds'][stage]
+            row.append(f'{new / old:8.2f}' if old else ' ' * 7 + '-')
+        print(stage.ljust(14) + ''.join(row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--out', help='JSON file to store the results in')
+    parser.add_argument('--compare', help='JSON file of a previous run to compare with')
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--grid', type=int, default=10 ** 6, help='size of the large grid')
+    parser.add_argument('--batch', type=int, default=10 ** 4, help='rows of fit_many')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    results = {str(t): bench_type(t, rng, args.grid, args.batch, args.repeat) for t in TYPES}
+
+    print('time per call in microseconds, pdf_grid per grid, fit_many per row')
+    print('stage'.ljust(14) + ''.join(str(t).rjust(8) for t in TYPES))
+    for stage in STAGES:
+        print(stage.ljust(14) + ''.join(f"{results[str(t)]['seconds'][stage] * 1e6:8.1f}"
+                                        for t in TYPES))
+    print('fitted'.ljust(14) + ''.join(str(results[str(t)]['fitted']).rjust(8) for t in TYPES))
+    dominant = {t: max(('mom_to_coef', 'PFDecom4', 'Pdf', 'Support8', 'adjust_lb_ub'),
+                       key=results[str(t)]['seconds'].get) for t in TYPES}
+    print('dominant stage of a fit and its support:', dominant)
+
+    meta = {'version': getattr(pearsondist, '__version__', None) or _version(),
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'), 'numpy': np.__version__,
+            'python': platform.python_version(), 'machine': platform.platform(),
+            'seed': args.seed, 'grid': args.grid, 'batch': args.batch}
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+def _version():
+    try:
+        from importlib.metadata import version
+        return version('pearsondist')
+    except Exception:
+        return 'unknown'
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,8 @@
 # install in development/editable mode
 # pip install -e .
 from .pearson8 import Pearson8
+from .accumulator import MomentAccumulator
+from .fitcache import FitCache
+from .pearson8batch import Pearson8Batch
+from .rolling8 import Rolling8
 from .support8 import Support8
\ No newline at end of file
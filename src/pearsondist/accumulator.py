@@ -0,0 +1,161 @@
+"""
+Moments of large samples in one pass, from chunks merged as they come.
+"""
+import math
+
+import numpy as np
+
+from pearsondist.pearson8 import Pearson8
+
+
+class MomentAccumulator:
+    r"""Class for the running moments of a sample, up to a given order
+
+    Each chunk is reduced to its size, mean and central power sums
+    :math:`M_p = \sum (x - \bar{x})^p`, which are then merged into the running ones by
+    the pairwise formulas of Pébay (2008). Since central sums never hold the large powers
+    of the raw data, high orders keep their precision where raw power sums cancel.
+    Accumulators of different chunks, threads or processes (they pickle) merge likewise,
+    in any order.
+    """
+
+    order: int = None
+    """highest order of the moments"""
+    n: int = 0
+    """number of data points so far"""
+    mean: float = 0.0
+    """mean of the data so far"""
+    sums: np.ndarray = None
+    r""":math:`M_p` of the data so far, indexed by p = 0, ..., order, the first two 0"""
+
+    def __init__(self, order=8):
+        """Initialize MomentAccumulator object
+
+        :param int order: highest order of the moments, at least 2.
+        """
+        if order < 2:
+            raise ValueError(f'order = {order} < 2')
+        self.order = order
+        self.sums = np.zeros(order + 1)
+
+    def update(self, x):
+        """Add a chunk of data
+
+        :param x: data points, any shape, flattened.
+        :return: self
+        :rtype: MomentAccumulator
+        """
+        x = np.asarray(x, dtype=float).reshape(-1)
+        if not len(x):
+            return self
+        chunk = MomentAccumulator(self.order)
+        chunk.n, chunk.mean = len(x), float(x.mean())
+        d = x - chunk.mean
+        power = d * d
+        for p in range(2, self.order + 1):
+            if p > 2:
+                power *= d
+            chunk.sums[p] = power.sum()
+        return self.merge(chunk)
+
+    def consume(self, data, chunk_size=2 ** 16):
+        """Add the data of an iterable, e.g., a generator, of chunks or single points
+
+        Single points are buffered into chunks of ``chunk_size``, such that the data are
+        never held in memory at once.
+
+        :param data: iterable of arrays or numbers.
+        :param int chunk_size: number of single points per chunk.
+        :return: self
+        :rtype: MomentAccumulator
+        """
+        buffer = []
+        for item in data:
+            if np.ndim(item) == 0:
+                buffer.append(item)
+                if len(buffer) >= chunk_size:
+                    self.update(buffer)
+                    buffer = []
+            else:
+                self.update(item)
+        return self.update(buffer)
+
+    def merge(self, other):
+        """Add the data of another accumulator of the same order
+
+        :param MomentAccumulator other: accumulator to merge, left unchanged.
+        :return: self
+        :rtype: MomentAccumulator
+        """
+        if other.order != self.order:
+            raise ValueError(f'cannot merge orders {other.order} and {self.order}')
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.sums = other.n, other.mean, other.sums.copy()
+            return self
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        sa, sb = self.sums, other.sums
+        sums = np.zeros_like(sa)
+        for p in range(2, self.order + 1):
+            total = sa[p] + sb[p]
+            for k in range(1, p - 1):
+                total += (math.comb(p, k) * delta ** k
+                          * ((-nb / n) ** k * sa[p - k] + (na / n) ** k * sb[p - k]))
+            total += (na * nb / n * delta) ** p * (nb ** (1 - p) - (-na) ** (1 - p))
+            sums[p] = total
+        self.n, self.mean, self.sums = n, self.mean + delta * nb / n, sums
+        return self
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def copy(self):
+        """Independent copy of the accumulator"""
+        new = MomentAccumulator(self.order)
+        new.n, new.mean, new.sums = self.n, self.mean, self.sums.copy()
+        return new
+
+    def central(self):
+        """Central moments of orders 1, ..., order, the first 0
+
+        :rtype: list
+        """
+        if self.n == 0:
+            raise ValueError('no data')
+        return [float(s) / self.n for s in self.sums[1:]]
+
+    def standardized(self):
+        """Raw moments of the standardized data, of orders 1, ..., order, the first two 0, 1
+
+        :rtype: list
+        """
+        central = self.central()
+        std = math.sqrt(central[1])
+        if std == 0:
+            raise ValueError('var = 0')
+        return [c / std ** p for p, c in enumerate(central, start=1)]
+
+    def raw(self):
+        """Raw moments of orders 1, ..., order, e.g., for :py:class:`Pearson8`
+
+        :rtype: list
+        """
+        mu = [1.0] + self.central()
+        return [sum(math.comb(p, k) * self.mean ** (p - k) * mu[k] for k in range(p + 1))
+                for p in range(1, self.order + 1)]
+
+    def fit(self):
+        """Pearson distribution matching the moments of the data
+
+        Fitted on the standardized moments, see :py:meth:`Pearson8.from_standard`, which
+        skips the round trip through raw moments.
+
+        :rtype: Pearson8
+        """
+        if self.order < 8:
+            raise ValueError('fit expects an order of at least 8')
+        std = math.sqrt(self.central()[1])
+        return Pearson8.from_standard(Pearson8(self.standardized()[:8]), self.mean, std)
@@ -3,90 +3,76 @@ Adjust the lower and upper bound of the Pearson distribution
 according to the Partial Fraction Decomposition, i.e.,
 the type of the roots.
 """
+import math
 
-def adjust_lb_ub(lb, ub, pfd):
-    # assume the support lb < 0 < ub
-    if lb >= 0.0 or ub <= 0.0:
-        raise ValueError(f'lb({lb:.7f}) >= 0.0 or ub({ub:.7f}) <= 0.0')
-    lbub = [lb, ub]
-    type_pfd = pfd['type']
-    if type_pfd == 43 or type_pfd == 45:
-        # two real: x1 = x2 or 4 real: x1 = x2 = x3 = x4
-        x1 = pfd['x1']
-        if 0.0 <= x1:
-            if ub >= x1: lbub[1] = x1 - 1.0e-5
-        else:
-            if x1 >= lb: lbub[0] = x1 + 1.0e-5
-    elif type_pfd == 44:
-        # two real: x1 < x2
-        x1 = pfd['x1']; x2 = pfd['x2']
-        return adjust_lb_ub_2(lb, ub, x1, x2)
-    elif type_pfd == 46:
-        # x1 = x2 = x3 != x4 | x2 = x3 = x4 != x1
-        x1 = pfd['x1']; x4 = pfd['x4']
-        if x1 < x4:
-            return adjust_lb_ub_2(lb, ub, x1, x4)
-        else:
-            return adjust_lb_ub_2(lb, ub, x4, x1)
-    elif type_pfd == 47:
-        # x1 = x2 < x3 = x4
-        x1 = pfd['x1']; x3 = pfd['x3']
-        return adjust_lb_ub_2(lb, ub, x1, x3)
-    elif type_pfd == 48:
-        # x1 = x2 != x3 != x4 | x2 = x3 != x1 != x4 | x3 = x4 != x1 != x2
-        x1 = pfd['x1']; x3 = pfd['x3']; x4 = pfd['x4']
-        x = sorted([x1, x3, x4])
-        return adjust_lb_ub_3(lb, ub, x[0], x[1], x[2])
-    elif type_pfd == 49:
-        # x1 != x2 != x3 != x4
-        x1 = pfd['x1']; x2 = pfd['x2']; x3 = pfd['x3']; x4 = pfd['x4']
-        return adjust_lb_ub_4(lb, ub, x1, x2, x3, x4)
-    return lbub
+import numpy as np
 
+from pearsondist.pfdecom4 import PFD_ROOTS
 
-def trunc_lb_ub(lb, ub, x1, x2):
-    # x1 < 0 < x2
-    lbub = [lb, ub]
-    if x1 >= lb: lbub[0] = x1 + 1.0e-5
-    if x2 <= ub: lbub[1] = x2 - 1.0e-5
-    return lbub
 
+def _real_roots(pfd):
+    # the real roots as Python floats, see real_roots
+    return [float(pfd[key]) for key, _, is_complex in PFD_ROOTS[pfd['type']]
+            if not is_complex]
 
-def adjust_lb_ub_2(lb, ub, x1, x2):
-    # x1 < x2
-    lbub = [lb, ub]
-    if 0.0 <= x1:
-        if ub >= x1: lbub[1] = x1 - 1.0e-5
-    elif x2 <= 0.0:
-        if x2 >= lb: lbub[0] = x2 + 1.0e-5
-    else:
-        return trunc_lb_ub(lb, ub, x1, x2)
-    return lbub
 
+def real_roots(pfd):
+    """Distinct real roots of c0 + c1 x + ... + c4 x^4 in a pfd dict
+
+    :param dict pfd: partial fraction decomposition.
+    :return: real roots, shape (k,) with k = 0, ..., 4.
+    :rtype: np.ndarray
+    """
+    return np.array(_real_roots(pfd), dtype=float)
+
+
+def adjust_lb_ub_many(lb, ub, roots, margin=1.0e-5):
+    """Adjust many supports at once to the real roots nearest to 0
+
+    The nearest real root below 0 raises the lower bound, and the nearest one at or
+    above 0 lowers the upper bound, to ``margin`` inside the root, if the root is
+    within the bounds. The same rule as :py:func:`adjust_lb_ub` for all root types.
+
+    :param lb: lower bounds, shape (N,).
+    :param ub: upper bounds, shape (N,).
+    :param roots: real roots of each fit, NaN for the missing or complex ones, shape (N, k).
+    :param float margin: distance kept from the roots.
+    :return: adjusted lower and upper bounds, each of shape (N,).
+    :rtype: tuple
+    """
+    roots = np.asarray(roots, dtype=float)
+    below = np.where(roots < 0.0, roots, -np.inf).max(axis=1, initial=-np.inf)
+    above = np.where(roots >= 0.0, roots, np.inf).min(axis=1, initial=np.inf)
+    lb = np.where(below >= lb, below + margin, lb)
+    ub = np.where(above <= ub, above - margin, ub)
+    return lb, ub
 
-def adjust_lb_ub_3(lb, ub, x1, x2, x3):
-    # x1 < x2 < x3
-    lbub = [lb, ub]
-    if 0.0 <= x1:
-        if ub >= x1: lbub[1] = x1 - 1.0e-5
-    elif x3 <= 0.0:
-        if x3 >= lb: lbub[0] = x3 + 1.0e-5
-    else:
-        if x2 < 0.0: return trunc_lb_ub(lb, ub, x2, x3)
-        return trunc_lb_ub(lb, ub, x1, x2)
-    return lbub
 
+def adjust_lb_ub(lb, ub, pfd, margin=1.0e-5):
+    """Adjust the support of one fit to the real roots nearest to 0
 
-def adjust_lb_ub_4(lb, ub, x1, x2, x3, x4):
-    # x1 < x2 < x3 < x4
+    The rule of :py:func:`adjust_lb_ub_many`, on Python floats, much cheaper than
+    NumPy for a single fit.
+
+    :param float lb: lower bound, below 0.
+    :param float ub: upper bound, above 0.
+    :param dict pfd: partial fraction decomposition.
+    :param float margin: distance kept from the roots.
+    :return: adjusted lower and upper bounds.
+    :rtype: list
+    """
+    # assume the support lb < 0 < ub
+    if lb >= 0.0 or ub <= 0.0:
+        raise ValueError(f'lb({lb:.7f}) >= 0.0 or ub({ub:.7f}) <= 0.0')
+    below, above = -math.inf, math.inf
+    for x in _real_roots(pfd):
+        if x < 0.0:
+            below = max(below, x)
+        else:
+            above = min(above, x)
     lbub = [lb, ub]
-    if 0.0 <= x1:
-        if ub >= x1: lbub[1] = x1 - 1.0e-5
-    elif x4 <= 0.0:
-        if x4 >= lb: lbub[0] = x4 + 1.0e-5
-    else:
-        # x1 < 0 < x4
-        if 0.0 <= x2: return trunc_lb_ub(lb, ub, x1, x2)
-        if x3 <= 0.0: return trunc_lb_ub(lb, ub, x3, x4)
-        return trunc_lb_ub(lb, ub, x2, x3)
+    if below >= lb:
+        lbub[0] = below + margin
+    if above <= ub:
+        lbub[1] = above - margin
     return lbub
@@ -0,0 +1,191 @@
+"""
+Cumulative Distribution Function of the Pearson distribution, from a table.
+"""
+import warnings
+
+import numpy as np
+
+from pearsondist.quadrature import gauss_legendre, to_finite
+
+
+class Cdf8:
+    """Class for the CDF of the Pearson distribution
+
+    The support is split into panels, refined until both the Gauss-Legendre panel
+    integrals and a monotone cubic Hermite interpolation between the panel ends meet
+    the error target. The CDF at any point is then a binary search for its panel and
+    a cubic polynomial.
+    """
+
+    lower_bound: float = None
+    """The lower bound of the support of the distribution"""
+    upper_bound: float = None
+    """The upper bound of the support of the distribution"""
+    atol: float = None
+    """error target of the CDF values"""
+    norm_const: float = None
+    """Integral of the un-normalized PDF over the support"""
+    knots: np.ndarray = None
+    """panel ends, in the variable mapped onto a finite interval if the support is infinite"""
+    cum: np.ndarray = None
+    """CDF at the knots"""
+
+    def __init__(self, pdf, lb, ub, atol=1e-10, width=1.0, order=8, n_panels=16,
+                 max_panels=2 ** 16, norm_const=None):
+        """Initialize Cdf8 object
+
+        :param pdf: vectorized un-normalized density function, e.g., :py:meth:`Pdf.pdf`.
+        :param float lb: lower bound of the support, may be -inf.
+        :param float ub: upper bound of the support, may be inf.
+        :param float atol: error target of the CDF values.
+        :param float width: length scale of the density, used for infinite bounds.
+        :param int order: number of Gauss-Legendre nodes per panel.
+        :param int n_panels: initial number of panels.
+        :param int max_panels: stop refining beyond this number of panels.
+        :param float norm_const: integral of ``pdf`` over the support if known, e.g., that
+          of the normalized PDF, such that both agree; the sum of the panels if None.
+        """
+        self.pdf = pdf
+        self.lower_bound, self.upper_bound = lb, ub
+        self.atol = atol
+        t_lo, t_hi, self._phi, self._phi_inv = to_finite(lb, ub, width)
+        self._nodes, self._weights = gauss_legendre(order)
+        length = t_hi - t_lo
+        knots = np.linspace(t_lo, t_hi, n_panels + 1)
+        while True:
+            lo, hi = knots[:-1], knots[1:]
+            mid = (lo + hi) / 2
+            left, right = self._integrate(lo, mid), self._integrate(mid, hi)
+            panel = left + right
+            quad_err = np.abs(self._integrate(lo, hi) - panel)
+            self._set_table(knots, panel, norm_const)
+            interp_err = np.abs(self._hermite(np.arange(len(lo)), 0.5) - self.cum[:-1]
+                                - left / self.norm_const)
+            bad = ((interp_err > atol)
+                   | (quad_err / self.norm_const > atol * (hi - lo) / length))
+            if not bad.any():
+                break
+            if len(knots) + np.count_nonzero(bad) > max_panels:
+                warnings.warn(f'CDF table stopped at {len(lo)} panels, '
+                              f'error {max(interp_err.max(), quad_err.max()):.2e} > {atol:.2e}')
+                break
+            knots = np.sort(np.concatenate([knots, mid[bad]]))
+
+    def _density(self, t):
+        # density in the variable t of the finite interval, 0 at infinite ends
+        if self._phi is None:
+            f = self.pdf(t)
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x, dx = self._phi(t)
+                f = self.pdf(x) * dx
+        return np.where(np.isfinite(f), f, 0.0)
+
+    def _integrate(self, lo, hi):
+        # Gauss-Legendre rule on each panel
+        half = (hi - lo) / 2
+        t = ((lo + hi) / 2)[:, None] + half[:, None] * self._nodes
+        return (self._density(t) @ self._weights) * half
+
+    def _set_table(self, knots, panel, norm_const=None):
+        # cumulative values and monotone slopes of the Hermite interpolation
+        self.knots = knots
+        cum = np.concatenate([[0.0], np.cumsum(panel)])
+        self.norm_const = cum[-1] if norm_const is None else norm_const
+        self.cum = cum / self.norm_const
+        h = np.diff(knots)
+        slope = self._density(knots) / self.norm_const
+        secant = np.diff(self.cum) / h
+        left, right = slope[:-1].copy(), slope[1:].copy()
+        # Fritsch-Carlson: keep (alpha, beta) inside the circle of radius 3
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.hypot(left, right) / secant
+            tau = np.where(r > 3, 3 / r, 1.0)
+        tau = np.where(secant > 0, tau, 0.0)
+        self._h, self._left, self._right = h, left * tau, right * tau
+
+    def _hermite(self, i, s):
+        # cubic Hermite interpolation on panel i at the relative position s
+        h = self._h[i]
+        return (self.cum[i] * (1 + 2 * s) * (1 - s) ** 2 + h * self._left[i] * s * (1 - s) ** 2
+                + self.cum[i + 1] * s ** 2 * (3 - 2 * s) + h * self._right[i] * s ** 2 * (s - 1))
+
+    def _locate(self, t):
+        # panel index and relative position of t
+        i = np.clip(np.searchsorted(self.knots, t, side='right') - 1, 0, len(self._h) - 1)
+        return i, (t - self.knots[i]) / self._h[i]
+
+    def cdf(self, x):
+        """Cumulative distribution function
+
+        :param float x: input value, 0 below and 1 above the support.
+        :return: CDF value
+        :rtype: np.float or np.array
+        """
+        x = np.asarray(x, dtype=float)
+        inside = (x > self.lower_bound) & (x < self.upper_bound)
+        t = np.full(x.shape, self.knots[0])
+        t[inside] = x[inside] if self._phi_inv is None else self._phi_inv(x[inside])
+        F = np.clip(self._hermite(*self._locate(t)), 0.0, 1.0)
+        F = np.where(inside, F, np.where(x <= self.lower_bound, 0.0, 1.0))
+        return F[()] if F.ndim == 0 else F
+
+    def ppf(self, q, iter_max=30):
+        """Percent point function, the inverse of :py:meth:`cdf`
+
+        The panel is found by a binary search of the cumulative table, then the cubic
+        of that panel is inverted by safeguarded Newton iterations, vectorized over the
+        entries not yet converged.
+
+        :param float q: probability in [0, 1], NaN outside.
+        :param int iter_max: maximum Newton-bisection iterations.
+        :return: quantile
+        :rtype: np.float or np.array
+        """
+        q = np.asarray(q, dtype=float)
+        shape, q = q.shape, q.reshape(-1)
+        i = np.clip(np.searchsorted(self.cum, q, side='right') - 1, 0, len(self._h) - 1)
+        f0, df = self.cum[i], self.cum[i + 1] - self.cum[i]
+        left, right = self._h[i] * self._left[i], self._h[i] * self._right[i]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = np.clip(np.where(df > 0, (q - f0) / df, 0.5), 0.0, 1.0)
+            lo, hi = np.zeros_like(s), np.ones_like(s)
+            k = np.flatnonzero(df > 0)
+            for _ in range(iter_max):
+                if not len(k):
+                    break
+                sk, dk, lk, rk = s[k], df[k], left[k], right[k]
+                # cubic Hermite on [0, 1] relative to f0, and its derivative
+                u = 1 - sk
+                r = dk * sk * sk * (3 - 2 * sk) + lk * sk * u * u - rk * sk * sk * u - (q[k] - f0[k])
+                dr = 6 * sk * u * dk + lk * u * (1 - 3 * sk) + rk * sk * (3 * sk - 2)
+                below = r < 0
+                lo[k] = np.where(below, sk, lo[k])
+                hi[k] = np.where(below, hi[k], sk)
+                s_new = sk - r / dr
+                bisect = ~((s_new >= lo[k]) & (s_new <= hi[k]))
+                s_new[bisect] = (lo[k][bisect] + hi[k][bisect]) / 2
+                s[k] = s_new
+                k = k[np.abs(s_new - sk) > 1e-14]
+        t = self.knots[i] + s * self._h[i]
+        x = t if self._phi is None else self._phi(t)[0]
+        x = np.where(q <= 0, self.lower_bound, np.where(q >= 1, self.upper_bound, x))
+        x = np.where((q >= 0) & (q <= 1), x, np.nan).reshape(shape)
+        return x[()] if x.ndim == 0 else x
+
+    def rvs(self, size=1, rng=None, block=2 ** 20):
+        """Random draws by inverse transform sampling
+
+        :param size: number of draws, int or tuple.
+        :param rng: seed or :py:class:`numpy.random.Generator`.
+        :param int block: number of uniforms transformed per vectorized block.
+        :return: draws of shape ``size``
+        :rtype: np.ndarray
+        """
+        rng = np.random.default_rng(rng)
+        out = np.empty(size)
+        flat = out.reshape(-1)
+        for start in range(0, flat.size, block):
+            stop = min(start + block, flat.size)
+            flat[start:stop] = self.ppf(rng.random(stop - start))
+        return out
@@ -0,0 +1,126 @@
+"""
+Expectations under the Pearson distribution, from a quadrature rule built once.
+"""
+import numpy as np
+
+from pearsondist.quadrature import adaptive_rule, gauss_legendre, tanh_sinh, to_finite
+
+RULES = ('adaptive', 'tanh-sinh', 'gauss')
+
+
+def _piece_rule(pdf, lb, ub, rule, n, rtol, width):
+    # nodes, weights and density of one rule over [lb, ub]
+    if rule == 'adaptive':
+        nodes, w, density, _ = adaptive_rule(pdf, lb, ub, rtol, width=width)
+        return nodes, w, density
+    t_lo, t_hi, phi, _ = to_finite(lb, ub, width)
+    half = (t_hi - t_lo) / 2
+    if rule == 'tanh-sinh':
+        x, d, w = tanh_sinh(n)
+        # from the nearer end, not to lose the nodes clustered there
+        t = np.where(x < 0, t_lo + half * d, t_hi - half * d)
+    else:
+        x, w = gauss_legendre(n)
+        t = t_lo + half * (1 + x)
+    w = half * w
+    if phi is None:
+        nodes = t
+    else:
+        nodes, dx = phi(t)
+        w = w * dx
+    density = np.asarray(pdf(nodes), dtype=float)
+    density[~np.isfinite(density)] = 0.0  # singular ends
+    return nodes, w, density
+
+
+class Expect8:
+    r"""Class for expectations :math:`E[g(X)]` under the Pearson distribution
+
+    The nodes and weights of a quadrature rule over the support, and the density at the
+    nodes, are computed once. Each expectation is then a dot product of :math:`g` at the
+    nodes with the probability weights, see :py:meth:`expect`. The weights are normalized
+    by the normalizing constant if given, e.g., that of the normalized PDF, else by the
+    same rule, such that :math:`E[1] = 1`.
+
+    The adaptive rule keeps the Gauss-Kronrod nodes of the intervals refined for the
+    density itself, see :py:func:`~pearsondist.quadrature.adaptive_rule`, so it follows
+    both sharp peaks and singular ends. The fixed rules of ``n`` nodes cost no
+    refinement: tanh-sinh suits the supports bounded by roots, where the density may be
+    singular, and Gauss-Legendre densities smooth and spread over the whole support.
+
+    Whatever the rule, its nodes follow the density, not :math:`g`: a kink or jump of
+    :math:`g`, e.g., of a payoff or an indicator at a strike :math:`K`, falls between
+    two nodes and is integrated to their spacing only. Such breakpoints are to be given
+    as ``points``, which split the support into pieces with a rule of their own, such
+    that :math:`g` is smooth on each.
+    """
+
+    lower_bound: float = None
+    """The lower bound of the support of the distribution"""
+    upper_bound: float = None
+    """The upper bound of the support of the distribution"""
+    rule: str = None
+    """quadrature rule, 'adaptive', 'tanh-sinh' or 'gauss'"""
+    n: int = None
+    """number of nodes of the fixed rules"""
+    rtol: float = None
+    """relative tolerance of the adaptive rule"""
+    points: tuple = None
+    """breakpoints splitting the support, sorted"""
+    nodes: np.ndarray = None
+    """nodes in the support, shape (M,)"""
+    density: np.ndarray = None
+    """un-normalized density at the nodes, 0 where not finite, shape (M,)"""
+    weights: np.ndarray = None
+    """probability weights of the nodes, summing to 1, shape (M,)"""
+    norm_const: float = None
+    """Integral of the un-normalized PDF over the support, as given or by the same rule"""
+
+    def __init__(self, pdf, lb, ub, rule='adaptive', n=201, rtol=1e-10, width=1.0,
+                 points=None, norm_const=None):
+        """Initialize Expect8 object
+
+        :param pdf: vectorized un-normalized density function, e.g., :py:meth:`Pdf.pdf`.
+        :param float lb: lower bound of the support, may be -inf.
+        :param float ub: upper bound of the support, may be inf.
+        :param str rule: 'adaptive', 'tanh-sinh' or 'gauss'.
+        :param int n: number of nodes of the fixed rules.
+        :param float rtol: relative tolerance of the adaptive rule.
+        :param float width: length scale of the density, used for infinite bounds.
+        :param points: breakpoints of the functions to integrate, e.g., strikes, those
+          inside the support splitting it.
+        :param float norm_const: integral of ``pdf`` over the support if known; the sum of
+          the weighted density at the nodes if None.
+        """
+        if rule not in RULES:
+            raise ValueError(f'unknown rule: {rule}, expects one of {RULES}')
+        self.lower_bound, self.upper_bound = lb, ub
+        self.rule, self.n, self.rtol = rule, n, rtol
+        self.points = tuple(sorted(float(p) for p in points or ()))
+        ends = [lb] + [p for p in self.points if lb < p < ub] + [ub]
+        pieces = [_piece_rule(pdf, lo, hi, rule, n, rtol, width)
+                  for lo, hi in zip(ends[:-1], ends[1:])]
+        self.nodes, w, self.density = (np.concatenate(a) for a in zip(*pieces))
+        mass = w * self.density
+        self.norm_const = float(mass.sum()) if norm_const is None else norm_const
+        self.weights = mass / self.norm_const
+
+    def expect(self, g):
+        r"""Expectation :math:`E[g(X)]`, one weighted sum over the nodes
+
+        :param g: vectorized function, or a sequence of them, evaluated once at all the
+          nodes; a function may also return a stack of shape (..., n) for many
+          expectations at once, e.g., ``lambda x: x ** np.arange(1, 9)[:, None]``.
+        :return: expectation, of the shape of g's values without the last axis, with a
+          leading axis for a sequence of functions.
+        :rtype: float or np.ndarray
+        """
+        if callable(g):
+            values = g(self.nodes)
+        else:
+            values = np.stack([np.broadcast_to(f(self.nodes), self.nodes.shape) for f in g])
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 0:
+            return float(values)
+        result = values @ self.weights
+        return float(result) if np.ndim(result) == 0 else result
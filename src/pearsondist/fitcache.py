@@ -0,0 +1,119 @@
+"""
+Memoize fits of moment vectors that agree up to a tolerance.
+"""
+import collections
+import math
+import threading
+
+from pearsondist import instrument
+from pearsondist.pearson8 import Pearson8
+from pearsondist.stdmom import standardize
+
+
+def quantize(moment, tol=1e-10):
+    r"""Key of a moment vector, equal for vectors that agree up to about ``tol``
+
+    The :math:`n`-th moment is rounded to a multiple of :math:`tol \cdot s^n`, where
+    :math:`s = \sqrt{\mu_2}` is the natural scale of the moments. Two vectors closer than
+    ``tol`` in this scale may still round to different keys at a rounding boundary.
+
+    :param list moment: the first eight or more raw moments, those beyond eight ignored.
+    :param float tol: relative tolerance.
+    :return: key
+    :rtype: tuple
+    """
+    m = [float(x) for x in moment[:8]]
+    s = math.sqrt(abs(m[1])) or 1.0
+    return tuple(round(x / (tol * s ** n)) for n, x in enumerate(m, start=1))
+
+
+class FitCache:
+    """Class for an LRU cache of :py:class:`~pearsondist.pearson8.Pearson8` fits
+
+    A fit is keyed on its moments quantized by :py:func:`quantize`. The cached object
+    keeps its coefficients, PFD, PDF with its scale, and the bounds, normalizing
+    constant and CDF table once computed, so a hit hands back all of them. Note that a
+    hit returns the object fitted first, with its own :py:attr:`Pearson8.mom`. All access
+    is guarded by a lock, and the fit itself runs outside of it.
+
+    With ``canonical=True``, the key is that of the standardized moments and the cache
+    holds standardized fits, such that all members of a location-scale family share one
+    entry, mapped back by :py:meth:`Pearson8.from_standard` on each hit.
+    """
+
+    maxsize: int = None
+    """maximum number of fits kept, the least recently used is evicted first"""
+    tol: float = None
+    """relative tolerance of the key, see :py:func:`quantize`"""
+    canonical: bool = False
+    """whether fits are keyed and kept in standardized form"""
+    hits: int = 0
+    """number of fits found in the cache"""
+    misses: int = 0
+    """number of fits computed"""
+
+    def __init__(self, maxsize=1024, tol=1e-10, canonical=False):
+        """Initialize FitCache object
+
+        :param int maxsize: maximum number of fits kept.
+        :param float tol: relative tolerance of the key, see :py:func:`quantize`.
+        :param bool canonical: key and keep the fits of the standardized moments.
+        """
+        if maxsize < 1:
+            raise ValueError(f'maxsize = {maxsize} < 1')
+        self.maxsize, self.tol, self.canonical = maxsize, tol, canonical
+        self._fits = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._fits)
+
+    def fit(self, moment):
+        """Fit of the moments, from the cache if already fitted up to the tolerance
+
+        :param list moment: the first eight or more raw moments, see :py:class:`Pearson8`.
+        :return: the fit
+        :rtype: Pearson8
+        """
+        if self.canonical:
+            loc, scale, moment = standardize(moment[:8])
+            return Pearson8.from_standard(self._fit(moment), loc, scale)
+        return self._fit(moment)
+
+    def _fit(self, moment):
+        # cached fit of the moments as given
+        key = quantize(moment, self.tol)
+        with self._lock:
+            pearson = self._fits.get(key)
+            if pearson is not None:
+                self._fits.move_to_end(key)
+                self.hits += 1
+        if pearson is not None:
+            instrument.count('fit_cache_hits')
+            return pearson
+        pearson = Pearson8(moment)
+        with self._lock:
+            self.misses += 1
+            # another thread may have fitted the same key meanwhile, keep the first
+            pearson = self._fits.setdefault(key, pearson)
+            self._fits.move_to_end(key)
+            while len(self._fits) > self.maxsize:
+                self._fits.popitem(last=False)
+        instrument.count('fit_cache_misses')
+        return pearson
+
+    def clear(self):
+        """Remove all fits and reset the counters"""
+        with self._lock:
+            self._fits.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        """Counters and size of the cache
+
+        :return: hits, misses, current size and maximum size.
+        :rtype: dict
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'currsize': len(self._fits),
+                    'maxsize': self.maxsize}
@@ -0,0 +1,135 @@
+"""
+Optional wall time per stage, counters, root types and warnings of the fits.
+
+Nothing is recorded unless inside :py:func:`record`, where the stages of
+:py:class:`~pearsondist.pearson8.Pearson8`,
+:py:class:`~pearsondist.pearson8batch.Pearson8Batch` and the support search report
+to the :py:class:`Stats` of the block::
+
+    with record() as stats:
+        pearson = Pearson8(moment)
+        pearson.determine_bounds()
+    stats.as_dict()  # e.g., for a metrics pipeline
+
+Outside of it, each instrumented stage costs one context variable lookup.
+"""
+import contextlib
+import contextvars
+import time
+import warnings
+
+_active = contextvars.ContextVar('pearsondist_stats', default=None)
+_NULL = contextlib.nullcontext()
+
+
+class Stats:
+    """Records of the stages run inside :py:func:`record`"""
+
+    timings: dict = None
+    """wall time in seconds of each stage, summed over its calls"""
+    calls: dict = None
+    """number of calls of each stage"""
+    counts: dict = None
+    """counters, e.g., ``newton_iterations``"""
+    types: dict = None
+    """number of fits of each root type"""
+    warnings: list = None
+    """messages of the warnings raised"""
+
+    def __init__(self):
+        self.timings, self.calls, self.counts, self.types = {}, {}, {}, {}
+        self.warnings = []
+
+    def as_dict(self):
+        """Flat dict of all records, keys prefixed by ``time.``, ``calls.``, ``count.`` and
+        ``type.``, plus the list of ``warnings``"""
+        out = {f'time.{k}': v for k, v in self.timings.items()}
+        out.update({f'calls.{k}': v for k, v in self.calls.items()})
+        out.update({f'count.{k}': v for k, v in self.counts.items()})
+        out.update({f'type.{k}': v for k, v in self.types.items()})
+        out['warnings'] = list(self.warnings)
+        return out
+
+
+class _Stage:
+    # times one stage into the active Stats
+    __slots__ = ('stats', 'name', 'start')
+
+    def __init__(self, stats, name):
+        self.stats, self.name = stats, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stats, name = self.stats, self.name
+        stats.timings[name] = stats.timings.get(name, 0.0) + elapsed
+        stats.calls[name] = stats.calls.get(name, 0) + 1
+        return False
+
+
+def stage(name):
+    """Context manager timing a stage, a no-op outside of :py:func:`record`
+
+    :param str name: name of the stage.
+    """
+    stats = _active.get()
+    if stats is None:
+        return _NULL
+    return _Stage(stats, name)
+
+
+def count(name, n=1):
+    """Add ``n`` to a counter, a no-op outside of :py:func:`record`
+
+    :param str name: name of the counter.
+    :param int n: increment.
+    """
+    stats = _active.get()
+    if stats is not None:
+        stats.counts[name] = stats.counts.get(name, 0) + int(n)
+
+
+def root_type(type_no, n=1):
+    """Count ``n`` fits of the root type, a no-op outside of :py:func:`record`
+
+    :param int type_no: root type, 41, ..., 49, or 0 if unclassified.
+    :param int n: number of fits.
+    """
+    stats = _active.get()
+    if stats is not None:
+        stats.types[int(type_no)] = stats.types.get(int(type_no), 0) + int(n)
+
+
+def enabled():
+    """Whether a :py:func:`record` block is active, to skip preparing records otherwise"""
+    return _active.get() is not None
+
+
+@contextlib.contextmanager
+def record(stats=None):
+    """Record the stages run inside the block
+
+    The warnings raised inside are kept in :py:attr:`Stats.warnings`, then issued
+    again on leaving the block, also when it raises, such that the warning filters
+    apply as usual. Since
+    :py:class:`warnings.catch_warnings` is process wide, the warnings of other
+    threads running at the same time may be recorded too.
+
+    :param Stats stats: records to add to, a new one if None.
+    :return: the records, filled in as the block runs
+    :rtype: Stats
+    """
+    stats = Stats() if stats is None else stats
+    token = _active.set(stats)
+    caught = []
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            yield stats
+    finally:
+        _active.reset(token)
+        for w in caught:
+            stats.warnings.append(f'{w.category.__name__}: {w.message}')
+            warnings.warn_explicit(w.message, w.category, w.filename, w.lineno)
@@ -0,0 +1,132 @@
+r"""
+Moments of any order of a fitted Pearson distribution, from its coefficients.
+
+Multiplying the equation :math:`Q(x)p'(x) = -(a + x)p(x)` by :math:`x^n` and integrating
+by parts over a support at whose ends :math:`Q(x)p(x)x^n` vanishes gives, for
+:math:`n \ge 0`, the rows of :py:func:`~pearsondist.pearson8batch.coef_system`
+
+.. math::
+
+    a\mu_n - \sum_{k=0}^4 (n+k) c_k \mu_{n+k-1} = -\mu_{n+1},
+
+a recurrence for :math:`\mu_{n+3}` in terms of the four moments below it. Seeded with
+:math:`\mu_0 = 1` and the first two moments, it produces :math:`\mu_3, \mu_4, \cdots`
+in O(1) per order. Run on the standardized distribution, it is well scaled whatever the
+mean and variance; its rounding errors are tracked along, such that the orders from the
+first ill-conditioned one on can be integrated instead, see :py:func:`quad_moments`,
+over the natural support of the equation, see :py:func:`natural_support`.
+"""
+import warnings
+
+import numpy as np
+
+from pearsondist.quadrature import adaptive_quad
+from pearsondist.support8 import u_bounds_many
+
+EPS = np.finfo(float).eps
+
+
+def recurrence_moments(coef, k, m1=0.0, m2=1.0):
+    r"""Moments of orders 1, ..., k by the recurrence, with running error bounds
+
+    The error bound of each order is propagated to first order from the rounding of
+    each step and the error bounds of the four moments it is computed from.
+
+    :param coef: coefficients a, c0, c1, c2, c3, c4, shape (6,) or (N, 6).
+    :param int k: highest order, at least 2.
+    :param m1: first moment, the seed, float or shape (N,).
+    :param m2: second moment, the seed, float or shape (N,).
+    :return: moments and their error bounds, each of shape (k,) or (N, k).
+    :rtype: tuple
+    """
+    if k < 2:
+        raise ValueError(f'k = {k} < 2')
+    coef = np.asarray(coef, dtype=float)
+    a, c0, c1, c2, c3, c4 = (coef[..., i] for i in range(6))
+    one = np.ones_like(a)
+    m = [one, m1 * one, m2 * one]
+    e = [0 * one, EPS * np.abs(m[1]), EPS * np.abs(m[2])]
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for n in range(k - 2):
+            terms = [a * m[n], m[n + 1], -n * c0 * m[n - 1], -(n + 1) * c1 * m[n],
+                     -(n + 2) * c2 * m[n + 1], -(n + 3) * c3 * m[n + 2]]
+            den = (n + 4) * c4
+            m.append(sum(terms) / den)
+            e.append((EPS * sum(np.abs(t) for t in terms)
+                      + np.abs(a - (n + 1) * c1) * e[n] + np.abs(1 - (n + 2) * c2) * e[n + 1]
+                      + n * np.abs(c0) * e[n - 1] + (n + 3) * np.abs(c3) * e[n + 2])
+                     / np.abs(den) + EPS * np.abs(m[-1]))
+    return np.stack(m[1:], axis=-1), np.stack(e[1:], axis=-1)
+
+
+def trusted_orders(std_mom, err, rtol=1e-6):
+    r"""Number of leading recurrence moments of a standardized distribution to be trusted
+
+    An order is not to be trusted when its error bound exceeds ``rtol`` relative to
+    :math:`\max(1, |\mu_n|)`, where 1 bounds :math:`E|Y|^n` from below for
+    :math:`n \ge 2`, or when it is even and its moment falls below 1, which no
+    standardized distribution allows, e.g., when the moments of the solution of the
+    equation do not exist. The errors propagate upwards, so neither are the orders
+    above it.
+
+    :param std_mom: moments from :py:func:`recurrence_moments` seeded with 0 and 1,
+      shape (k,) or (N, k).
+    :param err: their error bounds, of the same shape.
+    :param float rtol: relative tolerance.
+    :return: the orders below the first one not to be trusted, k if none, shape () or (N,).
+    :rtype: np.ndarray
+    """
+    with np.errstate(invalid='ignore'):
+        bad = ~(err <= rtol * np.maximum(1.0, np.abs(std_mom)))
+        bad[..., 1::2] |= ~(std_mom[..., 1::2] >= 1 - rtol)
+    return np.where(bad.any(axis=-1), bad.argmax(axis=-1), bad.shape[-1])
+
+
+def natural_support(std_roots):
+    """Support of the solution of the equation of a standardized distribution
+
+    Between the real roots of c0 + c1 x + ... + c4 x^4 nearest to the mean 0, or
+    infinite where there is no root on that side; unlike the support of
+    :py:class:`~pearsondist.support8.Support8`, not truncated where the density is small.
+
+    :param std_roots: real roots of the standardized fit, NaN for the complex ones,
+      shape (k,).
+    :return: (lower bound, upper bound)
+    :rtype: tuple
+    """
+    lb, ub = u_bounds_many(np.reshape(std_roots, (1, -1)), margin=0.0)
+    return float(lb[0]), float(ub[0])
+
+
+def _converged_quad(f, lb, ub, rtol, atol=0.0):
+    # integral by adaptive_quad, NaN if it does not converge, e.g., diverges
+    with warnings.catch_warnings(), np.errstate(all='ignore'):
+        warnings.filterwarnings('error', 'adaptive_quad did not reach', UserWarning)
+        try:
+            return adaptive_quad(f, lb, ub, rtol, atol)[0]
+        except UserWarning:
+            return np.nan
+
+
+def quad_moments(pdf, lb, ub, orders, rtol=1e-10):
+    """Moments of the given orders of a density normalized over [lb, ub], by quadrature
+
+    Meant for standardized densities, of length scale 1, so that ``rtol`` of the
+    normalizing constant is the absolute tolerance of each moment. The moments whose
+    integrals do not converge are NaN: those of orders the density does not have, and
+    all of them where it cannot be normalized, as the solutions of the equation with
+    :math:`c_3` or :math:`c_4` nonzero over an infinite support, which tend to a constant.
+
+    :param pdf: vectorized, possibly un-normalized density.
+    :param float lb: lower bound of the support, may be -inf.
+    :param float ub: upper bound of the support, may be inf.
+    :param orders: orders of the moments.
+    :param float rtol: relative tolerance of each integral, see
+      :py:func:`~pearsondist.quadrature.adaptive_quad`.
+    :return: moments, one per order.
+    :rtype: np.ndarray
+    """
+    norm = _converged_quad(pdf, lb, ub, rtol)
+    return np.array([_converged_quad(lambda y, n=n: y ** n * pdf(y), lb, ub, rtol,
+                                     rtol * norm) / norm
+                     for n in orders])
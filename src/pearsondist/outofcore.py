@@ -0,0 +1,144 @@
+"""
+Fit moment matrices larger than memory, chunk by chunk, into columns on disk.
+
+The moments are read from a ``.npy`` file through a memory map, and every result
+column of :py:class:`~pearsondist.pearson8batch.Pearson8Batch` is written to its own
+memory-mapped ``.npy`` file in an output directory::
+
+    fit_npy('moments.npy', 'fits/', chunk_size=2 ** 16)
+    columns = load_columns('fits/')  # e.g., columns['coef'][i], columns['type_no'][i]
+
+A ``done.npy`` flag per chunk is set once the chunk is on disk, so an interrupted
+job resumes at the first chunk not done, and separate jobs may fit disjoint chunks.
+"""
+import concurrent.futures
+import contextlib
+import json
+import os
+import tempfile
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from pearsondist import instrument, parallel
+from pearsondist.pearson8batch import COLUMNS, Pearson8Batch
+
+META = 'meta.json'
+DONE = 'done'
+
+
+def _create(path, write):
+    # create path atomically, from a temporary file written by write(tmp) then hard
+    # linked, such that no job sees it half written; False if it exists already
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp)
+        os.link(tmp, path)
+        return True
+    except FileExistsError:
+        return False
+    finally:
+        os.unlink(tmp)
+
+
+def _open_column(out_dir, key, shape, dtype):
+    # memory map of one column, created on first use
+    path = os.path.join(out_dir, key + '.npy')
+    _create(path, lambda tmp: open_memmap(tmp, mode='w+', dtype=dtype, shape=shape).flush())
+    column = open_memmap(path, mode='r+')
+    if column.shape != shape or column.dtype != dtype:
+        raise ValueError(f'{path} holds {column.dtype} {column.shape}, '
+                         f'expected {np.dtype(dtype)} {shape}')
+    return column
+
+
+def _write_json(path, obj):
+    with open(path, 'w') as f:
+        json.dump(obj, f)
+
+
+def _check_meta(out_dir, meta):
+    # the output directory must belong to the same input and chunking
+    path = os.path.join(out_dir, META)
+    if not _create(path, lambda tmp: _write_json(tmp, meta)):
+        with open(path) as f:
+            old = json.load(f)
+        if old != meta:
+            raise ValueError(f'{out_dir} holds fits of {old}, not of {meta}')
+
+
+def fit_npy(src, out_dir, chunk_size=2 ** 16, chunks=None, n_jobs=1, validate=False):
+    """Fit the moment vectors of a ``.npy`` file chunk by chunk into columns on disk
+
+    Each chunk is fitted by :py:class:`Pearson8Batch`, supports included, written to
+    the columns, flushed, then flagged as done. Chunks already done are skipped.
+
+    :param str src: ``.npy`` file of an (N, 8) moment matrix, memory mapped.
+    :param str out_dir: directory of the output columns, created if needed.
+    :param int chunk_size: rows per chunk, fixed for the life of ``out_dir``.
+    :param chunks: indices of the chunks to fit, all if None.
+    :param int n_jobs: number of processes, 1 to fit in this process, all CPUs if None
+      or -1; one pool serves all the chunks, see :py:func:`~pearsondist.parallel.fit_many`.
+    :param bool validate: screen the moments first, see :py:class:`Pearson8Batch`.
+    :return: number of chunks fitted by this call
+    :rtype: int
+    """
+    moments = np.load(src, mmap_mode='r')
+    if moments.ndim != 2 or moments.shape[1] < 8:
+        raise ValueError(f'{src} holds {moments.shape}, expected an (N, 8) array of moments')
+    n = len(moments)
+    n_chunks = -(-n // chunk_size)
+    os.makedirs(out_dir, exist_ok=True)
+    _check_meta(out_dir, {'src': os.path.abspath(src), 'rows': n, 'chunk_size': chunk_size})
+    columns = {key: _open_column(out_dir, key, (n,) + shape, dtype)
+               for key, shape, dtype in COLUMNS}
+    done = _open_column(out_dir, DONE, (n_chunks,), np.bool_)
+    if n_jobs is None or n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    fitted = 0
+    with (contextlib.nullcontext() if n_jobs == 1
+          else concurrent.futures.ProcessPoolExecutor(n_jobs)) as pool:
+        for c in range(n_chunks) if chunks is None else chunks:
+            if not 0 <= c < n_chunks:
+                raise IndexError(f'chunk {c} not in [0, {n_chunks})')
+            if done[c]:
+                continue
+            start, stop = c * chunk_size, min((c + 1) * chunk_size, n)
+            mom = np.array(moments[start:stop, :8], dtype=float)
+            if pool is None:
+                batch = Pearson8Batch(mom, validate)
+                batch.determine_bounds()
+            else:
+                batch = parallel.fit_many(mom, n_jobs, validate=validate, pool=pool)
+            for key, column in columns.items():
+                column[start:stop] = getattr(batch, key)
+                column.flush()
+            done[c] = True
+            done.flush()
+            fitted += 1
+            instrument.count('chunks_fitted')
+    return fitted
+
+
+def load_columns(out_dir, mmap_mode='r'):
+    """Columns written by :py:func:`fit_npy`
+
+    :param str out_dir: directory of the output columns.
+    :param str mmap_mode: see :py:func:`numpy.load`, None to read into memory.
+    :return: arrays keyed by column name, and ``done``, the flags of the chunks.
+    :rtype: dict
+    """
+    return {key: np.load(os.path.join(out_dir, key + '.npy'), mmap_mode=mmap_mode)
+            for key in [key for key, _, _ in COLUMNS] + [DONE]}
+
+
+def to_npz(out_dir, path, compressed=False):
+    """Pack the columns written by :py:func:`fit_npy` into one ``.npz`` file
+
+    :param str out_dir: directory of the output columns.
+    :param str path: ``.npz`` file to write.
+    :param bool compressed: whether to compress, see :py:func:`numpy.savez_compressed`.
+    """
+    save = np.savez_compressed if compressed else np.savez
+    save(path, **load_columns(out_dir))
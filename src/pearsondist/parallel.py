@@ -0,0 +1,103 @@
+"""
+Fit many moment vectors across a pool of processes, the results in shared memory.
+"""
+import concurrent.futures
+import contextlib
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from pearsondist.pearson8batch import COLUMNS, Pearson8Batch
+
+
+def _views(blocks, spec):
+    # arrays over the shared memory blocks, in the order of spec
+    return {key: np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            for block, (key, (_, shape, dtype)) in zip(blocks, spec.items())}
+
+
+def _fit_chunk(spec, start, stop, bounds, validate):
+    # worker: fit rows [start, stop) and write the columns in place
+    blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in spec.values()]
+    arrays = _views(blocks, spec)
+    try:
+        batch = Pearson8Batch(arrays['mom'][start:stop], validate)
+        if bounds:
+            batch.determine_bounds()
+        for key, _, _ in COLUMNS:
+            value = getattr(batch, key)
+            if value is not None:
+                arrays[key][start:stop] = value
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+    return stop - start
+
+
+def fit_many(moments, n_jobs=1, chunk_size=None, bounds=True, validate=False, pool=None):
+    """Fit many moment vectors with a pool of processes
+
+    The moments and every result column of :py:class:`Pearson8Batch` live in
+    :py:mod:`multiprocessing.shared_memory` blocks. Each worker fits a chunk of rows
+    and writes its coefficients, root types, roots, PFD terms, scales, bounds and
+    statuses straight into them, so no fit is pickled back. With ``n_jobs=1``, the
+    default, the fit runs in this process.
+
+    :param moments: array of shape (N, 8), one moment vector per row.
+    :param int n_jobs: number of processes, 1 to fit in this process, all CPUs if None
+      or -1.
+    :param int chunk_size: rows per task, about four tasks per process if None.
+    :param bool bounds: whether to determine the supports too.
+    :param bool validate: screen the moments first, see :py:class:`Pearson8Batch`.
+    :param pool: executor to submit the chunks to, e.g., shared by many calls, left
+      open; a pool of ``n_jobs`` processes is created and shut down if None.
+    :return: the fits, as if from one :py:class:`Pearson8Batch`
+    :rtype: Pearson8Batch
+    """
+    moments = np.asarray(moments, dtype=float)
+    if moments.ndim != 2 or moments.shape[1] < 8:
+        raise ValueError('fit_many expects an (N, 8) array of moments')
+    if n_jobs is None or n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs == 1 or len(moments) == 0:
+        batch = Pearson8Batch(moments, validate)
+        if bounds:
+            batch.determine_bounds()
+        return batch
+    n = len(moments)
+    if chunk_size is None:
+        chunk_size = max(1, -(-n // (4 * n_jobs)))
+    layout = [('mom', (8,), np.float64)] + list(COLUMNS)
+    blocks, spec, arrays = [], {}, None
+    try:
+        for key, shape, dtype in layout:
+            shape = (n,) + shape
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            block = shared_memory.SharedMemory(create=True, size=size)
+            blocks.append(block)
+            spec[key] = (block.name, shape, dtype)
+        arrays = _views(blocks, spec)
+        arrays['mom'][:] = moments[:, :8]
+        for key, _, dtype in COLUMNS:
+            arrays[key][:] = 0 if np.issubdtype(dtype, np.integer) else np.nan
+        with (concurrent.futures.ProcessPoolExecutor(n_jobs) if pool is None
+              else contextlib.nullcontext(pool)) as executor:
+            tasks = [executor.submit(_fit_chunk, spec, start, min(start + chunk_size, n),
+                                     bounds, validate)
+                     for start in range(0, n, chunk_size)]
+            for task in tasks:
+                task.result()
+        batch = Pearson8Batch.__new__(Pearson8Batch)
+        batch.mom = arrays['mom'].copy()
+        for key, _, _ in COLUMNS:
+            setattr(batch, key, arrays[key].copy())
+        if not bounds:
+            batch.lower_bound = batch.upper_bound = batch.bound_status = None
+    finally:
+        del arrays  # the views must go before their blocks close
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return batch
@@ -1,9 +1,229 @@
 """
 Probability Density Functions, unnormalized.
 """
+import functools
+import math
 import numpy as np
 import warnings
 
+from pearsondist.instrument import stage
+from pearsondist.quartic import quartic_roots
+
+
+def log_pdf_terms(pfd):
+    r"""Constants of the log density, from a partial fraction decomposition
+
+    The log density is a sum of terms of two kinds,
+
+    - real root :math:`x_k`: :math:`L\log|x - x_k| + P_1 u + P_2 u^2 + P_3 u^3`,
+      :math:`u = 1/(x - x_k)`, stored as ``(x_k, L, P1, P2, P3)``,
+    - complex pair :math:`x_k`: :math:`L\log(t^2 + m^2) + (P_0 + P_1 t)/(t^2 + m^2)
+      + K\arctan(t/m)`, :math:`t = x - \Re x_k`, :math:`m = \Im x_k`, stored as
+      ``(Re x_k, m, m^2, L, P0, P1, K)``,
+
+    where ``None`` marks a constant absent from the type. The values of ``pfd`` may be
+    scalars, or columns of many fits of the same type.
+
+    :param dict pfd: partial fraction decomposition.
+    :return: list of real root terms and list of complex pair terms.
+    :rtype: tuple
+    """
+    def pair(x1, A, B):
+        m = x1.imag
+        return x1.real, m, m ** 2, -A / 2, None, None, -(B + A * x1.real) / m
+
+    t = pfd['type']
+    if t == 41:
+        x1, A, B = pfd['x1'], pfd['A1'], pfd['B1']
+        m, B = x1.imag, B + A * x1.real
+        return [], [(x1.real, m, m ** 2, None, A / 2, -B / (2 * m ** 2), -B / (2 * m ** 3))]
+    if t == 42:
+        return [], [pair(pfd['x1'], pfd['A1'], pfd['B1']), pair(pfd['x2'], pfd['A2'], pfd['B2'])]
+    if t == 43:
+        return ([(pfd['x1'], -pfd['A1'], pfd['A2'], None, None)],
+                [pair(pfd['x3'], pfd['A3'], pfd['B3'])])
+    if t == 44:
+        return ([(pfd['x1'], -pfd['A1'], None, None, None),
+                 (pfd['x2'], -pfd['A2'], None, None, None)],
+                [pair(pfd['x3'], pfd['A3'], pfd['B3'])])
+    if t == 45:
+        return [(pfd['x1'], None, None, pfd['A3'] / 2, pfd['A4'] / 3)], []
+    if t == 46:
+        return [(pfd['x1'], -pfd['A1'], pfd['A2'], pfd['A3'] / 2, None),
+                (pfd['x4'], -pfd['A4'], None, None, None)], []
+    if t == 47:
+        return [(pfd['x1'], -pfd['A1'], pfd['A2'], None, None),
+                (pfd['x3'], -pfd['A3'], pfd['A4'], None, None)], []
+    if t == 48:
+        return [(pfd['x1'], -pfd['A1'], pfd['A2'], None, None),
+                (pfd['x3'], -pfd['A3'], None, None, None),
+                (pfd['x4'], -pfd['A4'], None, None, None)], []
+    if t == 49:
+        return [(pfd[f'x{k}'], -pfd[f'A{k}'], None, None, None) for k in range(1, 5)], []
+    raise ValueError(f'unknown root type: {t}')
+
+
+def eval_log_pdf(x, terms, out=None, work=None):
+    """Evaluate the log density from its terms, see :py:func:`log_pdf_terms`
+
+    ``x`` broadcasts against the constants, e.g., an (M,) grid against (n, 1) columns
+    of ``n`` fits gives an (n, M) result.
+
+    :param x: input values.
+    :param tuple terms: real root terms and complex pair terms.
+    :param out: array of the broadcast shape to write the result into.
+    :param work: scratch array of shape (3,) + broadcast shape, reused across calls.
+    :return: log density values, unnormalized.
+    :rtype: np.float or np.array
+    """
+    poles, pairs = terms
+    const = (poles or pairs)[0][0]
+    shape = np.broadcast_shapes(np.shape(x), np.shape(const))
+    if out is None:
+        out = np.zeros(shape)
+    else:
+        out[...] = 0.0
+    if work is None:
+        work = np.empty((3,) + shape)
+    d, w, v = work[0, ...], work[1, ...], work[2, ...]
+    for x1, L, P1, P2, P3 in poles:
+        np.subtract(x, x1, out=d)
+        if L is not None:
+            np.abs(d, out=w)
+            np.log(w, out=w)
+            w *= L
+            out += w
+        P = [P1, P2, P3]
+        while P and P[-1] is None:
+            P.pop()
+        if P:
+            np.reciprocal(d, out=d)  # u = 1 / (x - x1), Horner in u
+            w[...] = P[-1]
+            for Pk in reversed(P[:-1]):
+                w *= d
+                if Pk is not None:
+                    w += Pk
+            w *= d
+            out += w
+    for xr, m, m2, L, P0, P1, K in pairs:
+        np.subtract(x, xr, out=d)  # t
+        np.multiply(d, d, out=w)
+        w += m2  # t^2 + m^2
+        if P0 is not None:
+            np.multiply(d, P1, out=v)
+            v += P0
+            v /= w
+            out += v
+        if L is not None:
+            np.log(w, out=w)
+            w *= L
+            out += w
+        d /= m
+        np.arctan(d, out=d)
+        d *= K
+        out += d
+    return out[()] if out.ndim == 0 else out
+
+
+def eval_log_pdf_scalar(x, terms):
+    """Evaluate the log density at a single float, see :py:func:`eval_log_pdf`
+
+    Uses :py:mod:`math` on Python floats, much cheaper than NumPy for one value.
+    Raises ``ValueError`` or ``ZeroDivisionError`` at a root of the denominator.
+
+    :param float x: input value.
+    :param tuple terms: real root terms and complex pair terms of scalar constants.
+    :return: log density value, unnormalized.
+    :rtype: float
+    """
+    poles, pairs = terms
+    value = 0.0
+    for x1, L, P1, P2, P3 in poles:
+        d = x - x1
+        if L is not None:
+            value += L * math.log(abs(d))
+        if P3 is not None:
+            u = 1.0 / d
+            value += u * ((P1 or 0.0) + u * ((P2 or 0.0) + u * P3))
+        elif P2 is not None:
+            u = 1.0 / d
+            value += u * ((P1 or 0.0) + u * P2)
+        elif P1 is not None:
+            value += P1 / d
+    for xr, m, m2, L, P0, P1, K in pairs:
+        t = x - xr
+        s = t * t + m2
+        if P0 is not None:
+            value += (P0 + P1 * t) / s
+        if L is not None:
+            value += L * math.log(s)
+        value += K * math.atan(t / m)
+    return value
+
+
+def horner(p, x):
+    """Polynomial in Horner form, one multiply-add per coefficient
+
+    :param list p: coefficients ordered from the highest power to the lowest.
+    :param x: float or array.
+    :rtype: np.float or np.array
+    """
+    value = p[0]
+    for c in p[1:]:
+        value = value * x + c
+    return value
+
+
+def ddpdf_coef(coef):
+    r"""Coefficients of :math:`P(x)`, the numerator of the second derivative of the PDF
+
+    See :py:meth:`Pdf.ddpdf_roots`.
+
+    :param coef: coefficients a, c0, c1, c2, c3, c4, shape (6,) or (N, 6).
+    :return: coefficients ordered from the highest power to the lowest (x^4 to x^0),
+      shape (5,) or (N, 5).
+    :rtype: np.ndarray
+    """
+    coef = np.asarray(coef, dtype=float)
+    a, c0, c1, c2, c3, c4 = (coef[..., i] for i in range(6))
+    return np.stack([3 * c4, 2 * c3 + 4 * c4 * a, c2 + 3 * c3 * a + 1, 2 * a * (c2 + 1),
+                     a ** 2 + c1 * a - c0], axis=-1)
+
+
+def is_max_many(coef):
+    """Whether -a is the argmax of the PDF, for many fits at once, see :py:meth:`Pdf.isMax`
+
+    :param coef: coefficients a, c0, c1, c2, c3, c4, shape (N, 6).
+    :return: 1 if -a is the argmax, 0 if the argmin, -1 if undecided, shape (N,).
+    :rtype: np.ndarray
+    """
+    p = ddpdf_coef(coef)
+    x = -np.asarray(coef, dtype=float)[:, 0]
+    ddf = (((p[:, 0] * x + p[:, 1]) * x + p[:, 2]) * x + p[:, 3]) * x + p[:, 4]
+    return np.where(ddf < 0, 1, np.where(ddf > 0, 0, -1))
+
+
+def arg_max_min_dpdf_many(coef):
+    """Argmax and argmin of the derivative of the PDF, for many fits at once
+
+    The nearest real roots of the second derivative below and above -a, found by
+    solving all the quartics in one call, see :py:meth:`Pdf.arg_max_min_dpdf`.
+
+    :param coef: coefficients a, c0, c1, c2, c3, c4, shape (N, 6).
+    :return: argmax and argmin of the derivative, NaN where there is no such root,
+      each of shape (N,).
+    :rtype: tuple
+    """
+    coef = np.asarray(coef, dtype=float)
+    roots = quartic_roots(ddpdf_coef(coef))
+    real = np.where(roots.imag == 0, roots.real, np.nan)  # NaN padded if c4 = 0
+    x = -coef[:, :1]
+    argmax_dpdf = np.where(real < x, real, -np.inf).max(axis=1)
+    argmin_dpdf = np.where(real > x, real, np.inf).min(axis=1)
+    argmax_dpdf[np.isinf(argmax_dpdf)] = np.nan
+    argmin_dpdf[np.isinf(argmin_dpdf)] = np.nan
+    return argmax_dpdf, argmin_dpdf
+
 
 class Pdf:
     """Class for unnormalized PDF of Pearson distribution"""
@@ -12,16 +232,19 @@ class Pdf:
     """Partial Fraction Decomposition of the Pearson distribution"""
     coef: list = None
     """coefficients: a, c0, c1, c2, c3, c4"""
-    scale: float = None
-    """scale of the Pearson density function
-    PDF(-a), maximum or minimum of the PDF.
-
-    Scale up|down the density, such that the maximum|minimum density (at x = -a) equals 1.
-    """
-    is_max: bool = None
-    """whether -a is argmax or argmin"""
+    _ddpdf_roots = None
+    _arg_max_min_dpdf = None
 
     def __init__(self, pfd, coef):
+        """Initialize Pdf object
+
+        Nothing is evaluated here: the constants of the log density, :py:attr:`scale`,
+        :py:attr:`is_max`, the roots of ddpdf and the extrema of dpdf are each computed
+        on first use, then kept.
+
+        :param dict pfd: partial fraction decomposition.
+        :param list coef: coefficients a, c0, c1, c2, c3, c4.
+        """
         flag = pfd['type'] in [41,42,43,44,45,46,47,48,49]
         if not flag:
             raise ValueError('Invalid pfd')
@@ -29,36 +252,74 @@ class Pdf:
             raise ValueError('coef expects a, c0, c1, c2, c3, c4')
         self.pfd = pfd
         self.coef = coef
-        a = self.coef[0]
-        if self.pfd['type'] == 41: self.scale = self.log_pdf81(-a)
-        if self.pfd['type'] == 42: self.scale = self.log_pdf82(-a)
-        if self.pfd['type'] == 43: self.scale = self.log_pdf83(-a)
-        if self.pfd['type'] == 44: self.scale = self.log_pdf84(-a)
-        if self.pfd['type'] == 45: self.scale = self.log_pdf85(-a)
-        if self.pfd['type'] == 46: self.scale = self.log_pdf86(-a)
-        if self.pfd['type'] == 47: self.scale = self.log_pdf87(-a)
-        if self.pfd['type'] == 48: self.scale = self.log_pdf88(-a)
-        if self.pfd['type'] == 49: self.scale = self.log_pdf89(-a)
-        self.is_max = self.isMax()
-
-    def pdf(self, x):
+
+    @functools.cached_property
+    def _terms(self):
+        # constants of the log density of this type, resolved once
+        poles, pairs = log_pdf_terms(self.pfd)
+        return ([tuple(None if c is None else float(c) for c in term) for term in poles],
+                [tuple(None if c is None else float(c) for c in term) for term in pairs])
+
+    @functools.cached_property
+    def scale(self):
+        """scale of the Pearson density function
+        PDF(-a), maximum or minimum of the PDF.
+
+        Scale up|down the density, such that the maximum|minimum density (at x = -a) equals 1.
+        """
+        with stage('scale'):
+            return self._log_pdf(-self.coef[0])
+
+    @functools.cached_property
+    def is_max(self):
+        """whether -a is argmax or argmin"""
+        return self.isMax()
+
+    def _log_pdf(self, x, out=None, work=None):
+        # log density before scaling, math for a single float, NumPy otherwise
+        if out is None and isinstance(x, (float, int)):
+            try:
+                return eval_log_pdf_scalar(x, self._terms)
+            except (ValueError, ZeroDivisionError):
+                pass  # at a root, let NumPy produce inf/nan
+        return eval_log_pdf(x, self._terms, out, work)
+
+    def log_pdf(self, x, out=None, work=None):
+        """Log of the density function
+
+        :param float x: input value of the density function, it should be within
+          the support of the distribution.
+        :param out: array of the shape of ``x`` to write the result into.
+        :param work: scratch array of shape (3,) + x.shape, reused across calls.
+        :return: log density function value, 0 at x = -a
+        :rtype: np.float or np.array
+        """
+        value = self._log_pdf(x, out, work)
+        if np.ndim(value) == 0:
+            return value - self.scale
+        value -= self.scale
+        return value
+
+    def pdf(self, x, out=None, work=None):
         """Probability density function
 
         :param float x: input value of the density function, it should be within
           the support of the distribution.
+        :param out: array of the shape of ``x`` to write the result into.
+        :param work: scratch array of shape (3,) + x.shape, reused across calls, such
+          that repeated evaluations on a grid allocate no temporaries.
         :return: density function value
         :rtype: np.float or np.array
         """
-        if self.pfd['type'] == 41: return np.exp(self.log_pdf81(x) - self.scale)
-        if self.pfd['type'] == 42: return np.exp(self.log_pdf82(x) - self.scale)
-        if self.pfd['type'] == 43: return np.exp(self.log_pdf83(x) - self.scale)
-        if self.pfd['type'] == 44: return np.exp(self.log_pdf84(x) - self.scale)
-        if self.pfd['type'] == 45: return np.exp(self.log_pdf85(x) - self.scale)
-        if self.pfd['type'] == 46: return np.exp(self.log_pdf86(x) - self.scale)
-        if self.pfd['type'] == 47: return np.exp(self.log_pdf87(x) - self.scale)
-        if self.pfd['type'] == 48: return np.exp(self.log_pdf88(x) - self.scale)
-        if self.pfd['type'] == 49: return np.exp(self.log_pdf89(x) - self.scale)
-        return None
+        if out is None and isinstance(x, (float, int)):
+            try:
+                return math.exp(eval_log_pdf_scalar(x, self._terms) - self.scale)
+            except (ValueError, ZeroDivisionError, OverflowError):
+                pass
+        value = self.log_pdf(x, out, work)
+        if np.ndim(value) == 0:
+            return np.exp(value)
+        return np.exp(value, out=value)
 
     def log_pdf81(self, x):
         """log density function when :abbr:`PFD(Partial Fraction Decomposition)` type is 41
@@ -202,26 +463,73 @@ class Pdf:
         pow2 = -A3 * np.log(np.abs(x - x3)) - A4 * np.log(np.abs(x - x4))
         return pow1 + pow2
 
+    @functools.cached_property
+    def _quartic_coef(self):
+        # c4, c3, c2, c1, c0, as floats for Horner
+        return [float(c) for c in self.coef[:0:-1]]
+
+    @functools.cached_property
+    def _ddpdf_coef(self):
+        # P(x), see ddpdf_roots, as floats for Horner
+        return [float(c) for c in ddpdf_coef(self.coef)]
+
+    def quartic(self, x):
+        """:math:`Q(x) = c_0 + c_1 x + ... + c_4 x^4`, in Horner form
+
+        :param x: float or array.
+        :rtype: np.float or np.array
+        """
+        return horner(self._quartic_coef, x)
+
+    def ddpdf_num(self, x):
+        r""":math:`P(x)`, the numerator of the second derivative, see :py:meth:`ddpdf_roots`,
+        in Horner form
+
+        :param x: float or array.
+        :rtype: np.float or np.array
+        """
+        return horner(self._ddpdf_coef, x)
+
+    def eval_derivs(self, x, order=2):
+        r"""Log density, density and its derivatives, in one pass
+
+        With :math:`r(x) = -(a + x)/Q(x)`, :math:`p' = r p` and
+        :math:`p'' = P(x)/Q(x)^2 p`, see :py:meth:`ddpdf_roots`, such that the
+        logarithms are evaluated once and :math:`Q` and :math:`P` once each.
+
+        :param x: input value of the density function, float or array.
+        :param int order: highest derivative, 0, 1 or 2.
+        :return: log pdf, pdf, then dpdf if order >= 1 and ddpdf if order >= 2.
+        :rtype: tuple
+        """
+        if order not in (0, 1, 2):
+            raise ValueError(f'order = {order} not in 0, 1, 2')
+        log_pdf = self.log_pdf(x)
+        try:
+            pdf = math.exp(log_pdf)
+        except (TypeError, OverflowError):
+            pdf = np.exp(log_pdf)
+        if order == 0:
+            return log_pdf, pdf
+        q = self.quartic(x)
+        dpdf = -(self.coef[0] + x) / q * pdf
+        if order == 1:
+            return log_pdf, pdf, dpdf
+        ddpdf = self.ddpdf_num(x) / (q * q) * pdf
+        return log_pdf, pdf, dpdf, ddpdf
+
     def dpdf(self, x):
-        """Derivative of the density function
+        """Derivative of the density function, see :py:meth:`eval_derivs`
 
         :param float x: input value of the density function, it should be within
           the support of the distribution.
         :return: derivative of density function.
         :rtype: np.float or np.array"""
-        a, c0, c1 = self.coef[0], self.coef[1], self.coef[2]
-        c2, c3, c4 = self.coef[3], self.coef[4], self.coef[5]
-        num = a + x
-        den = c0 + c1 * x + c2 * (x ** 2) + c3 * (x ** 3) + c4 * (x ** 4)
-        return - (num / den) * self.pdf(x)
+        return self.eval_derivs(x, 1)[2]
 
     def isMax(self):
         """whether the density function is max at -a"""
-        a, c0, c1 = self.coef[0], self.coef[1], self.coef[2]
-        c2, c3, c4 = self.coef[3], self.coef[4], self.coef[5]
-        # The coefficients are ordered from the highest power to lowest (x^4 to x^0)
-        coef = [3 * c4, 2 * c3 + 4 * c4 * a, c2 + 3 * c3 * a + 1, 2 * a * (c2 + 1), a ** 2 + c1 * a - c0]
-        ddf = np.polyval(coef, -a)
+        ddf = self.ddpdf_num(-self.coef[0])
         if ddf < 0:
             return True
         elif ddf > 0:
@@ -231,11 +539,7 @@ class Pdf:
             return None
 
     def pdf_over_dpdf(self, x):
-        a, c0, c1 = self.coef[0], self.coef[1], self.coef[2]
-        c2, c3, c4 = self.coef[3], self.coef[4], self.coef[5]
-        num = c0 + c1*x + c2*x**2 + c3*x**3 + c4*x**4
-        den = a + x
-        return -num/den
+        return -self.quartic(x) / (self.coef[0] + x)
 
     def dpdf_over_ddpdf(self, x):
         r"""Ratio between the first and second derivative of the PDF.
@@ -247,15 +551,7 @@ class Pdf:
         :return: ratio at x.
         :rtype: float
         """
-        a, c0, c1 = self.coef[0], self.coef[1], self.coef[2]
-        c2, c3, c4 = self.coef[3], self.coef[4], self.coef[5]
-        num = (a + x) * (c0 + c1 * x + c2 * x ** 2 + c3 * x ** 3 + c4 * x ** 4)
-        den = ((3 * c4) * x ** 4
-               + (2 * c3 + 4 * c4 * a) * x ** 3
-               + (c2 + 3 * c3 * a + 1) * x ** 2
-               + 2 * a * (c2 + 1) * x
-               + (a ** 2 + c1 * a - c0))
-        return - num / den
+        return -(self.coef[0] + x) * self.quartic(x) / self.ddpdf_num(x)
 
     def ddpdf_roots(self):
         r"""Get roots of the second derivative of the PDF.
@@ -267,14 +563,16 @@ class Pdf:
         :math:`Q(x) = (c_0 + c_1x + c_2x^2 + c_3x^3 + c_4x^4)^2`.
         Therefore, to find roots of this second derivative is equivalent to
         finding roots of :math:`P(x)`, i.e., solving :math:`P(x) = 0`.
+        Computed once, then kept.
         """
-        a, c0, c1 = self.coef[0], self.coef[1], self.coef[2]
-        c2, c3, c4 = self.coef[3], self.coef[4], self.coef[5]
+        if self._ddpdf_roots is not None:
+            return self._ddpdf_roots
         # The coefficients are ordered from the highest power to lowest (x^4 to x^0)
-        coef_ddpdf = [3*c4, 2*c3 + 4*c4*a, c2 + 3*c3*a + 1, 2*a*(c2 + 1), a**2 + c1*a - c0]
-        roots = np.roots(coef_ddpdf)
+        roots = quartic_roots(self._ddpdf_coef)
+        roots = roots[np.isfinite(roots)]  # NaN padded if c4 = 0
         # print(f"The roots of ddpdf are: {roots}")
-        return roots[np.isreal(roots)].real
+        self._ddpdf_roots = roots[np.isreal(roots)].real
+        return self._ddpdf_roots
 
     def arg_max_min_dpdf(self):
         r"""Get argmax and argmin of the derivative of the PDF.
@@ -282,16 +580,20 @@ class Pdf:
         Limit to cases PDF(-a) reach the maximum value.
 
         From roots of the second derivative of the PDF.
-        Note that dpdf(-a) = 0, argmax_dpdf < -a, argmin_dpdf > -a
+        Note that dpdf(-a) = 0, argmax_dpdf < -a, argmin_dpdf > -a.
+        See :py:func:`arg_max_min_dpdf_many` for many fits at once. Computed once, then
+        kept.
 
         :return: argmax and argmin of the derivative of the PDF.
         :rtype: tuple
         """
+        if self._arg_max_min_dpdf is not None:
+            return self._arg_max_min_dpdf
         if not self.is_max:
             raise NotImplementedError('Not implemented for -a being the minimum')
         roots = self.ddpdf_roots()
         # sort
-        real_roots = np.sort(roots[np.isreal(roots)].real)
+        real_roots = np.sort(roots)
         #
         a = self.coef[0]
         # Find the index of the first element larger than `-a` (dpdf = 0)
@@ -308,4 +610,5 @@ class Pdf:
         else:
             warnings.warn("no ddpdf roots less than -a")
             argmax_dpdf = None
-        return argmax_dpdf, argmin_dpdf
+        self._arg_max_min_dpdf = argmax_dpdf, argmin_dpdf
+        return self._arg_max_min_dpdf
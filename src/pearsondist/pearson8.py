@@ -2,26 +2,54 @@
 I defined a class :py:class:`Pearson8` to construct Pearson distributions that
 match the first eight moments of the unknown distributions.
 """
+import functools
+import math
+
 import numpy as np
 
-from pearsondist.adjust_lb_ub import adjust_lb_ub
+from pearsondist import parallel
+from pearsondist.adjust_lb_ub import adjust_lb_ub, real_roots
+from pearsondist.cdf8 import Cdf8
+from pearsondist.expect8 import Expect8
+from pearsondist.instrument import count, stage
+from pearsondist.moments8 import natural_support, quad_moments, recurrence_moments, trusted_orders
+from pearsondist.pearson8batch import Pearson8Batch
 from pearsondist.pfdecom4 import PFDecom4
 from pearsondist.support8 import Support8
 from pearsondist.pdf import Pdf
+from pearsondist.quadrature import adaptive_quad
+from pearsondist.quartic import polish_roots, quartic_roots
+from pearsondist.rejection8 import Rejection8
+from pearsondist.rootcatalog4 import RootCatalog4, keeps_type
+from pearsondist.stdmom import affine_coef, destandardize, standardize
 
 
 class Pearson8:
-    """Class for Pearson distributions matching the first eight moments"""
+    """Class for Pearson distributions matching the first eight moments
+
+    Only the moments are stored on construction. The coefficients, roots, root type,
+    PFD and PDF are each derived on first access, then kept, so that, e.g., screening
+    the root types of many moment vectors skips the PFD and the PDF.
+    """
 
     mom: list = None     # the first eight moments
     """the first eight moments"""
-    coef: list = None    # a, c0, c1, c2, c3, c4
-    """coefficients of the Pearson distribution"""
-    pfd: dict = None     # partial fraction decomposition
-    """Partial Fraction Decomposition of the Pearson distribution"""
 
-    pdf_obj: Pdf = None
-    """Un-normalized PDF of the Pearson distribution"""
+    standard: 'Pearson8' = None
+    """fit of the standardized distribution if built by :py:meth:`canonical`, else None"""
+    loc: float = 0.0
+    """location of the affine map from :py:attr:`standard`"""
+    sigma: float = 1.0
+    r"""scale :math:`\sigma` of the affine map from :py:attr:`standard`"""
+
+    cdf_obj: Cdf8 = None
+    """CDF of the Pearson distribution, built on first use, see :py:meth:`cdf_table`"""
+    expect_obj: Expect8 = None
+    """quadrature rule over the support, built on first use, see :py:meth:`expectation`"""
+    rejection_obj: Rejection8 = None
+    """Rejection sampler of the Pearson distribution, see :py:meth:`rejection_sampler`"""
+    support_obj: Support8 = None
+    """search of the support, kept to warm start :py:meth:`refit`"""
 
     lower_bound: float = None
     """The lower bound of the support of the distribution"""
@@ -29,6 +57,10 @@ class Pearson8:
     """The upper bound of the support of the distribution"""
     bounds: tuple = None
     """(lower bound, upper bound)"""
+    norm_const: float = None
+    """Integral of the un-normalized PDF over the support, see :py:meth:`normalize`"""
+    log_norm_const: float = None
+    """Log of :py:attr:`norm_const`"""
 
     def __init__(self, moment: list):
         r"""Initialize Pearson8 object
@@ -39,11 +71,128 @@ class Pearson8:
         if len(moment) < 8:
             raise ValueError('mom_to_coef expects at least 8 moments')
         self.mom = moment[:8].copy()
-        self.mom_to_coef()
-        pfdecomp = PFDecom4(self.coef)
-        self.pfd = pfdecomp.pfd
-        self.pdf_obj = Pdf(self.pfd, self.coef)
-        # print(f'isMax: {self.pdf_obj.is_max}')
+
+    @functools.cached_property
+    def coef(self):
+        """coefficients of the Pearson distribution: a, c0, c1, c2, c3, c4"""
+        with stage('mom_to_coef'):
+            self.mom_to_coef()
+        return self.__dict__['coef']
+
+    @functools.cached_property
+    def roots(self):
+        """roots of c0 + c1 x + ... + c4 x^4, ordered as by
+        :py:class:`~pearsondist.rootcatalog4.RootCatalog4`"""
+        with stage('roots'):
+            z = quartic_roots(list(reversed(self.coef[1:])))  # note: c4, c3, c2, c1, c0
+        with stage('catalog'):
+            catalog = RootCatalog4(z)
+        self.type_no = catalog.type_no
+        return catalog.ordered_z
+
+    @functools.cached_property
+    def type_no(self):
+        """root type, 41, ..., 49, found along with :py:attr:`roots`"""
+        self.roots
+        return self.__dict__['type_no']
+
+    @functools.cached_property
+    def pfd(self):
+        """Partial Fraction Decomposition of the Pearson distribution"""
+        return PFDecom4(self.coef, self.roots, self.type_no).pfd
+
+    @functools.cached_property
+    def pdf_obj(self):
+        """Un-normalized PDF of the Pearson distribution"""
+        return Pdf(self.pfd, self.coef)
+
+    @classmethod
+    def canonical(cls, moment):
+        """Fit the standardized moments, then map the fit back
+
+        The linear system of the standardized moments is well scaled whatever the mean
+        and variance, see :py:func:`~pearsondist.stdmom.standardize`.
+
+        :param list moment: the first eight or more raw moments.
+        :return: the fit, with the standardized one in :py:attr:`standard`
+        :rtype: Pearson8
+        """
+        loc, sigma, std_mom = standardize(moment[:8])
+        return cls.from_standard(cls(std_mom), loc, sigma)
+
+    @classmethod
+    def from_standard(cls, standard, loc, sigma):
+        r"""Fit of :math:`X = \mu + \sigma Y` from the fit of Y, without solving again
+
+        The coefficients follow from :py:func:`~pearsondist.stdmom.affine_coef` and the
+        roots, of the same type, from :math:`x_k = \mu + \sigma y_k`. The bounds,
+        normalizing constant and density values are those of ``standard``, mapped on use,
+        so one standardized fit serves every location and scale.
+
+        :param Pearson8 standard: fit of Y.
+        :param float loc: location :math:`\mu`.
+        :param float sigma: scale :math:`\sigma > 0`.
+        :return: the fit of X
+        :rtype: Pearson8
+        """
+        if not sigma > 0:
+            raise ValueError(f'sigma = {sigma} <= 0')
+        self = cls.__new__(cls)
+        self.standard, self.loc, self.sigma = standard, loc, sigma
+        self.mom = destandardize(standard.mom, loc, sigma)
+        self.coef = affine_coef(standard.coef, loc, sigma)
+        self.roots, self.type_no = loc + sigma * standard.roots, standard.type_no
+        return self
+
+    def refit(self, moment, iter_max=8):
+        """Fit of nearby moments, warm started from this fit
+
+        Meant for sweeps where consecutive moment vectors differ slightly. The roots
+        are polished by Newton from those of this fit, see
+        :py:func:`~pearsondist.quartic.polish_roots`, instead of solved and cataloged
+        again. If the bounds of this fit are known, those of the new fit are searched
+        from its extrema of dpdf, see :py:meth:`Support8.warm_extrema`. The fit falls back
+        to a cold one when the root type changes, or the roots are repeated.
+
+        :param list moment: the first eight or more raw moments.
+        :param int iter_max: maximum Newton iterations per root.
+        :return: the new fit, this one is left unchanged
+        :rtype: Pearson8
+        """
+        if self.standard is not None:
+            loc, sigma, std_mom = standardize(moment[:8])
+            return Pearson8.from_standard(self.standard.refit(std_mom, iter_max), loc, sigma)
+        fit = Pearson8(moment)
+        type_no = self.type_no
+        with stage('roots'):
+            z, converged = polish_roots(fit.coef[:0:-1], self.roots, iter_max)
+        if converged and keeps_type(z, type_no):
+            count('refit_warm')
+            fit.roots, fit.type_no = z, type_no
+        else:
+            count('refit_cold')
+        if self.support_obj is not None and fit.type_no == type_no:
+            fit.determine_bounds(warm=self.support_obj)
+        return fit
+
+    @staticmethod
+    def fit_many(moments, n_jobs=1, chunk_size=None, bounds=True, validate=False):
+        """Fit many moment vectors at once
+
+        See :py:func:`~pearsondist.parallel.fit_many`, which returns the same columns
+        whatever the number of processes.
+
+        :param moments: array of shape (N, 8), one moment vector per row.
+        :param int n_jobs: number of processes, 1 to fit in this process, all CPUs if
+          None or -1.
+        :param int chunk_size: rows per task of the processes.
+        :param bool bounds: whether to determine the supports too.
+        :param bool validate: screen the moments first, see :py:class:`Pearson8Batch`.
+        :return: column arrays of coefficients, root types, PFD terms and, if ``bounds``,
+          supports.
+        :rtype: Pearson8Batch
+        """
+        return parallel.fit_many(moments, n_jobs, chunk_size, bounds, validate)
 
     def mom_to_coef(self):
         """From moments to coefficients
@@ -67,20 +216,252 @@ class Pearson8:
         x = np.linalg.solve(a, -b)  # solve ax = -b
         self.coef = list(x)
 
-    def pdf(self, x):
+    def pdf(self, x, out=None, work=None, normalized=False):
         """Probability density function
 
         :param float x: input value of the density function, it should be within
           the support of the distribution.
+        :param out: array of the shape of ``x`` to write the result into.
+        :param work: scratch array of shape (3,) + x.shape, reused across calls.
+        :param bool normalized: if True, the density integrates to one over the
+          support, otherwise it equals 1 at x = -a.
         :return: density function value
         :rtype: np.float or np.array
         """
-        return self.pdf_obj.pdf(x)
+        if self.standard is not None:
+            y = (np.asarray(x, dtype=float) - self.loc) / self.sigma
+            value = self.standard.pdf(y, out, work, normalized)
+            if normalized:
+                value /= self.sigma  # in place for arrays, into out if given
+            return value
+        if not normalized:
+            return self.pdf_obj.pdf(x, out, work)
+        value = self.log_pdf(x, out, work, normalized)
+        if np.ndim(value) == 0:
+            return np.exp(value)
+        return np.exp(value, out=value)
+
+    def log_pdf(self, x, out=None, work=None, normalized=False):
+        """Log of the probability density function
+
+        :param float x: input value of the density function, it should be within
+          the support of the distribution.
+        :param out: array of the shape of ``x`` to write the result into.
+        :param work: scratch array of shape (3,) + x.shape, reused across calls.
+        :param bool normalized: if True, subtract the log normalizing constant,
+          computed once by :py:meth:`normalize`.
+        :return: log density function value
+        :rtype: np.float or np.array
+        """
+        if self.standard is not None:
+            y = (np.asarray(x, dtype=float) - self.loc) / self.sigma
+            value = self.standard.log_pdf(y, out, work, normalized)
+            if normalized:
+                value -= math.log(self.sigma)
+            return value
+        value = self.pdf_obj.log_pdf(x, out, work)
+        if normalized:
+            log_norm_const = self.normalize()[1]
+            if np.ndim(value) == 0:
+                return value - log_norm_const
+            value -= log_norm_const
+        return value
+
+    def cdf(self, x):
+        """Cumulative distribution function
+
+        Looked up in the table from :py:meth:`cdf_table`, built on the first call.
+
+        :param float x: input value, 0 below and 1 above the support.
+        :return: CDF value
+        :rtype: np.float or np.array
+        """
+        return self.cdf_table().cdf(x)
+
+    def ppf(self, q):
+        """Percent point function, the inverse of :py:meth:`cdf`
+
+        :param float q: probability in [0, 1].
+        :return: quantile
+        :rtype: np.float or np.array
+        """
+        return self.cdf_table().ppf(q)
+
+    def rvs(self, size=1, rng=None, method='inverse'):
+        """Random draws from the distribution
+
+        :param size: number of draws, int or tuple.
+        :param rng: seed or :py:class:`numpy.random.Generator`.
+        :param str method: 'inverse' for inverse transform sampling on the CDF table,
+          'rejection' for the exact rejection sampler, which builds no table and suits
+          one-off distributions, see :py:meth:`rejection_sampler`.
+        :return: draws of shape ``size``
+        :rtype: np.ndarray
+        """
+        if method == 'inverse':
+            return self.cdf_table().rvs(size, rng)
+        if method == 'rejection':
+            return self.rejection_sampler().rvs(size, rng)
+        raise ValueError(f"unknown sampling method: {method}, expects 'inverse' or 'rejection'")
+
+    def rejection_sampler(self):
+        """Rejection sampler over the support, built once and then cached
+
+        Its :py:attr:`~pearsondist.rejection8.Rejection8.acceptance_rate` reports the
+        fraction of proposals accepted by the draws so far.
+
+        :return: the sampler
+        :rtype: Rejection8
+        """
+        if self.rejection_obj is None:
+            lb, ub = self.determine_bounds()
+            self.rejection_obj = Rejection8(self.pdf_obj, lb, ub)
+        return self.rejection_obj
+
+    def cdf_table(self, atol=None):
+        """Cumulative table of the CDF over the support, built once and then cached
+
+        :py:meth:`cdf`, :py:meth:`ppf` and :py:meth:`rvs` use whatever table is cached,
+        so a table built here with a looser or tighter ``atol`` serves them too.
+
+        :param float atol: error target of the CDF values, the table is rebuilt if it
+          differs from that of the cached one; None for the cached table, or 1e-10 if
+          there is none yet.
+        :return: the table
+        :rtype: Cdf8
+        """
+        if atol is None:
+            atol = 1e-10 if self.cdf_obj is None else self.cdf_obj.atol
+        if self.cdf_obj is None or self.cdf_obj.atol != atol:
+            lb, ub = self.determine_bounds()
+            std = math.sqrt(abs(self.mom[1] - self.mom[0] ** 2))
+            with stage('cdf_table'):
+                self.cdf_obj = Cdf8(self.pdf_obj.pdf, lb, ub, atol, width=std,
+                                    norm_const=self.normalize()[0])
+        return self.cdf_obj
+
+    def expectation(self, rule='adaptive', n=201, rtol=1e-10, points=None):
+        """Quadrature rule over the support, built once and then cached
+
+        :param str rule: 'adaptive', 'tanh-sinh' or 'gauss', see :py:class:`Expect8`; the
+          rule is rebuilt if it, ``n``, ``rtol`` or ``points`` differs from that of the
+          cached one.
+        :param int n: number of nodes of the fixed rules.
+        :param float rtol: relative tolerance of the adaptive rule.
+        :param points: breakpoints of the functions to integrate, see
+          :py:class:`Expect8`.
+        :return: the rule, with the density at its nodes
+        :rtype: Expect8
+        """
+        obj = self.expect_obj
+        points = tuple(sorted(float(p) for p in points or ()))
+        if obj is None or (obj.rule, obj.n, obj.rtol, obj.points) != (rule, n, rtol, points):
+            lb, ub = self.determine_bounds()
+            std = math.sqrt(abs(self.mom[1] - self.mom[0] ** 2))
+            with stage('expectation'):
+                self.expect_obj = Expect8(self.pdf, lb, ub, rule, n, rtol, std, points,
+                                          self.normalize()[0])
+        return self.expect_obj
+
+    def expect(self, g, rule='adaptive', n=201, rtol=1e-10, points=None):
+        r"""Expectation :math:`E[g(X)]` under the distribution
+
+        A dot product with the probability weights of :py:meth:`expectation`, so that many
+        expectations, e.g., payoffs or tail losses, share one evaluation of the density.
+        The nodes follow the density only: the kinks and jumps of ``g``, e.g., strikes,
+        are to be given as ``points``.
+
+        :param g: vectorized function, a sequence of them, or a function returning a
+          stack, see :py:meth:`Expect8.expect`.
+        :param str rule: 'adaptive', 'tanh-sinh' or 'gauss'.
+        :param int n: number of nodes of the fixed rules.
+        :param float rtol: relative tolerance of the adaptive rule.
+        :param points: breakpoints of ``g``, e.g., ``[K]``.
+        :return: expectation
+        :rtype: float or np.ndarray
+        """
+        return self.expectation(rule, n, rtol, points).expect(g)
+
+    def moments(self, k, rtol=1e-6):
+        """Raw moments of orders 1, ..., k of the fitted distribution
+
+        In O(k) by the recurrence of :py:mod:`~pearsondist.moments8`, run on the
+        standardized fit and seeded with the fitted mean and variance. The orders from
+        the first one whose error bound exceeds ``rtol`` on, see
+        :py:func:`~pearsondist.moments8.trusted_orders`, are integrated instead, over
+        the natural support of the fit, see :py:func:`~pearsondist.moments8.natural_support`.
+
+        :param int k: highest order.
+        :param float rtol: relative tolerance of the recurrence.
+        :return: the moments, the first eight close to :py:attr:`mom`; NaN for the orders
+          integrated whose integrals do not converge, see
+          :py:func:`~pearsondist.moments8.quad_moments`.
+        :rtype: list
+        """
+        if self.standard is not None:
+            return destandardize(self.standard.moments(k, rtol), self.loc, self.sigma)
+        loc, sigma, _ = standardize(self.mom[:2])
+        std_mom, err = recurrence_moments(affine_coef(self.coef, -loc / sigma, 1 / sigma),
+                                          max(k, 2))
+        std_mom, err = std_mom[:k], err[:k]
+        n = int(trusted_orders(std_mom, err, rtol))
+        if n == k:
+            count('moments_recurrence')
+        else:
+            count('moments_quad')
+            lb, ub = natural_support((real_roots(self.pfd) - loc) / sigma)
+            pdf = self.pdf_obj.pdf
+            with stage('moments'):
+                std_mom[n:] = quad_moments(lambda y: pdf(loc + sigma * y), lb, ub,
+                                           range(n + 1, k + 1))
+        return destandardize(std_mom, loc, sigma)
 
     def dpdf(self, x):
         """Derivative of the Pearson density function"""
         return self.pdf_obj.dpdf(x)
 
-    def determine_bounds(self):
-        support8 = Support8(self.pdf_obj)
-        return adjust_lb_ub(support8.lower_bound, support8.upper_bound, self.pfd)
+    def determine_bounds(self, warm=None):
+        """Support of the distribution, determined once and then cached
+
+        :param Support8 warm: support of a nearby fit to start the search from, see
+          :py:meth:`Support8.warm_extrema`.
+        :return: (lower bound, upper bound)
+        :rtype: tuple
+        """
+        if self.bounds is None and self.standard is not None:
+            lb, ub = self.standard.determine_bounds()
+            self.lower_bound = self.loc + self.sigma * lb
+            self.upper_bound = self.loc + self.sigma * ub
+            self.bounds = (self.lower_bound, self.upper_bound)
+        if self.bounds is None:
+            with stage('support'):
+                self.support_obj = Support8(self.pdf_obj, warm)
+            with stage('adjust_lb_ub'):
+                lbub = adjust_lb_ub(self.support_obj.lower_bound, self.support_obj.upper_bound,
+                                    self.pfd)
+            self.lower_bound, self.upper_bound = lbub
+            self.bounds = (self.lower_bound, self.upper_bound)
+        return self.bounds
+
+    def normalize(self, rtol=1e-10):
+        """Normalizing constant of the PDF, computed once and then cached
+
+        Integrates the un-normalized PDF over the support from
+        :py:meth:`determine_bounds` by vectorized adaptive quadrature. The same constant
+        normalizes :py:meth:`cdf_table` and :py:meth:`expectation`, so the CDF, the
+        expectations and the normalized PDF agree.
+
+        :param float rtol: relative tolerance of the quadrature.
+        :return: normalizing constant and its log.
+        :rtype: tuple
+        """
+        if self.norm_const is None and self.standard is not None:
+            self.norm_const = self.sigma * self.standard.normalize(rtol)[0]
+            self.log_norm_const = math.log(self.norm_const)
+        if self.norm_const is None:
+            lb, ub = self.determine_bounds()
+            std = math.sqrt(abs(self.mom[1] - self.mom[0] ** 2))
+            with stage('normalize'):
+                self.norm_const, _ = adaptive_quad(self.pdf_obj.pdf, lb, ub, rtol, width=std)
+            self.log_norm_const = math.log(self.norm_const)
+        return self.norm_const, self.log_norm_const
@@ -0,0 +1,301 @@
+"""
+Fit many Pearson distributions at once, each matching its own first eight moments.
+
+The results are kept as column arrays, one row per moment vector, instead of as
+:py:class:`~pearsondist.pearson8.Pearson8` objects.
+"""
+import numpy as np
+
+from pearsondist import instrument
+from pearsondist.adjust_lb_ub import adjust_lb_ub_many
+from pearsondist.moments8 import natural_support, quad_moments, recurrence_moments, trusted_orders
+from pearsondist.pdf import Pdf, eval_log_pdf, log_pdf_terms
+from pearsondist.pfdecom4 import pfd_dict, pfd_residues_many
+from pearsondist.quartic import quartic_roots
+from pearsondist.rootcatalog4 import catalog_roots
+from pearsondist.support8 import BoundStatus, support_bounds
+from pearsondist.stdmom import affine_coef, destandardize_many, standardize_many
+from pearsondist.validate import FitStatus, screen
+
+# result columns of Pearson8Batch: (attribute, trailing shape, dtype)
+COLUMNS = (
+    ('coef', (6,), np.float64),
+    ('type_no', (), np.int8),
+    ('roots', (4,), np.complex128),
+    ('residues', (4,), np.float64),
+    ('scale', (), np.float64),
+    ('lower_bound', (), np.float64),
+    ('upper_bound', (), np.float64),
+    ('bound_status', (2,), np.int8),
+    ('status', (), np.int8),
+)
+
+
+def coef_system(mom):
+    r"""Stacked linear systems from moments to coefficients
+
+    Row :math:`n` (:math:`n = 0, \cdots, 5`) of each system reads
+    :math:`a\mu_n - \sum_{k=0}^4 (n+k) c_k \mu_{n+k-1} = -\mu_{n+1}`, the same system as
+    :py:meth:`~pearsondist.pearson8.Pearson8.mom_to_coef`.
+
+    :param mom: the first eight raw moments, shape (N, 8).
+    :return: matrices of shape (N, 6, 6) and right-hand sides of shape (N, 6).
+    :rtype: tuple
+    """
+    mom = np.asarray(mom, dtype=float)
+    m = np.concatenate([np.ones((len(mom), 1)), mom[:, :8]], axis=1)  # mu_0, ..., mu_8
+    n = np.arange(6)[:, None]
+    k = np.arange(5)[None, :]
+    a = np.empty((len(mom), 6, 6))
+    a[:, :, 0] = m[:, :6]
+    a[:, :, 1:] = -(n + k) * m[:, np.maximum(n + k - 1, 0)]
+    return a, -m[:, 1:7]
+
+
+class Pearson8Batch:
+    """Class for many Pearson distributions, each matching the first eight moments
+
+    Row ``i`` of every column array belongs to the ``i``-th moment vector. A row that
+    cannot be fitted does not raise: its :py:attr:`status` tells why, and its columns
+    are NaN, of type 0, see :py:meth:`masked`.
+    """
+
+    mom: np.ndarray = None
+    """the first eight moments, shape (N, 8)"""
+    coef: np.ndarray = None
+    """coefficients a, c0, c1, c2, c3, c4, shape (N, 6)"""
+    type_no: np.ndarray = None
+    """root types 41, ..., 49, shape (N,)"""
+    roots: np.ndarray = None
+    """roots of c0 + c1 x + ... + c4 x^4, ordered as by RootCatalog4, shape (N, 4)"""
+    residues: np.ndarray = None
+    """partial fraction coefficients ordered as ``PFD_RESIDUES``, NaN padded, shape (N, 4)"""
+    scale: np.ndarray = None
+    """log density at -a of each fit, see :py:attr:`Pdf.scale`, shape (N,)"""
+    lower_bound: np.ndarray = None
+    """lower bounds of the supports, see :py:meth:`determine_bounds`, shape (N,)"""
+    upper_bound: np.ndarray = None
+    """upper bounds of the supports, see :py:meth:`determine_bounds`, shape (N,)"""
+    bound_status: np.ndarray = None
+    """:py:class:`~pearsondist.support8.BoundStatus` of the lower and upper bounds, shape (N, 2)"""
+    status: np.ndarray = None
+    """:py:class:`~pearsondist.validate.FitStatus` of each fit, shape (N,)"""
+
+    def __init__(self, moments, validate=False):
+        r"""Initialize Pearson8Batch object
+
+        :param moments: array of shape (N, 8) or more columns, row ``i`` holds the first
+          eight or more raw moments of the ``i``-th distribution, noting that
+          :math:`\mu_0` should not be included, and columns beyond the eighth are ignored.
+        :param bool validate: screen the moments before fitting, see
+          :py:func:`~pearsondist.validate.screen`, otherwise only non-finite moments,
+          singular systems and unclassified roots are caught.
+        """
+        moments = np.asarray(moments, dtype=float)
+        if moments.ndim != 2 or moments.shape[1] < 8:
+            raise ValueError('Pearson8Batch expects an (N, 8) array of moments')
+        self.mom = moments[:, :8].copy()
+        if validate:
+            self.status = screen(self.mom)
+        else:
+            self.status = np.where(np.isfinite(self.mom).all(axis=1), FitStatus.OK,
+                                   FitStatus.NONFINITE).astype(np.int8)
+        with instrument.stage('mom_to_coef'):
+            self.mom_to_coef()
+        self.decompose()
+        self.scale = np.full(len(self), np.nan)
+        with instrument.stage('scale'):
+            for type_no, i in self.groups():
+                terms = log_pdf_terms(pfd_dict(type_no, self.roots[i], self.residues[i]))
+                self.scale[i] = eval_log_pdf(-self.coef[i, 0], terms)
+
+    def __len__(self):
+        return len(self.mom)
+
+    def mom_to_coef(self, rcond=1e-12):
+        """From moments to coefficients, all systems solved in one call
+
+        The systems are equilibrated by rows and columns, then factored once to get both
+        the coefficients and the inverse, whose norm gives the reciprocal condition
+        number. Rows not OK get NaN coefficients, and systems singular or nearly so,
+        whose coefficients would be mostly rounding errors, SINGULAR.
+
+        :param float rcond: smallest reciprocal condition number, in the 1-norm, of an
+          equilibrated system still solved.
+        :return: None
+        """
+        ok = np.flatnonzero(self.status == FitStatus.OK)
+        a, b = coef_system(self.mom[ok])
+        r = np.abs(a).max(axis=2, keepdims=True)
+        r[r == 0] = 1.0
+        a, b = a / r, b / r[:, :, 0]
+        c = np.abs(a).max(axis=1, keepdims=True)
+        c[c == 0] = 1.0
+        a = a / c
+        rhs = np.concatenate([b[:, :, None], np.broadcast_to(np.eye(6), a.shape)], axis=2)
+        try:
+            y = np.linalg.solve(a, rhs)
+        except np.linalg.LinAlgError:  # exactly singular systems, solve one by one
+            y = np.full(rhs.shape, np.nan)
+            for j in range(len(a)):
+                try:
+                    y[j] = np.linalg.solve(a[j], rhs[j])
+                except np.linalg.LinAlgError:
+                    pass
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inv_norm = np.abs(y[:, :, 1:]).sum(axis=1).max(axis=1)
+            singular = ~(1 / (np.abs(a).sum(axis=1).max(axis=1) * inv_norm) >= rcond)
+        self.status[ok[singular]] = FitStatus.SINGULAR
+        self.coef = np.full((len(self), 6), np.nan)
+        self.coef[ok[~singular]] = y[~singular, :, 0] / c[~singular, 0, :]
+
+    def decompose(self):
+        """Roots, root types and partial fraction coefficients of all fits
+
+        :return: None
+        """
+        ok = np.flatnonzero(self.status == FitStatus.OK)
+        z = np.full((len(self), 4), np.nan, dtype=complex)
+        with instrument.stage('roots'):
+            z[ok] = quartic_roots(self.coef[ok, :0:-1])  # note: c4, c3, c2, c1, c0
+        with instrument.stage('catalog'):
+            self.type_no, self.roots = catalog_roots(z)
+        # rows not fitted, or with fewer than four roots, have no type
+        unclassified = ~np.isfinite(z).all(axis=1)
+        self.type_no[unclassified] = 0
+        self.roots[unclassified] = np.nan
+        self.status[(self.type_no == 0) & (self.status == FitStatus.OK)] = FitStatus.UNCLASSIFIED
+        self.residues = np.full((len(self), 4), np.nan)
+        with instrument.stage('pfd'):
+            for type_no, i in self.groups():
+                self.residues[i] = pfd_residues_many(type_no, self.roots[i], self.coef[i])
+        if instrument.enabled():
+            for type_no, n in zip(*np.unique(self.type_no, return_counts=True)):
+                instrument.root_type(type_no, n)
+
+    def determine_bounds(self, eps=1e-5, iter_max=10):
+        """Supports of all fits, determined once and then cached
+
+        The batched counterpart of :py:meth:`Pearson8.determine_bounds`: the bounds of
+        all fits are solved together by :py:func:`~pearsondist.support8.support_bounds`,
+        then adjusted to the real roots by
+        :py:func:`~pearsondist.adjust_lb_ub.adjust_lb_ub_many`. Bounds that could not be
+        determined are NaN, see :py:attr:`bound_status`.
+
+        :param float eps: tolerance of the Newton step.
+        :param int iter_max: maximum number of Newton iterations.
+        :return: lower and upper bounds, each of shape (N,).
+        :rtype: tuple
+        """
+        if self.lower_bound is None:
+            real = np.where(np.abs(self.roots.imag) < 1e-10, self.roots.real, np.nan)
+            with instrument.stage('support'):
+                lb, ub, status = support_bounds(self.coef, self.type_no, real, eps=eps,
+                                                iter_max=iter_max)
+            lb[self.type_no == 0] = ub[self.type_no == 0] = np.nan
+            status[self.type_no == 0] = BoundStatus.FAILED
+            with instrument.stage('adjust_lb_ub'):
+                self.lower_bound, self.upper_bound = adjust_lb_ub_many(lb, ub, real)
+            self.bound_status = status
+        return self.lower_bound, self.upper_bound
+
+    def moments(self, k, rtol=1e-6):
+        """Raw moments of orders 1, ..., k of all fits
+
+        The batched counterpart of :py:meth:`Pearson8.moments`: the recurrence runs on
+        all standardized fits at once, and only in the rows where some order is
+        ill-conditioned are the orders from it on integrated, one row at a time.
+
+        :param int k: highest order.
+        :param float rtol: relative tolerance of the recurrence.
+        :return: moments, NaN in the rows not OK and for the orders integrated whose
+          integrals do not converge, shape (N, k).
+        :rtype: np.ndarray
+        """
+        out = np.full((len(self), k), np.nan)
+        loc, scale, _ = standardize_many(self.mom[:, :2])
+        i = np.flatnonzero((self.status == FitStatus.OK) & (self.type_no != 0)
+                           & np.isfinite(scale))
+        loc, scale = loc[i], scale[i]
+        std_coef = np.stack(affine_coef(self.coef[i].T, -loc / scale, 1 / scale), axis=1)
+        with instrument.stage('moments'):
+            std_mom, err = recurrence_moments(std_coef, max(k, 2))
+            std_mom, err = std_mom[:, :k], err[:, :k]
+            n = trusted_orders(std_mom, err, rtol)
+            for r in np.flatnonzero(n < k):
+                j = i[r]
+                real = np.where(np.abs(self.roots[j].imag) < 1e-10, self.roots[j].real, np.nan)
+                lb, ub = natural_support((real - loc[r]) / scale[r])
+                pdf = Pdf(self.pfd(j), self.coef[j]).pdf
+                std_mom[r, n[r]:] = quad_moments(
+                    lambda y, x0=loc[r], s=scale[r]: pdf(x0 + s * y), lb, ub,
+                    range(n[r] + 1, k + 1))
+            out[i] = destandardize_many(std_mom, loc, scale)
+        if instrument.enabled():
+            instrument.count('moments_recurrence', np.count_nonzero(n == k))
+            instrument.count('moments_quad', np.count_nonzero(n < k))
+        return out
+
+    def masked(self, key):
+        """Column with the rows not OK masked
+
+        :param str key: name of the column, e.g., 'coef' or 'lower_bound'.
+        :return: the column, masked where :py:attr:`status` is not OK
+        :rtype: np.ma.MaskedArray
+        """
+        value = getattr(self, key)
+        bad = (self.status != FitStatus.OK).reshape((-1,) + (1,) * (value.ndim - 1))
+        return np.ma.masked_array(value, np.broadcast_to(bad, value.shape))
+
+    def groups(self):
+        """Row indices of the fits of each root type
+
+        :return: pairs of (root type, row indices), for the types present.
+        :rtype: list
+        """
+        return [(int(t), np.flatnonzero(self.type_no == t))
+                for t in np.unique(self.type_no) if t != 0]
+
+    def pfd(self, i):
+        """Partial fraction decomposition of the ``i``-th fit
+
+        :param int i: row index.
+        :return: the same dict as :py:attr:`Pearson8.pfd` would hold.
+        :rtype: dict
+        """
+        return pfd_dict(int(self.type_no[i]), self.roots[i], self.residues[i])
+
+    def log_pdf(self, x, out=None):
+        """Log density of all fits, evaluated type by type
+
+        :param x: a grid of shape (M,) shared by all fits, or one grid per fit,
+          shape (N, M).
+        :param out: array of shape (N, M) to write the result into.
+        :return: log density values, such that the density at -a is 1, shape (N, M).
+          Rows of fits without a valid root type are NaN.
+        :rtype: np.ndarray
+        """
+        x = np.asarray(x, dtype=float)
+        if x.ndim not in (1, 2):
+            raise ValueError('x expects a shared grid (M,) or one grid per fit (N, M)')
+        if out is None:
+            out = np.empty((len(self), x.shape[-1]))
+        out[self.type_no == 0] = np.nan
+        for type_no, i in self.groups():
+            terms = log_pdf_terms(pfd_dict(type_no, self.roots[i][:, None], self.residues[i][:, None]))
+            value = eval_log_pdf(x[i] if x.ndim == 2 else x, terms)
+            value -= self.scale[i, None]
+            out[i] = value
+        return out
+
+    def pdf(self, x, out=None):
+        """Density of all fits, unnormalized as :py:meth:`Pdf.pdf`
+
+        :param x: a grid of shape (M,) shared by all fits, or one grid per fit,
+          shape (N, M).
+        :param out: array of shape (N, M) to write the result into.
+        :return: density values, shape (N, M).
+        :rtype: np.ndarray
+        """
+        out = self.log_pdf(x, out)
+        return np.exp(out, out=out)
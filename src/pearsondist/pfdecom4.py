@@ -1,31 +1,191 @@
 import numpy as np
+from pearsondist.instrument import root_type, stage
+from pearsondist.quartic import quartic_roots
 from pearsondist.rootcatalog4 import RootCatalog4
 
+# Which of the ordered roots enter the pfd of each type: (key, index, is_complex)
+PFD_ROOTS = {
+    41: (('x1', 0, True),),
+    42: (('x1', 0, True), ('x2', 2, True)),
+    43: (('x1', 0, False), ('x3', 2, True)),
+    44: (('x1', 0, False), ('x2', 1, False), ('x3', 2, True)),
+    45: (('x1', 0, False),),
+    46: (('x1', 0, False), ('x4', 3, False)),
+    47: (('x1', 0, False), ('x3', 2, False)),
+    48: (('x1', 0, False), ('x3', 2, False), ('x4', 3, False)),
+    49: (('x1', 0, False), ('x2', 1, False), ('x3', 2, False), ('x4', 3, False)),
+}
+# The partial fraction coefficients of each type, in column order
+PFD_RESIDUES = {
+    41: ('A1', 'B1'),
+    42: ('A1', 'B1', 'A2', 'B2'),
+    43: ('A1', 'A2', 'A3', 'B3'),
+    44: ('A1', 'A2', 'A3', 'B3'),
+    45: ('A3', 'A4'),
+    46: ('A1', 'A2', 'A3', 'A4'),
+    47: ('A1', 'A2', 'A3', 'A4'),
+    48: ('A1', 'A2', 'A3', 'A4'),
+    49: ('A1', 'A2', 'A3', 'A4'),
+}
+
+
+def pfd_dict(type_no, z, r):
+    """Assemble a pfd dict from ordered roots and partial fraction coefficients
+
+    Works on a single fit (``z`` of shape (4,)) as well as on a group of fits of the
+    same type (``z`` of shape (n, 4)), in which case the values are columns.
+
+    :param int type_no: root type, 41, ..., 49.
+    :param z: roots ordered as by :py:class:`RootCatalog4`, shape (..., 4).
+    :param r: partial fraction coefficients ordered as ``PFD_RESIDUES[type_no]``,
+      shape (..., 4), unused trailing entries are ignored.
+    :return: partial fraction decomposition, same keys as :py:class:`PFDecom4`.
+    :rtype: dict
+    """
+    pfd = {}
+    for key, i, is_complex in PFD_ROOTS[type_no]:
+        pfd[key] = z[..., i] if is_complex else z[..., i].real
+    for j, key in enumerate(PFD_RESIDUES[type_no]):
+        pfd[key] = r[..., j]
+    pfd['type'] = type_no
+    return pfd
+
+
+def pfd_residues(pfd):
+    """Partial fraction coefficients of a pfd dict, ordered as ``PFD_RESIDUES``"""
+    r = np.full(4, np.nan)
+    for j, key in enumerate(PFD_RESIDUES[pfd['type']]):
+        r[j] = pfd[key]
+    return r
+
+
+def pfd_residues_many(type_no, z, coef, out=None):
+    r"""Partial fraction coefficients of many fits of the same type, in closed form
+
+    With :math:`g(x) = (a + x) / (c_4 \prod_i (x - x_i))`, the coefficient of
+    :math:`1/(x - x_k)^j` is a Taylor coefficient of :math:`(x - x_k)^m g(x)` at
+    :math:`x_k`, where :math:`m` is the multiplicity of :math:`x_k`. A pair of complex
+    roots :math:`x_k, \bar{x}_k` with residue :math:`r_k` contributes
+    :math:`(A x + B) / (x^2 + px + q)` with :math:`A = 2\Re r_k`,
+    :math:`B = -2\Re(r_k \bar{x}_k)`. No linear system is solved.
+
+    :param int type_no: root type shared by all fits, 41, ..., 49.
+    :param z: roots ordered as by :py:class:`RootCatalog4`, shape (n, 4).
+    :param coef: coefficients a, c0, c1, c2, c3, c4, shape (n, 6).
+    :param out: preallocated array of shape (n, 4) to fill, coefficients ordered as
+      ``PFD_RESIDUES[type_no]``; unused trailing columns are left untouched.
+    :return: ``out``, or a new NaN padded array if not given.
+    :rtype: np.ndarray
+    """
+    z = np.asarray(z)
+    coef = np.asarray(coef, dtype=float)
+    if out is None:
+        out = np.full((len(z), 4), np.nan)
+    a, c4 = coef[:, 0], coef[:, -1]
+    if type_no == 41:
+        # (A1 x + B1) / (x^2 + px + q)^2
+        out[:, 0] = 1 / c4
+        out[:, 1] = a / c4
+    elif type_no == 42:
+        x1, x2 = z[:, 0], z[:, 2]
+        r1 = (x1 + a) / (c4 * (x1 - x1.conj()) * (x1 - x2) * (x1 - x2.conj()))
+        r2 = (x2 + a) / (c4 * (x2 - x2.conj()) * (x2 - x1) * (x2 - x1.conj()))
+        out[:, 0], out[:, 1] = 2 * r1.real, -2 * (r1 * x1.conj()).real
+        out[:, 2], out[:, 3] = 2 * r2.real, -2 * (r2 * x2.conj()).real
+    elif type_no == 43:
+        x1, x3 = z[:, 0].real, z[:, 2]
+        p, q = -2 * x3.real, np.abs(x3) ** 2
+        q1 = x1 ** 2 + p * x1 + q
+        a2 = (x1 + a) / (c4 * q1)
+        out[:, 0] = 1 / (c4 * q1) - a2 * (2 * x1 + p) / q1
+        out[:, 1] = a2
+        r3 = (x3 + a) / (c4 * (x3 - x1) ** 2 * (x3 - x3.conj()))
+        out[:, 2], out[:, 3] = 2 * r3.real, -2 * (r3 * x3.conj()).real
+    elif type_no == 44:
+        x1, x2, x3 = z[:, 0].real, z[:, 1].real, z[:, 2]
+        p, q = -2 * x3.real, np.abs(x3) ** 2
+        out[:, 0] = (x1 + a) / (c4 * (x1 - x2) * (x1 ** 2 + p * x1 + q))
+        out[:, 1] = (x2 + a) / (c4 * (x2 - x1) * (x2 ** 2 + p * x2 + q))
+        r3 = (x3 + a) / (c4 * (x3 - x1) * (x3 - x2) * (x3 - x3.conj()))
+        out[:, 2], out[:, 3] = 2 * r3.real, -2 * (r3 * x3.conj()).real
+    elif type_no == 45:
+        x1 = z[:, 0].real
+        out[:, 0] = 1 / c4
+        out[:, 1] = (a + x1) / c4
+    elif type_no == 46:
+        x1, x4 = z[:, 0].real, z[:, 3].real
+        d = x1 - x4
+        out[:, 0] = (a + x4) / (c4 * d ** 3)
+        out[:, 1] = -(a + x4) / (c4 * d ** 2)
+        out[:, 2] = (a + x1) / (c4 * d)
+        out[:, 3] = -(a + x4) / (c4 * d ** 3)
+    elif type_no == 47:
+        x1, x3 = z[:, 0].real, z[:, 2].real
+        d = x1 - x3
+        out[:, 1] = (x1 + a) / (c4 * d ** 2)
+        out[:, 0] = 1 / (c4 * d ** 2) - 2 * out[:, 1] / d
+        out[:, 3] = (x3 + a) / (c4 * d ** 2)
+        out[:, 2] = 1 / (c4 * d ** 2) + 2 * out[:, 3] / d
+    elif type_no == 48:
+        x1, x3, x4 = z[:, 0].real, z[:, 2].real, z[:, 3].real
+        d13, d14, d34 = x1 - x3, x1 - x4, x3 - x4
+        out[:, 1] = (x1 + a) / (c4 * d13 * d14)
+        out[:, 0] = 1 / (c4 * d13 * d14) - out[:, 1] * (1 / d13 + 1 / d14)
+        out[:, 2] = (x3 + a) / (c4 * d13 ** 2 * d34)
+        out[:, 3] = -(x4 + a) / (c4 * d14 ** 2 * d34)
+    elif type_no == 49:
+        x = z.real
+        for k in range(4):
+            others = [j for j in range(4) if j != k]
+            den = np.prod(x[:, [k]] - x[:, others], axis=1)
+            out[:, k] = (x[:, k] + a) / (c4 * den)
+    else:
+        raise ValueError(f'unknown root type: {type_no}')
+    return out
+
 
 class PFDecom4:
 
     coef: list = None
     pfd: dict = None
+    roots = None
+    """roots of c0 + c1 x + ... + c4 x^4, ordered as by :py:class:`RootCatalog4`"""
+
+    def __init__(self, coef, z=None, type_no=None):
+        """Initialize PFDecom4 object
 
-    def __init__(self, coef):
+        :param list coef: coefficients a, c0, c1, c2, c3, c4.
+        :param z: roots of c0 + c1 x + ... + c4 x^4 if already known, e.g., from
+          :py:func:`~pearsondist.quartic.quartic_roots` over a batch.
+        :param int type_no: root type if ``z`` is already ordered and cataloged, e.g., by
+          :py:func:`~pearsondist.rootcatalog4.catalog_roots`.
+        """
         if len(coef) != 6:
             raise ValueError('coef expects a, c0, c1, c2, c3, c4')
         self.coef = coef
-        z = np.roots(list(reversed(coef[1:])))  # note: c4, c3, c2, c1, c0
+        if z is None:
+            with stage('roots'):
+                z = quartic_roots(list(reversed(coef[1:])))  # note: c4, c3, c2, c1, c0
 
         # print("c: ", list(reversed(coef[1:])))
         # print("z: ", z)
 
-        z = RootCatalog4(z)
-        if z.type_no == 41: self.pfd = self.pfd41(z.ordered_z)
-        if z.type_no == 42: self.pfd = self.pfd42(z.ordered_z)
-        if z.type_no == 43: self.pfd = self.pfd43(z.ordered_z)
-        if z.type_no == 44: self.pfd = self.pfd44(z.ordered_z)
-        if z.type_no == 45: self.pfd = self.pfd45(z.ordered_z)
-        if z.type_no == 46: self.pfd = self.pfd46(z.ordered_z)
-        if z.type_no == 47: self.pfd = self.pfd47(z.ordered_z)
-        if z.type_no == 48: self.pfd = self.pfd48(z.ordered_z)
-        if z.type_no == 49: self.pfd = self.pfd49(z.ordered_z)
+        if type_no is None:
+            with stage('catalog'):
+                catalog = RootCatalog4(z)
+            z, type_no = catalog.ordered_z, catalog.type_no
+        root_type(type_no)
+        self.roots = z
+        with stage('pfd'):
+            if type_no == 41: self.pfd = self.pfd41(z)
+            if type_no == 42: self.pfd = self.pfd42(z)
+            if type_no == 43: self.pfd = self.pfd43(z)
+            if type_no == 44: self.pfd = self.pfd44(z)
+            if type_no == 45: self.pfd = self.pfd45(z)
+            if type_no == 46: self.pfd = self.pfd46(z)
+            if type_no == 47: self.pfd = self.pfd47(z)
+            if type_no == 48: self.pfd = self.pfd48(z)
+            if type_no == 49: self.pfd = self.pfd49(z)
 
     def pfd41(self, z):
         # all complex: (x1, x2) = (x3, x4)
@@ -98,7 +258,7 @@ class PFDecom4:
         a = np.array([
             [1, 0, 0, 1],
             [-(2 * x1 + x4), 1, 0, -3 * x1],
-            [x1 ** 2 + 2 * x1 * x4, -2 * (x1 + x4), 1, 3 * x1 ** 2],
+            [x1 ** 2 + 2 * x1 * x4, -(x1 + x4), 1, 3 * x1 ** 2],
             [-x1 ** 2 * x4, x1 * x4, -x4, -x1 ** 3]
         ])
         b = np.array([0, 0, 1 / self.coef[-1], self.coef[0] / self.coef[-1]])
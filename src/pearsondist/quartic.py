@@ -0,0 +1,72 @@
+"""
+Roots of many quartic polynomials at once.
+"""
+import numpy as np
+
+_COMPANION = np.eye(4, k=-1)
+
+
+def quartic_roots(p):
+    """Roots of quartic polynomials, all solved in one call
+
+    The roots are the eigenvalues of the companion matrices, built and ordered
+    exactly as :py:func:`numpy.roots` does, such that the results agree with it.
+    Rows whose leading or trailing coefficient is zero are handed to
+    :py:func:`numpy.roots`, and padded with NaN if the degree drops below four.
+
+    :param p: coefficients ordered from the highest power to the lowest (x^4 to x^0),
+      shape (5,) or (N, 5).
+    :return: roots, shape (4,) or (N, 4).
+    :rtype: np.ndarray
+    """
+    p = np.asarray(p, dtype=float)
+    if p.shape[-1] != 5:
+        raise ValueError('quartic_roots expects coefficients of shape (N, 5)')
+    single = p.ndim == 1
+    if single and p[0] != 0 and p[4] != 0:
+        a = _COMPANION.copy()
+        a[0] = -p[1:] / p[0]
+        return np.linalg.eigvals(a)
+    p = np.atleast_2d(p)
+    regular = (p[:, 0] != 0) & (p[:, 4] != 0)
+    z = np.full((len(p), 4), np.nan, dtype=complex)
+    a = np.zeros((np.count_nonzero(regular), 4, 4))
+    a[:, 0, :] = -p[regular, 1:] / p[regular, :1]
+    a[:, [1, 2, 3], [0, 1, 2]] = 1.0
+    z[regular] = np.linalg.eigvals(a)
+    for i in np.flatnonzero(~regular):
+        zi = np.roots(p[i])
+        z[i, :len(zi)] = zi
+    return z[0] if single else z
+
+
+def polish_roots(p, z, iter_max=8, rtol=1e-14):
+    """Newton iterations on the roots of a quartic polynomial, from nearby roots
+
+    Each root is refined on its own from its seed, e.g., the roots of a nearby
+    polynomial, with no companion matrix. Seeds conjugate in pairs stay so.
+
+    :param p: coefficients ordered from the highest power to the lowest (x^4 to x^0).
+    :param z: seeds, shape (4,).
+    :param int iter_max: maximum number of iterations per root.
+    :param float rtol: tolerance of the Newton step relative to the root.
+    :return: roots, and whether every root converged.
+    :rtype: tuple
+    """
+    p4, p3, p2, p1, p0 = (float(c) for c in p)
+    roots = []
+    for x in z:
+        x = complex(x)
+        for _ in range(iter_max):
+            f = (((p4 * x + p3) * x + p2) * x + p1) * x + p0
+            df = ((4 * p4 * x + 3 * p3) * x + 2 * p2) * x + p1
+            if df == 0:
+                return np.array(z, dtype=complex), False
+            step = f / df
+            x -= step
+            if abs(step) <= rtol * abs(x):
+                break
+        else:
+            return np.array(z, dtype=complex), False
+        roots.append(x)
+    return np.array(roots), True
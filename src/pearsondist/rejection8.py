@@ -0,0 +1,81 @@
+"""
+Exact sampling from the Pearson distribution by rejection, without a CDF table.
+"""
+import math
+
+import numpy as np
+
+
+class Rejection8:
+    """Class for the bounded rejection sampler of the Pearson distribution
+
+    When -a is the argmax, :py:class:`~pearsondist.pdf.Pdf` scales the density such that
+    its maximum, at x = -a, equals 1. The box of height 1 over the finite support is then
+    an envelope: a uniform proposal x is accepted if a uniform u in [0, height) falls
+    below the density at x. Since -a is the only stationary point of the density, it is
+    monotone between -a and the bounds, and otherwise the height is the larger density
+    at the two bounds. Proposals are drawn and tested in vectorized blocks.
+    """
+
+    lower_bound: float = None
+    """The lower bound of the support of the distribution"""
+    upper_bound: float = None
+    """The upper bound of the support of the distribution"""
+    height: float = None
+    """height of the envelope, the maximum of the density over the support"""
+    n_proposed: int = 0
+    """number of proposals drawn so far"""
+    n_accepted: int = 0
+    """number of proposals accepted so far"""
+
+    def __init__(self, pdf_obj, lb, ub):
+        """Initialize Rejection8 object
+
+        :param Pdf pdf_obj: un-normalized PDF.
+        :param float lb: lower bound of the support, finite.
+        :param float ub: upper bound of the support, finite.
+        """
+        if not (math.isfinite(lb) and math.isfinite(ub)):
+            raise NotImplementedError(f'rejection sampling needs a finite support, got ({lb}, {ub})')
+        self.pdf_obj = pdf_obj
+        self.lower_bound, self.upper_bound = lb, ub
+        if pdf_obj.is_max and lb <= -pdf_obj.coef[0] <= ub:
+            self.height = 1.0
+        else:
+            self.height = float(max(pdf_obj.pdf(float(lb)), pdf_obj.pdf(float(ub))))
+        if not math.isfinite(self.height):
+            raise NotImplementedError(f'the PDF is unbounded on the support ({lb}, {ub})')
+
+    @property
+    def acceptance_rate(self):
+        """Fraction of the proposals accepted so far, NaN before any draw"""
+        if self.n_proposed == 0:
+            return math.nan
+        return self.n_accepted / self.n_proposed
+
+    def rvs(self, size=1, rng=None, block=2 ** 20):
+        """Random draws by rejection from the box of :py:attr:`height` over the support
+
+        :param size: number of draws, int or tuple.
+        :param rng: seed or :py:class:`numpy.random.Generator`.
+        :param int block: largest number of proposals drawn and tested at once.
+        :return: draws of shape ``size``
+        :rtype: np.ndarray
+        """
+        rng = np.random.default_rng(rng)
+        out = np.empty(size)
+        flat = out.reshape(-1)
+        lb, width = self.lower_bound, self.upper_bound - self.lower_bound
+        filled = 0
+        while filled < flat.size:
+            # enough proposals for the remaining draws at the acceptance rate so far
+            rate = self.acceptance_rate if self.n_accepted else 0.5
+            n = min(block, max(1024, int(1.1 * (flat.size - filled) / rate)))
+            x = lb + width * rng.random(n)
+            x = x[self.height * rng.random(n) < self.pdf_obj.pdf(x)]
+            self.n_proposed += n
+            self.n_accepted += len(x)
+            take = min(len(x), flat.size - filled)
+            flat[filled:filled + take] = x[:take]
+            filled += take
+        return out
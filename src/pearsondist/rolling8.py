@@ -0,0 +1,136 @@
+"""
+Fit Pearson distributions to the sliding windows of a series, all at once.
+"""
+import numpy as np
+
+from pearsondist import instrument
+from pearsondist.pearson8batch import Pearson8Batch
+from pearsondist.stdmom import affine_coef, standardize_many
+
+
+def rolling_power_sums(x, window, order=8, step=1):
+    r"""Power sums :math:`\sum x^p`, p = 1, ..., order, of the sliding windows
+
+    The series is cut into blocks of ``window`` points with a cumulative sum restarting
+    in each block, such that every window is the tail of one block plus the head of the
+    next: two differences per window and power, whatever the length of the series, and
+    rounding errors on the scale of a window rather than of the whole series.
+
+    :param x: series, shape (n,).
+    :param int window: number of points per window.
+    :param int order: highest power.
+    :param int step: distance between the starts of consecutive windows.
+    :return: sums of shape (N, order), row ``i`` for the window starting at ``i * step``.
+    :rtype: np.ndarray
+    """
+    x = np.asarray(x, dtype=float).reshape(-1)
+    if not 1 <= window <= len(x):
+        raise ValueError(f'window = {window} not in [1, {len(x)}]')
+    start = np.arange(0, len(x) - window + 1, step)
+    k, r = np.divmod(start, window)
+    n_blocks = -(-len(x) // window) + 1
+    padded = np.zeros(n_blocks * window)
+    padded[:len(x)] = x
+    base = padded.reshape(n_blocks, window)
+    power = np.ones_like(base)
+    cum = np.zeros((n_blocks, window + 1))
+    sums = np.empty((len(start), order))
+    for p in range(order):
+        power *= base
+        np.cumsum(power, axis=1, out=cum[:, 1:])
+        sums[:, p] = cum[k, -1] - cum[k, r] + cum[k + 1, r]
+    return sums
+
+
+class Rolling8:
+    """Class for the Pearson distributions of the sliding windows of a series
+
+    The series is first standardized as a whole, then the moments of every window
+    follow from :py:func:`rolling_power_sums`, in O(1) per window. Each window is fitted
+    on its own standardized moments, all in one :py:class:`Pearson8Batch`, and the
+    coefficients, roots and bounds are mapped back to the units of the series, see
+    :py:meth:`Pearson8.from_standard`. Row ``i`` of every column array belongs to the
+    window starting at ``i * step``.
+    """
+
+    window: int = None
+    """number of points per window"""
+    step: int = None
+    """distance between the starts of consecutive windows"""
+    loc: np.ndarray = None
+    """means of the windows, shape (N,)"""
+    sigma: np.ndarray = None
+    """standard deviations of the windows, NaN if below 1e-6 that of the series, shape (N,)"""
+    standard: Pearson8Batch = None
+    """fits of the standardized windows"""
+    coef: np.ndarray = None
+    """coefficients a, c0, c1, c2, c3, c4 in the units of the series, shape (N, 6)"""
+    type_no: np.ndarray = None
+    """root types 41, ..., 49, 0 if unclassified, shape (N,)"""
+    roots: np.ndarray = None
+    """roots of c0 + c1 x + ... + c4 x^4 in the units of the series, shape (N, 4)"""
+    lower_bound: np.ndarray = None
+    """lower bounds of the supports, NaN if not determined, shape (N,)"""
+    upper_bound: np.ndarray = None
+    """upper bounds of the supports, NaN if not determined, shape (N,)"""
+
+    def __init__(self, x, window, step=1, bounds=True):
+        """Initialize Rolling8 object
+
+        :param x: series, shape (n,).
+        :param int window: number of points per window, at least 9.
+        :param int step: distance between the starts of consecutive windows.
+        :param bool bounds: whether to determine the supports, see
+          :py:meth:`determine_bounds`.
+        """
+        if window < 9:
+            raise ValueError(f'window = {window} < 9, too few points for eight moments')
+        x = np.asarray(x, dtype=float).reshape(-1)
+        self.window, self.step = window, step
+        center, spread = x.mean(), x.std()
+        spread = spread if spread > 0 else 1.0
+        with instrument.stage('rolling_moments'):
+            mom = rolling_power_sums((x - center) / spread, window, 8, step) / window
+            loc, scale, std_mom = standardize_many(mom)
+            # windows of constant values, up to the rounding of the power sums, get NaN
+            # moments, hence NaN rows of type 0
+            flat = ~(scale > 1e-6)
+            scale[flat] = std_mom[flat] = np.nan
+        self.loc, self.sigma = center + spread * loc, spread * scale
+        self.standard = Pearson8Batch(std_mom)
+        self.type_no = self.standard.type_no
+        self.coef = np.stack(affine_coef(self.standard.coef.T, self.loc, self.sigma), axis=1)
+        self.roots = self.loc[:, None] + self.sigma[:, None] * self.standard.roots
+        if bounds:
+            self.determine_bounds()
+
+    def __len__(self):
+        return len(self.loc)
+
+    def determine_bounds(self, eps=1e-5, iter_max=10):
+        """Supports of all windows, determined once and then cached
+
+        See :py:meth:`Pearson8Batch.determine_bounds`, the bounds of the standardized
+        fits mapped back.
+
+        :param float eps: tolerance of the Newton step.
+        :param int iter_max: maximum number of Newton iterations.
+        :return: lower and upper bounds, each of shape (N,).
+        :rtype: tuple
+        """
+        if self.lower_bound is None:
+            lb, ub = self.standard.determine_bounds(eps, iter_max)
+            self.lower_bound = self.loc + self.sigma * lb
+            self.upper_bound = self.loc + self.sigma * ub
+        return self.lower_bound, self.upper_bound
+
+    @property
+    def status(self):
+        """:py:class:`~pearsondist.validate.FitStatus` of each window, shape (N,)"""
+        return self.standard.status
+
+    @property
+    def bound_status(self):
+        """:py:class:`~pearsondist.support8.BoundStatus` of the lower and upper bounds,
+        shape (N, 2)"""
+        return self.standard.bound_status
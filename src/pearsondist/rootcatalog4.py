@@ -94,3 +94,116 @@ class RootCatalog4:
                         # x1 != x2 != x3 != x4
                         self.ordered_z = rt
                         self.type_no = 49
+
+
+# ordered roots of all-real root sets, keyed on the pattern of equal neighbours
+# (rt[0] = rt[1], rt[1] = rt[2], rt[2] = rt[3]) of the sorted roots rt
+_REAL_CATALOG = {
+    (True, True, True): (45, [0, 1, 2, 3]),
+    (True, True, False): (46, [0, 1, 2, 3]),
+    (True, False, True): (47, [0, 1, 2, 3]),
+    (True, False, False): (48, [0, 1, 2, 3]),
+    (False, True, True): (46, [1, 2, 3, 0]),
+    (False, True, False): (48, [1, 2, 0, 3]),
+    (False, False, True): (48, [2, 3, 0, 1]),
+    (False, False, False): (49, [0, 1, 2, 3]),
+}
+
+
+def catalog_roots(z, eps=1e-10):
+    """Catalog many root sets at once, same results as :py:class:`RootCatalog4`
+
+    Root sets that :py:class:`RootCatalog4` cannot handle, i.e., with an odd number of
+    complex roots, get type 0 and NaN roots.
+
+    :param z: roots of the quartic polynomials, shape (N, 4).
+    :param float eps: tolerance to regard a root as real, or two real roots as equal.
+    :return: root types of shape (N,) and ordered roots of shape (N, 4).
+    :rtype: tuple
+    """
+    z = np.atleast_2d(np.asarray(z, dtype=complex))
+    type_no = np.zeros(len(z), dtype=np.int8)
+    ordered_z = np.full(z.shape, np.nan, dtype=complex)
+    indicator = np.abs(z.imag) < eps
+    n_real = np.count_nonzero(indicator, axis=1)
+
+    # two pairs of conjugates
+    i = np.flatnonzero(n_real == 0)
+    zi = z[i]
+    conj01 = _is_conj(zi[:, 0], zi[:, 1])
+    conj02 = _is_conj(zi[:, 0], zi[:, 2])
+    order = np.where(conj01[:, None], [0, 1, 2, 3],
+                     np.where(conj02[:, None], [0, 2, 1, 3], [0, 3, 1, 2]))
+    zi = np.take_along_axis(zi, order, axis=1)
+    equal = _is_equal(zi[:, 0], zi[:, 2]) | _is_equal(zi[:, 0], zi[:, 3])
+    type_no[i] = np.where(equal, 41, 42)
+    ordered_z[i] = zi
+
+    # one pair of conjugates: real roots first, each part in its original order
+    i = np.flatnonzero(n_real == 2)
+    order = np.argsort(~indicator[i], axis=1, kind='stable')
+    zi = np.take_along_axis(z[i], order, axis=1)
+    equal = np.abs(zi[:, 0].real - zi[:, 1].real) < eps
+    swap = ~equal & (zi[:, 0].real >= zi[:, 1].real)
+    zi[swap, :2] = zi[swap, 1::-1]
+    type_no[i] = np.where(equal, 43, 44)
+    ordered_z[i] = zi
+
+    # all real roots
+    i = np.flatnonzero(n_real == 4)
+    rt = np.sort(z[i].real, axis=1)
+    equal = np.abs(np.diff(rt, axis=1)) < eps
+    for pattern, (no, order) in _REAL_CATALOG.items():
+        j = np.all(equal == pattern, axis=1)
+        type_no[i[j]] = no
+        ordered_z[i[j]] = rt[j][:, order]
+    return type_no, ordered_z
+
+
+def _is_conj(z1, z2, tol=1e-10):
+    # element-wise is_conj
+    return (np.isclose(z1.real, z2.real, atol=tol) &
+            np.isclose(z1.imag, -z2.imag, atol=tol))
+
+
+def _is_equal(z1, z2, tol=1e-10):
+    # element-wise is_equal
+    return (np.isclose(z1.real, z2.real, atol=tol) &
+            np.isclose(z1.imag, z2.imag, atol=tol))
+
+
+def keeps_type(z, type_no, eps=1e-10):
+    """Whether roots ordered as for ``type_no`` still are of that type
+
+    For roots polished from those of a nearby fit, see
+    :py:func:`~pearsondist.quartic.polish_roots`, which keep their order, this is much
+    cheaper than cataloging them again. Only the types of distinct roots, 42, 44 and 49,
+    are checked, the others give False.
+
+    :param z: roots ordered as by :py:class:`RootCatalog4`, shape (4,).
+    :param int type_no: root type of the nearby fit.
+    :param float eps: tolerance to regard a root as real, or two roots as equal.
+    :return: True if of the same type
+    :rtype: bool
+    """
+    def close(x, y):
+        # np.isclose on scalars, as in is_equal, without its overhead
+        return abs(x - y) <= eps + 1e-5 * abs(y)
+
+    def conj(z1, z2):
+        return close(z1.real, z2.real) and close(z1.imag, -z2.imag)
+
+    def equal(z1, z2):
+        return close(z1.real, z2.real) and close(z1.imag, z2.imag)
+
+    z = [complex(x) for x in z]
+    real = [abs(x.imag) < eps for x in z]
+    if type_no == 42:
+        return (not any(real) and conj(z[0], z[1]) and conj(z[2], z[3])
+                and not equal(z[0], z[2]) and not equal(z[0], z[3]))
+    if type_no == 44:
+        return (real[0] and real[1] and not real[2] and conj(z[2], z[3])
+                and z[1].real - z[0].real >= eps)
+    if type_no == 49:
+        return all(real) and all(z[k + 1].real - z[k].real >= eps for k in range(3))
+    return False
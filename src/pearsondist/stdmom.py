@@ -4,6 +4,8 @@ Produce standardized moments from raw moments
 import math
 import warnings
 
+import numpy as np
+
 
 def stdmom(mom: list) -> tuple:
     m1, m2, m3, m4 = mom[0], mom[1], mom[2], mom[3]
@@ -20,3 +22,127 @@ def stdmom(mom: list) -> tuple:
         msg = f'kurtosis ({kurtosis:.7f}) < skewness ({skewness:.7f}) + 1'
         raise ValueError(msg)
     return m1, var, skewness, kurtosis
+
+
+def standardize(mom: list) -> tuple:
+    r"""Location, scale and raw moments of the standardized distribution
+
+    The moments of :math:`Y = (X - \mu)/\sigma` follow from the binomial expansion of
+    :math:`(X - \mu)^n`, the first two being 0 and 1.
+
+    :param list mom: the first eight or more raw moments of X.
+    :return: mean :math:`\mu`, standard deviation :math:`\sigma` and the raw moments of Y.
+    :rtype: tuple
+    """
+    m = [1.0] + [float(x) for x in mom]
+    var = m[2] - m[1] ** 2
+    if var <= 0:
+        raise ValueError(f'var = {var:.7f} <= 0')
+    loc, scale = m[1], math.sqrt(var)
+    std = [sum(math.comb(n, k) * m[k] * (-loc) ** (n - k) for k in range(n + 1)) / scale ** n
+           for n in range(1, len(m))]
+    std[0], std[1] = 0.0, 1.0
+    return loc, scale, std
+
+
+def destandardize(mom: list, loc: float, scale: float) -> list:
+    r"""Raw moments of :math:`X = \mu + \sigma Y`, the inverse of :py:func:`standardize`
+
+    :param list mom: raw moments of Y.
+    :param float loc: location :math:`\mu`.
+    :param float scale: scale :math:`\sigma`.
+    :return: raw moments of X
+    :rtype: list
+    """
+    m = [1.0] + [float(x) for x in mom]
+    return [sum(math.comb(n, k) * scale ** k * m[k] * loc ** (n - k) for k in range(n + 1))
+            for n in range(1, len(m))]
+
+
+def standardize_many(mom):
+    """:py:func:`standardize` of many moment vectors at once
+
+    Rows whose variance is not positive get NaN.
+
+    :param mom: raw moments, shape (N, K).
+    :return: means and standard deviations of shape (N,), and raw moments of the
+      standardized distributions of shape (N, K).
+    :rtype: tuple
+    """
+    mom = np.asarray(mom, dtype=float)
+    loc = mom[:, 0]
+    with np.errstate(invalid='ignore'):
+        var = mom[:, 1] - loc ** 2
+        scale = np.where(var > 0, np.sqrt(np.abs(var)), np.nan)
+    m = np.concatenate([np.ones((1, len(mom))), mom.T])  # mu_0, ..., mu_K by rows
+    shift = [np.ones(len(mom))]  # powers of -loc
+    for _ in range(mom.shape[1]):
+        shift.append(shift[-1] * -loc)
+    std = np.empty_like(mom)
+    for n in range(1, len(m)):
+        central = sum(math.comb(n, k) * m[k] * shift[n - k] for k in range(n + 1))
+        std[:, n - 1] = central / scale ** n
+    std[:, 0], std[:, 1] = 0.0, 1.0
+    std[np.isnan(scale)] = np.nan
+    return loc, scale, std
+
+
+def destandardize_many(mom, loc, scale):
+    """:py:func:`destandardize` of many moment vectors at once
+
+    :param mom: raw moments of the standardized distributions, shape (N, K).
+    :param loc: locations, shape (N,).
+    :param scale: scales, shape (N,).
+    :return: raw moments, shape (N, K).
+    :rtype: np.ndarray
+    """
+    mom = np.asarray(mom, dtype=float)
+    loc, scale = np.asarray(loc, dtype=float), np.asarray(scale, dtype=float)
+    m = [np.ones(len(mom))] + [mom[:, n] * scale ** (n + 1) for n in range(mom.shape[1])]
+    shift = [np.ones(len(mom))]  # powers of loc
+    for _ in range(mom.shape[1]):
+        shift.append(shift[-1] * loc)
+    raw = np.empty_like(mom)
+    for n in range(1, len(m)):
+        raw[:, n - 1] = sum(math.comb(n, k) * m[k] * shift[n - k] for k in range(n + 1))
+    return raw
+
+
+def stdmom_many(mom):
+    """:py:func:`stdmom` of many moment vectors at once, NaN instead of raising
+
+    :param mom: raw moments, shape (N, 4) or more columns.
+    :return: means, variances, skewness and kurtosis, each of shape (N,), the last
+      two NaN where the variance is not positive.
+    :rtype: tuple
+    """
+    mom = np.asarray(mom, dtype=float)
+    m1, m2, m3, m4 = (mom[:, i] for i in range(4))
+    var = m2 - m1 ** 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.where(var > 0, np.sqrt(np.abs(var)), np.nan)
+        skewness = (m3 - 3 * m1 * m2 + 2 * m1 ** 3) / std ** 3
+        kurtosis = (m4 - 4 * m1 * m3 + 6 * m1 ** 2 * m2 - 3 * m1 ** 4) / std ** 4
+    return m1, var, skewness, kurtosis
+
+
+def affine_coef(coef, loc, scale):
+    r"""Coefficients of :math:`X = \mu + \sigma Y`, given those of Y
+
+    With :math:`y = (x - \mu)/\sigma`, the equation of Y turns into
+    :math:`a_X = \sigma a_Y - \mu` and :math:`Q_X(x) = \sigma^2 Q_Y(y)`, such that the
+    un-normalized densities agree, :math:`p_X(x) = p_Y(y)`.
+
+    :param list coef: coefficients a, c0, c1, c2, c3, c4 of Y, or six columns of as many
+      fits as ``loc`` and ``scale`` hold.
+    :param float loc: location :math:`\mu`.
+    :param float scale: scale :math:`\sigma`.
+    :return: coefficients a, c0, c1, c2, c3, c4 of X
+    :rtype: list
+    """
+    c = [0.0] * 5
+    for k in range(5):
+        ck = coef[k + 1] * scale ** (2 - k)
+        for j in range(k + 1):
+            c[j] += ck * math.comb(k, j) * (-loc) ** (k - j)
+    return [scale * coef[0] - loc] + c
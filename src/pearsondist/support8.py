@@ -1,8 +1,182 @@
+import enum
+import logging
 import math
 
 import numpy as np
 import warnings
-from pearsondist.pdf import Pdf
+from pearsondist import instrument
+from pearsondist.adjust_lb_ub import real_roots
+from pearsondist.pdf import Pdf, arg_max_min_dpdf_many, ddpdf_coef, is_max_many
+
+logger = logging.getLogger(__name__)
+
+
+class BoundStatus(enum.IntEnum):
+    """How a bound of the support was determined"""
+    CONVERGED = 0
+    """Newton steps fell below the tolerance"""
+    ROOT = 1
+    """next to a real root of the denominator, -a being the argmin or type 49"""
+    CLIPPED = 2
+    """Newton left a bracket holding no zero, and stopped at the end of the bracket"""
+    MAX_ITER = 3
+    """the maximum number of iterations was reached"""
+    FAILED = 4
+    """not determined, the bound is NaN"""
+
+
+def newton_bisect(ratio, x0, lb, ub, fun=None, eps=1e-5, iter_max=10):
+    """Safeguarded Newton iterations for many equations at once
+
+    Entries whose ``fun`` changes sign over the bracket [lb, ub] hold a zero: the
+    bracket is shrunk at every step, and a Newton step leaving it is replaced by
+    bisection. The other entries stop at the end of the bracket as soon as Newton
+    leaves it. Entries leave the loop once their step is below ``eps``.
+
+    :param ratio: Newton step, ``ratio(x, k)`` returns f(x)/f'(x) for the entries ``k``.
+    :param x0: initial values, shape (N,).
+    :param lb: lower ends of the brackets, shape (N,).
+    :param ub: upper ends of the brackets, shape (N,).
+    :param fun: ``fun(x, k)`` of the same sign as f, used to detect a bracketed zero,
+      no bisection if None.
+    :param float eps: tolerance of the Newton step.
+    :param int iter_max: maximum number of iterations.
+    :return: solutions, statuses (:py:class:`BoundStatus`) and numbers of iterations,
+      each of shape (N,).
+    :rtype: tuple
+    """
+    x = np.array(x0, dtype=float)
+    lb, ub = np.asarray(lb, dtype=float), np.asarray(ub, dtype=float)
+    status = np.full(len(x), BoundStatus.MAX_ITER, dtype=np.int8)
+    n_iter = np.zeros(len(x), dtype=int)
+    k = np.arange(len(x))
+    lo, hi = lb.copy(), ub.copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if fun is None:
+            bracketed = np.zeros(len(x), dtype=bool)
+        else:
+            sign_lo = np.sign(fun(lb, k))
+            bracketed = sign_lo * np.sign(fun(ub, k)) < 0
+        for _ in range(iter_max):
+            if not len(k):
+                break
+            xk = x[k]
+            x_new = xk - ratio(xk, k)
+            n_iter[k] += 1
+            inside = (x_new >= lo[k]) & (x_new <= hi[k])
+            b = bracketed[k]
+            if b.any():
+                same = np.sign(fun(xk[b], k[b])) == sign_lo[k[b]]
+                lo[k[b]] = np.where(same, xk[b], lo[k[b]])
+                hi[k[b]] = np.where(same, hi[k[b]], xk[b])
+                inside[b] = (x_new[b] >= lo[k[b]]) & (x_new[b] <= hi[k[b]])
+                x_new[b & ~inside] = (lo[k[b & ~inside]] + hi[k[b & ~inside]]) / 2
+            converged = np.abs(x_new - xk) < eps
+            clipped = ~b & ~converged & ~inside
+            failed = np.isnan(x_new)
+            x_new = np.where(clipped & (x_new > hi[k]), hi[k], x_new)
+            x_new = np.where(clipped & (x_new < lo[k]), lo[k], x_new)
+            x[k] = x_new
+            status[k[converged]] = BoundStatus.CONVERGED
+            status[k[clipped]] = BoundStatus.CLIPPED
+            status[k[failed]] = BoundStatus.FAILED
+            k = k[~(converged | clipped | failed)]
+    if instrument.enabled():
+        instrument.count('newton_iterations', n_iter.sum())
+        for s, n in zip(*np.unique(status, return_counts=True)):
+            instrument.count(f'newton_{BoundStatus(s).name.lower()}', n)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('newton_bisect: %d entries, %d bracketed, %d iterations at most, %s',
+                     len(x), np.count_nonzero(bracketed), n_iter.max(initial=0),
+                     {s.name: int(np.count_nonzero(status == s)) for s in BoundStatus})
+    return x, status, n_iter
+
+
+def u_bounds_many(roots, margin=1e-7):
+    """The real roots nearest to 0, below and above, of many fits at once
+
+    :param roots: real roots of each fit, NaN for the missing or complex ones, shape (N, k).
+    :param float margin: distance kept from the roots.
+    :return: lower and upper bounds, infinite where there is no root on that side,
+      each of shape (N,).
+    :rtype: tuple
+    """
+    roots = np.asarray(roots, dtype=float)
+    below = np.where(roots < 0, roots, -np.inf).max(axis=1, initial=-np.inf)
+    above = np.where(roots > 0, roots, np.inf).min(axis=1, initial=np.inf)
+    return below + margin, above - margin
+
+
+def support_bounds(coef, type_no, roots, is_max=None, eps=1e-5, iter_max=10):
+    """Support of many Pearson distributions at once
+
+    Where -a is the argmin of the PDF, or for type 49, the support lies between the
+    real roots nearest to 0 of c0 + c1 x + ... + c4 x^4. Otherwise both bounds are
+    zeros of the PDF searched by :py:func:`newton_bisect`, from the argmax and argmin
+    of its derivative, as :py:class:`Support8` does for one distribution.
+
+    :param coef: coefficients a, c0, c1, c2, c3, c4, shape (N, 6).
+    :param type_no: root types 41, ..., 49, shape (N,).
+    :param roots: real roots of each fit, NaN for the missing or complex ones, shape (N, k).
+    :param is_max: whether -a is the argmax, see :py:func:`~pearsondist.pdf.is_max_many`,
+      computed if None, shape (N,).
+    :param float eps: tolerance of the Newton step.
+    :param int iter_max: maximum number of Newton iterations.
+    :return: lower bounds, upper bounds, each of shape (N,), and statuses
+      (:py:class:`BoundStatus`) of shape (N, 2).
+    :rtype: tuple
+    """
+    coef = np.asarray(coef, dtype=float)
+    type_no = np.asarray(type_no)
+    roots = np.asarray(roots, dtype=float)
+    if is_max is None:
+        is_max = is_max_many(coef)
+    is_max = np.asarray(is_max)
+    n = len(coef)
+    lb, ub = np.full(n, np.nan), np.full(n, np.nan)
+    status = np.full((n, 2), BoundStatus.FAILED, dtype=np.int8)
+    # -a is the argmin, or type 49: between the real roots around 0
+    i = np.flatnonzero((is_max != 1) | (type_no == 49))
+    lb[i], ub[i] = u_bounds_many(roots[i])
+    status[i] = BoundStatus.ROOT
+    no_root = np.isinf(lb[i]) & np.isinf(ub[i])  # types 41 and 42
+    zero_root = np.any(roots[i] == 0, axis=1)
+    lb[i[no_root | zero_root]] = ub[i[no_root | zero_root]] = np.nan
+    status[i[no_root | zero_root]] = BoundStatus.FAILED
+    # -a is the argmax: zeros of the PDF beyond the extrema of its derivative
+    i = np.flatnonzero((is_max == 1) & (type_no != 49))
+    a = coef[i, 0]
+    argmax_dpdf, argmin_dpdf = arg_max_min_dpdf_many(coef[i])
+    distance1 = -a - argmax_dpdf
+    distance2 = argmin_dpdf + a
+    x0 = np.concatenate([argmax_dpdf - distance1, argmin_dpdf + distance2])
+    lo = np.concatenate([argmax_dpdf - 11 * distance1, argmin_dpdf])
+    hi = np.concatenate([argmax_dpdf, argmin_dpdf + 11 * distance2])
+    c = np.concatenate([coef[i], coef[i]])
+
+    def den(x, k):
+        return (((c[k, 5] * x + c[k, 4]) * x + c[k, 3]) * x + c[k, 2]) * x + c[k, 1]
+
+    def pdf_over_dpdf(x, k):
+        return -den(x, k) / (c[k, 0] + x)
+
+    x, s, _ = newton_bisect(pdf_over_dpdf, x0, lo, hi, den, eps, iter_max)
+    s[np.isnan(x0)] = BoundStatus.FAILED
+    x[np.isnan(x0)] = np.nan
+    lb[i], ub[i] = x[:len(i)], x[len(i):]
+    status[i, 0], status[i, 1] = s[:len(i)], s[len(i):]
+    # 0 must be inside the support
+    invalid = ~((lb < 0) & (ub > 0))
+    lb[invalid] = ub[invalid] = np.nan
+    status[invalid] = BoundStatus.FAILED
+    if instrument.enabled():
+        for s, n in zip(*np.unique(status, return_counts=True)):
+            instrument.count(f'bound_{BoundStatus(s).name.lower()}', n)
+    if logger.isEnabledFor(logging.DEBUG) and invalid.any():
+        logger.debug('support_bounds: no support found for %d of %d entries',
+                     np.count_nonzero(invalid), n)
+    return lb, ub, status
+
 
 class Support8:
     """Class for determining the support of the Pearson distribution"""
@@ -11,211 +185,185 @@ class Support8:
     """The lower bound of the support of the distribution"""
     upper_bound: float = None
     """The upper bound of the support of the distribution"""
+    status: tuple = None
+    """(:py:class:`BoundStatus` of the lower bound, that of the upper bound)"""
 
     coef: list = None
     """coefficients: a, c0, c1, c2, c3, c4"""
     pdf_obj: Pdf = None
     """Un-normalized PDF of the Pearson distribution"""
-    def __init__(self, pdf_obj):
+    argmax_dpdf: float = None
+    """argmax of dpdf, below -a, where the search of the lower bound starts from"""
+    argmin_dpdf: float = None
+    """argmin of dpdf, above -a, where the search of the upper bound starts from"""
+
+    def __init__(self, pdf_obj, warm=None):
+        """Initialize Support8 object
+
+        :param Pdf pdf_obj: un-normalized PDF.
+        :param Support8 warm: support of a nearby fit to start from, see
+          :py:meth:`warm_extrema`.
+        """
         self.pdf_obj = pdf_obj
         self.coef = pdf_obj.coef
-        self.lower_bound, self.upper_bound = self.determine_bounds()
-
-    def determine_bounds(self):
-        # special case: isMin
-        if not self.pdf_obj.is_max:
-            return self.u_bounds()
-        # special case: isMax and type 49
-        if self.pdf_obj.pfd['type'] == 49:
-            return self.distinct4roots_bounds()
+        self.lower_bound, self.upper_bound = self.determine_bounds(warm)
+        if instrument.enabled():
+            for status in self.status:
+                instrument.count(f'bound_{status.name.lower()}')
+
+    def determine_bounds(self, warm=None):
+        """Support of the distribution, the same rules as :py:func:`support_bounds`
+
+        Solved on Python floats, much cheaper than the batched path for one fit.
+
+        :param Support8 warm: support of a nearby fit, whose extrema of dpdf seed
+          those of this one, see :py:meth:`warm_extrema`.
+        :return: (lower bound, upper bound)
+        :rtype: tuple
+        """
+        # special case: isMin, or isMax and type 49
+        if not self.pdf_obj.is_max or self.pdf_obj.pfd['type'] == 49:
+            self.status = (BoundStatus.ROOT, BoundStatus.ROOT)
+            return self.root_bounds()
         # typical cases: isMax and not type 49
         a = self.coef[0] # -a argmax_pdf
-        argmax_dpdf, argmin_dpdf = self.pdf_obj.arg_max_min_dpdf()
+        extrema = None if warm is None else self.warm_extrema(warm)
+        if extrema is None:
+            extrema = self.pdf_obj.arg_max_min_dpdf()
+        argmax_dpdf, argmin_dpdf = self.argmax_dpdf, self.argmin_dpdf = extrema
+        if argmax_dpdf is None or argmin_dpdf is None:
+            raise NotImplementedError('no extrema of dpdf around -a to search the support from')
         # determine lower bound
         distance1 = -a - argmax_dpdf
         x0_left = argmax_dpdf - distance1
         lb = x0_left - 10 * distance1; ub = argmax_dpdf
-        lower_bound = self.newton(x0_left, lb, ub)
+        lower_bound, status1, _ = self.newton_bisect(self.pdf_obj.pdf_over_dpdf, x0_left, lb, ub,
+                                                     self.den)
         # determine upper bound
         distance2 = argmin_dpdf - (-a)
         x0_right = argmin_dpdf + distance2
         lb = argmin_dpdf; ub = x0_right + 10 * distance2
-        upper_bound = self.newton(x0_right, lb, ub)
+        upper_bound, status2, _ = self.newton_bisect(self.pdf_obj.pdf_over_dpdf, x0_right, lb, ub,
+                                                     self.den)
+        self.status = (status1, status2)
         return lower_bound, upper_bound
 
-    def newton(self, x0, lb, ub, eps=1e-5, iter_max=10):
-        """solve pdf = 0"""
-        iteration = 0
-        msg = f'iteration: {iteration}, x0 = {x0:>12.7f}'
-        while iteration < iter_max:
-            x = x0 - self.pdf_obj.pdf_over_dpdf(x0)
-            if abs(x - x0) < eps: break
-            x0 = x
-            iteration += 1
-            if x0 > ub:
-                x0 = ub; break
-            elif x0 < lb:
-                x0 = lb; break
-            msg += f'\niteration: {iteration}, x0 = {x0:>12.7f}'
-        print(msg)
-        return x0
+    def warm_extrema(self, previous):
+        """Extrema of dpdf by Newton from those of a nearby fit, None if that fails
 
-    def newton2(self, x0, lb, ub, eps=1e-5, iter_max=10):
-        """solve dpdf = 0"""
+        The nearest roots of :math:`P(x)`, see :py:meth:`Pdf.ddpdf_roots`, on each side
+        of -a are searched from ``previous.argmax_dpdf`` and ``previous.argmin_dpdf``,
+        bracketed by -a and the previous bounds. Unless both brackets hold a sign change
+        and both searches converge, None hands over to the roots of :math:`P(x)`.
+
+        :param Support8 previous: support of a nearby fit.
+        :return: argmax and argmin of dpdf, or None
+        :rtype: tuple
+        """
+        if previous.argmax_dpdf is None or previous.argmin_dpdf is None:
+            return None
+        a = self.coef[0]
+        lb, ub = previous.lower_bound, previous.upper_bound
+        if not lb < -a < ub:
+            return None
+        fun = self.pdf_obj.ddpdf_num
+        p4, p3, p2, p1, _ = (float(c) for c in ddpdf_coef(self.coef))
+
+        def ratio(x):
+            return fun(x) / (((4 * p4 * x + 3 * p3) * x + 2 * p2) * x + p1)
+
+        eps = 1e-10 * (ub - lb)
+        extrema = []
+        for x0, lo, hi in ((previous.argmax_dpdf, lb, -a), (previous.argmin_dpdf, -a, ub)):
+            if not (lo < x0 < hi and fun(lo) * fun(hi) < 0):
+                return None
+            x, status, _ = self.newton_bisect(ratio, x0, lo, hi, fun, eps)
+            if status != BoundStatus.CONVERGED:
+                return None
+            extrema.append(x)
+        return tuple(extrema)
+
+    def den(self, x):
+        """c0 + c1 x + ... + c4 x^4, whose roots are the zeros of the PDF"""
+        return self.pdf_obj.quartic(x)
+
+    def newton_bisect(self, ratio, x0, lb, ub, fun=None, eps=1e-5, iter_max=10):
+        """:py:func:`newton_bisect` on a single float
+
+        ``fun`` is the function whose sign change brackets the solution, e.g.,
+        :py:meth:`den` for ``pdf_over_dpdf``, or None for an unbracketed Newton search.
+
+        :return: solution, :py:class:`BoundStatus` and number of iterations.
+        :rtype: tuple
+        """
+        x0, lo, hi = float(x0), float(lb), float(ub)
+        sign_lo = 0.0 if fun is None else math.copysign(1.0, fun(lo))
+        bracketed = fun is not None and sign_lo * fun(hi) < 0
+        status = BoundStatus.MAX_ITER
         iteration = 0
-        msg = f'iteration: {iteration}, x0 = {x0:>12.7f}'
         while iteration < iter_max:
-            x = x0 - self.pdf_obj.dpdf_over_ddpdf(x0)
-            if abs(x - x0) < eps: break
-            x0 = x
+            try:
+                x = x0 - float(ratio(x0))
+            except ZeroDivisionError:
+                x = math.inf
             iteration += 1
-            if x0 > ub:
-                x0 = ub
+            if bracketed:
+                if math.copysign(1.0, fun(x0)) == sign_lo:
+                    lo = x0
+                else:
+                    hi = x0
+                if not lo <= x <= hi:
+                    x = (lo + hi) / 2
+            if math.isnan(x):
+                x0, status = x, BoundStatus.FAILED
+                break
+            if abs(x - x0) < eps:
+                x0, status = x, BoundStatus.CONVERGED
                 break
-            elif x0 < lb:
-                x0 = lb
+            if not lo <= x <= hi:
+                x0, status = min(max(x, lo), hi), BoundStatus.CLIPPED
                 break
-            msg += f'\niteration: {iteration}, x0 = {x0:>12.7f}'
-        print(msg)
-        return x0
+            x0 = x
+        if instrument.enabled():
+            instrument.count('newton_iterations', iteration)
+            instrument.count(f'newton_{status.name.lower()}')
+        logger.debug('newton_bisect: x = %r after %d iterations, %s', x0, iteration, status.name)
+        return x0, status, iteration
 
-    def u_bounds(self):
-        """Cases where -a is argmin of the PDF
+    def newton(self, x0, lb, ub, eps=1e-5, iter_max=10):
+        """solve pdf = 0, see :py:meth:`newton_bisect`"""
+        return self.newton_bisect(self.pdf_obj.pdf_over_dpdf, x0, lb, ub, self.den, eps,
+                                  iter_max)[0]
 
-        the support must include 0, and should also include -a
-        """
-        if self.pdf_obj.is_max:
-            raise NotImplementedError('-a is argmax, it should not be U-type.')
+    def newton2(self, x0, lb, ub, eps=1e-5, iter_max=10):
+        """solve dpdf = 0, see :py:meth:`newton_bisect`"""
+        return self.newton_bisect(self.pdf_obj.dpdf_over_ddpdf, x0, lb, ub, None, eps,
+                                  iter_max)[0]
+
+    def root_bounds(self):
+        """Between the real roots nearest to 0, see :py:func:`u_bounds_many`"""
         pfd = self.pdf_obj.pfd
-        type = pfd['type']
-        a = self.coef[0]
-        if type in [41, 42]:
+        x = real_roots(pfd)
+        if len(x) == 0:
             # 41: all complex: (x1, x2) = (x3, x4)
             # 42: all complex: (x1, x2) != (x3, x4)
             raise NotImplementedError('not implemented for type 41 and 42')
-        elif type in [43, 45]:
-            # 43: 2 real, 2 complex: x1 = x2, (x3, x4)
-            # 45: 4 real: x1 = x2 = x3 = x4
-            lb, ub = self.distinct1root_bounds()
-        elif type in [44, 46, 47]:
-            # 44: 2 real, 2 complex: x1 != x2, (x3, x4)
-            # 46: 4 real: x1 = x2 = x3 != x4
-            # 47: 4 real: x1 = x2 != x3 = x4
-            lb, ub = self.distinct2roots_bounds()
-        elif type == 48:
-            # 48: 4 real: x1 = x2 != x3 != x4
-            lb, ub = self.distinct3roots_bounds()
-        elif type == 49:
-            # 4 real: x1 != x2 != x3 != x4
-            lb, ub = self.distinct4roots_bounds()
-        else:
-            raise ValueError(f"unknown root type: {type}")
-        return lb, ub
-
-    def distinct1root_bounds(self):
-        # 43: 2 real, 2 complex: x1 = x2, (x3, x4)
-        # 45: 4 real: x1 = x2 = x3 = x4
-        pfd = self.pdf_obj.pfd
-        x1 = pfd['x1']
-        if 0 == x1:
-            raise NotImplementedError('type 43|45 one root = 0, which should never happen')
-        if x1 < 0:
-            lb = x1 + 1e-7
-            ub = math.inf
-        else:
-            lb = -math.inf
-            ub = x1 - 1e-7
-        self.effective_check(lb, ub)
-        return lb, ub
-
-    def distinct2roots_bounds(self):
-        # 44: 2 real, 2 complex: x1 != x2, (x3, x4)
-        # 46: 4 real: x1 = x2 = x3 != x4
-        # 47: 4 real: x1 = x2 != x3 = x4
-        pfd = self.pdf_obj.pfd
-        if type == 44:
-            x1 = pfd['x1']
-            x2 = pfd['x2']
-        elif type == 46:
-            x1 = pfd['x1']
-            x2 = pfd['x4']
-            if x1 > x2: x1, x2 = x2, x1
-        else:
-            x1 = pfd['x1']
-            x2 = pfd['x3']
-            if x1 > x2: x1, x2 = x2, x1
-        if 0 in [x1, x2]:
-            raise NotImplementedError('type 44|46|47 one root = 0, which should never happen')
-        # x1 < x2
-        if 0 < x1:
-            lb = -math.inf
-            ub = x1 - 1e-7
-        elif x2 < 0:
-            lb = x2 + 1e-7
-            ub = math.inf
-        else:
-            # x1 < 0 < x2
-            lb = x1 + 1e-7
-            ub = x2 - 1e-7
-        self.effective_check(lb, ub)
-        return lb, ub
-
-    def distinct3roots_bounds(self):
-        pfd = self.pdf_obj.pfd
-        # 48: 4 real: x1 = x2 != x3 != x4
-        x1 = pfd['x1']
-        x2 = pfd['x3']
-        x3 = pfd['x4']
-        x = sorted([x1, x2, x3])
         if 0 in x:
-            raise NotImplementedError('type 48 one root = 0, which should never happen')
-        if 0 < x[0]:
-            lb = -math.inf
-            ub = x[0] - 1e-7
-        elif x[2] < 0:
-            lb = x[2] + 1e-7
-            ub = math.inf
-        else:
-            # x1 < 0 < x3
-            if 0 < x[1]:
-                lb = x[0] + 1e-7
-                ub = x[1] - 1e-7
-            else:
-                lb = x[1] + 1e-7
-                ub = x[2] - 1e-7
+            raise NotImplementedError(f"type {pfd['type']} one root = 0, which should never happen")
+        below, above = x[x < 0], x[x > 0]
+        lb = float(below.max()) + 1e-7 if len(below) else -math.inf
+        ub = float(above.min()) - 1e-7 if len(above) else math.inf
         self.effective_check(lb, ub)
         return lb, ub
 
-    def distinct4roots_bounds(self):
-        # 49: 4 real: x1 != x2 != x3 != x4
-        pfd = self.pdf_obj.pfd
-        x1 = pfd['x1']
-        x2 = pfd['x2']
-        x3 = pfd['x3']
-        x4 = pfd['x4']
-        x = sorted([x1, x2, x3, x4])
-        if 0 in x:
-            raise NotImplementedError('type 49 one root = 0, which should never happen')
-        x1, x2, x3, x4 = x[0], x[1], x[2], x[3]
-        if 0 < x1:
-            lb = -math.inf
-            ub = x1 - 1e-7
-        elif x4 < 0:
-            lb = x4 + 1e-7
-            ub = math.inf
-        else:
-            # x1 < 0 < x4
-            if 0 < x2:
-                lb = x1 + 1e-7
-                ub = x2 - 1e-7
-            elif 0 < x3:
-                lb = x2 + 1e-7
-                ub = x3 - 1e-7
-            else:
-                lb = x3 + 1e-7
-                ub = x4 - 1e-7
-        self.effective_check(lb, ub)
-        return lb, ub
+    def u_bounds(self):
+        """Cases where -a is argmin of the PDF
+
+        the support must include 0, and should also include -a
+        """
+        if self.pdf_obj.is_max:
+            raise NotImplementedError('-a is argmax, it should not be U-type.')
+        return self.root_bounds()
 
     def effective_check(self, lb, ub):
         a = self.coef[0]
@@ -224,4 +372,4 @@ class Support8:
         if -a > ub:
             warnings.warn(f'-a (={-a}) > ub ({ub})')
         if 0 < lb or 0 > ub:
-            raise Exception(f'(lb, ub) = ({lb}, {ub}) is not valid, 0 is not included.')
\ No newline at end of file
+            raise ValueError(f'(lb, ub) = ({lb}, {ub}) is not valid, 0 is not included.')
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Screen many moment vectors before fitting, with a status per row instead of raising.
+"""
+import enum
+
+import numpy as np
+
+from pearsondist.stdmom import standardize_many, stdmom_many
+
+
+class FitStatus(enum.IntEnum):
+    """Outcome of the fit of one moment vector, the first check failed"""
+    OK = 0
+    """fitted"""
+    NONFINITE = 1
+    """some moment is NaN or infinite"""
+    VARIANCE = 2
+    """the variance is not positive"""
+    KURTOSIS = 3
+    """the kurtosis is below the bound, skewness squared plus 1"""
+    HANKEL = 4
+    """the Hankel matrix of the moments is not positive semi-definite, so they are not
+    the moments of any distribution"""
+    SINGULAR = 5
+    """the linear system from moments to coefficients is singular"""
+    UNCLASSIFIED = 6
+    """the roots of the fit have no root type"""
+
+
+def hankel_min_eig(mom):
+    r"""Smallest eigenvalue of the Hankel matrix :math:`(\mu_{i+j})_{i,j=0}^4` of the
+    standardized moments, relative to the largest
+
+    Moments of a distribution have a positive semi-definite Hankel matrix, so a
+    negative value rules the moment vector out.
+
+    :param mom: the first eight raw moments, shape (N, 8).
+    :return: ratio of the eigenvalues, NaN where the variance is not positive, shape (N,).
+    :rtype: np.ndarray
+    """
+    _, _, std = standardize_many(np.asarray(mom, dtype=float)[:, :8])
+    m = np.concatenate([np.ones((len(std), 1)), std], axis=1)
+    hankel = m[:, np.add.outer(np.arange(5), np.arange(5))]
+    ok = np.isfinite(hankel).all(axis=(1, 2))
+    ratio = np.full(len(std), np.nan)
+    eig = np.linalg.eigvalsh(hankel[ok])
+    ratio[ok] = eig[:, 0] / eig[:, -1]
+    return ratio
+
+
+def screen(mom, tol=1e-12):
+    """Status of each moment vector before fitting, vectorized
+
+    Checks in order: finite moments, positive variance, the kurtosis bound of
+    :py:func:`~pearsondist.stdmom.stdmom`, and the Hankel matrix, see
+    :py:func:`hankel_min_eig`.
+
+    :param mom: the first eight raw moments, shape (N, 8).
+    :param float tol: negative relative eigenvalue tolerated, for rounding errors.
+    :return: :py:class:`FitStatus` of each row, OK if all checks pass, shape (N,).
+    :rtype: np.ndarray
+    """
+    mom = np.asarray(mom, dtype=float)[:, :8]
+    status = np.full(len(mom), FitStatus.OK, dtype=np.int8)
+    with np.errstate(invalid='ignore', over='ignore'):
+        _, var, skewness, kurtosis = stdmom_many(mom)
+        checks = ((FitStatus.NONFINITE, ~np.isfinite(mom).all(axis=1)),
+                  (FitStatus.VARIANCE, ~(var > 0)),
+                  (FitStatus.KURTOSIS, kurtosis < skewness ** 2 + 1),
+                  (FitStatus.HANKEL, hankel_min_eig(mom) < -tol))
+    for code, failed in checks:
+        status[failed & (status == FitStatus.OK)] = code
+    return status
@@ -0,0 +1,67 @@
+"""
+Moment vectors and roots shared by the tests.
+
+The moment vectors are centered sample moments, fitted by root types 42, 44 and 49,
+and the moments of the README example; the roots are of every type 41, ..., 49.
+"""
+import numpy as np
+import pytest
+
+SAMPLERS = {
+    'normal': lambda rng, n: rng.normal(size=n),
+    'lognormal': lambda rng, n: rng.lognormal(0, 0.25, size=n),
+    'gamma': lambda rng, n: rng.gamma(4, size=n),
+    'student': lambda rng, n: rng.standard_t(12, size=n),
+    'logistic': lambda rng, n: rng.logistic(size=n),
+    'beta': lambda rng, n: rng.beta(0.7, 0.8, size=n),
+    'bimodal': lambda rng, n: rng.normal(rng.choice([-1, 1], size=n), 0.6),
+}
+README = [0.0679246, 0.0200644, 0.0011987, 0.0013033, -0.0002338, 0.0002833, -0.0001786,
+          0.0001697]
+
+
+def sample_moments(x):
+    """The first eight raw moments of a sample, centered"""
+    x = x - x.mean()
+    return [float(np.mean(x ** k)) for k in range(1, 9)]
+
+
+def roots_of_type(type_no, rng):
+    """Roots of the given type, real ones on both sides of 0"""
+    def pair():
+        w = complex(rng.uniform(-3, 3), rng.uniform(1, 3))
+        return [w, w.conjugate()]
+
+    x1, x2 = -rng.uniform(1, 3), rng.uniform(1, 3)
+    z = {41: lambda: pair() * 2,
+         42: lambda: pair() + pair(),
+         43: lambda: [x1, x1] + pair(),
+         44: lambda: [x1, x2] + pair(),
+         45: lambda: [x1] * 4,
+         46: lambda: [x1, x1, x1, x2],
+         47: lambda: [x1, x1, x2, x2],
+         48: lambda: [x1, x1, x2, x2 + 1],
+         49: lambda: [x1 - 1, x1, x2, x2 + 1]}[type_no]()
+    return np.array(z, dtype=complex)
+
+
+@pytest.fixture(scope='session')
+def moments():
+    """Moment vectors keyed by name"""
+    rng = np.random.default_rng(2)
+    out = {name: sample_moments(sampler(rng, 10 ** 5)) for name, sampler in SAMPLERS.items()}
+    out['readme'] = README
+    return out
+
+
+@pytest.fixture(scope='session')
+def moment_matrix(moments):
+    """The moment vectors stacked, shape (N, 8)"""
+    return np.array(list(moments.values()))
+
+
+@pytest.fixture(scope='session')
+def roots():
+    """Roots of every type, several of each, keyed by type"""
+    rng = np.random.default_rng(41)
+    return {t: [roots_of_type(t, rng) for _ in range(5)] for t in range(41, 50)}
@@ -0,0 +1,55 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from pearsondist import MomentAccumulator, Pearson8
+
+
+@pytest.fixture(scope='module')
+def data():
+    return np.random.default_rng(17).gamma(3, size=30000) + 100.0
+
+
+def central(x, order=8):
+    d = x - x.mean()
+    return [0.0] + [float(np.mean(d ** p)) for p in range(2, order + 1)]
+
+
+def test_chunks(data):
+    acc = MomentAccumulator()
+    for chunk in np.array_split(data, 7):
+        acc.update(chunk)
+    assert acc.n == len(data)
+    np.testing.assert_allclose(acc.mean, data.mean(), rtol=1e-14)
+    np.testing.assert_allclose(acc.central(), central(data), rtol=1e-10, atol=1e-12)
+
+
+def test_merge(data):
+    parts = [MomentAccumulator().update(x) for x in np.array_split(data, [5, 1000, 20000])]
+    forward = parts[0] + parts[1] + parts[2] + parts[3]
+    backward = MomentAccumulator()
+    for part in reversed(parts):
+        backward.merge(part)
+    np.testing.assert_allclose(forward.central(), backward.central(), rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(forward.central(), central(data), rtol=1e-10, atol=1e-12)
+    assert parts[0].n == 5  # left unchanged by +
+    with pytest.raises(ValueError):
+        forward.merge(MomentAccumulator(4))
+
+
+def test_raw_and_standardized(data):
+    x = data[:2000] - 100.0
+    acc = MomentAccumulator().consume(iter(x), chunk_size=300)
+    np.testing.assert_allclose(acc.raw(), [np.mean(x ** p) for p in range(1, 9)], rtol=1e-9)
+    z = (x - x.mean()) / x.std()
+    np.testing.assert_allclose(acc.standardized(), [np.mean(z ** p) for p in range(1, 9)],
+                               rtol=1e-10, atol=1e-12)
+
+
+def test_pickle_and_fit(data):
+    acc = pickle.loads(pickle.dumps(MomentAccumulator().update(data - 100.0)))
+    fit = acc.fit()
+    np.testing.assert_allclose(fit.coef, Pearson8(acc.raw()).coef, rtol=1e-6, atol=1e-10)
+    with pytest.raises(ValueError):
+        MomentAccumulator().central()
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8
+from pearsondist.stdmom import destandardize
+
+SHIFTS = [(0.0, 1.0), (2.0, 0.5), (-1.0, 3.0)]
+
+
+@pytest.fixture(scope='module')
+def pairs(moments):
+    """Canonical fits of X = loc + sigma * Y, with the direct fits of Y"""
+    out = []
+    for name in ('normal', 'gamma', 'beta', 'readme'):
+        direct = Pearson8(moments[name])
+        for loc, sigma in SHIFTS:
+            fit = Pearson8.canonical(destandardize(moments[name], loc, sigma))
+            out.append((fit, direct, loc, sigma))
+    return out
+
+
+# the direct fits solve systems less well scaled than those of the standardized
+# moments, e.g., the README moments have variance 0.02, hence the loose tolerances
+def test_coefficients(pairs):
+    for fit, direct, loc, sigma in pairs:
+        assert fit.type_no == direct.type_no
+        np.testing.assert_allclose(fit.roots, loc + sigma * direct.roots, rtol=1e-4)
+        np.testing.assert_allclose(fit.mom, destandardize(direct.mom, loc, sigma), rtol=1e-9,
+                                   atol=1e-12)
+
+
+def test_bounds(pairs):
+    for fit, direct, loc, sigma in pairs:
+        lb, ub = direct.determine_bounds()
+        np.testing.assert_allclose(fit.determine_bounds(), [loc + sigma * lb, loc + sigma * ub],
+                                   rtol=1e-5, atol=1e-5 * sigma * (ub - lb))
+
+
+def test_pdf(pairs):
+    for fit, direct, loc, sigma in pairs:
+        lb, ub = direct.determine_bounds()
+        y = lb + (ub - lb) * np.linspace(0.05, 0.95, 19)
+        x = loc + sigma * y
+        np.testing.assert_allclose(fit.pdf(x), direct.pdf(y), rtol=1e-4)
+        # the Jacobian 1 / sigma of the change of variables; the normalizing constants
+        # differ by the mass between the two bounds, each found to a tolerance, which is
+        # largest next to the poles of type 49
+        np.testing.assert_allclose(fit.pdf(x, normalized=True),
+                                   direct.pdf(y, normalized=True) / sigma, rtol=1e-4)
+        np.testing.assert_allclose(fit.log_pdf(x, normalized=True),
+                                   direct.log_pdf(y, normalized=True) - np.log(sigma),
+                                   atol=1e-4)
+        np.testing.assert_allclose(fit.normalize()[0], sigma * direct.normalize()[0],
+                                   rtol=1e-4)
+
+
+def test_normalized_out(pairs):
+    fit, _, loc, sigma = pairs[-1]
+    x = loc + sigma * np.linspace(-0.1, 0.1, 12).reshape(3, 4)
+    expected = fit.pdf(x, normalized=True)
+    out = np.empty_like(x)
+    assert fit.pdf(x, out=out, normalized=True) is out
+    np.testing.assert_array_equal(out, expected)
+    expected = fit.log_pdf(x, normalized=True)
+    assert fit.log_pdf(x, out=out, normalized=True) is out
+    np.testing.assert_array_equal(out, expected)
+    assert np.ndim(fit.pdf(loc, normalized=True)) == 0
+
+
+def test_sigma():
+    with pytest.raises(ValueError):
+        Pearson8.from_standard(Pearson8([0.0, 1.0, 0.0, 3.0, 0.0, 15.0, 0.0, 105.0]), 0.0, 0.0)
@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8
+from pearsondist.cdf8 import Cdf8
+from pearsondist.quadrature import adaptive_quad
+
+
+@pytest.fixture(scope='module')
+def fits(moments):
+    return {name: Pearson8(mom) for name, mom in moments.items()}
+
+
+def test_against_quadrature(fits):
+    for fit in fits.values():
+        lb, ub = fit.determine_bounds()
+        norm, _ = adaptive_quad(fit.pdf_obj.pdf, lb, ub)
+        x = lb + (ub - lb) * np.array([0.05, 0.3, 0.5, 0.7, 0.95])
+        expected = [adaptive_quad(fit.pdf_obj.pdf, lb, xi)[0] / norm for xi in x]
+        np.testing.assert_allclose(fit.cdf(x), expected, atol=1e-8)
+
+
+def test_ends(fits):
+    for fit in fits.values():
+        lb, ub = fit.determine_bounds()
+        assert fit.cdf(lb - 1) == 0.0 and fit.cdf(ub + 1) == 1.0
+        x = np.linspace(lb, ub, 1001)
+        assert (np.diff(fit.cdf(x)) >= 0).all()
+
+
+def test_infinite_support():
+    table = Cdf8(lambda x: np.exp(-x * x / 2), -np.inf, np.inf)
+    x = np.array([-3.0, -1.0, 0.0, 0.5, 2.0])
+    expected = [0.5 * (1 + math.erf(xi / math.sqrt(2))) for xi in x]
+    np.testing.assert_allclose(table.cdf(x), expected, atol=1e-9)
+    assert table.cdf(0.0).ndim == 0
+
+
+def test_table_cached(moments):
+    fit = Pearson8(moments['gamma'])
+    table = fit.cdf_table(atol=1e-6)
+    fit.cdf(0.0)
+    fit.ppf(0.5)
+    fit.rvs(10, rng=0)
+    assert fit.cdf_table() is table and table.atol == 1e-6
+    assert fit.cdf_table(atol=1e-10) is not table
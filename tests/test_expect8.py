@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8
+from pearsondist.expect8 import Expect8
+from pearsondist.quadrature import adaptive_quad, adaptive_rule
+
+
+@pytest.fixture(scope='module')
+def fits(moments):
+    return {name: Pearson8(mom) for name, mom in moments.items()}
+
+
+def quad_expect(fit, g, lb, ub):
+    # E[g(X)] by adaptive quadrature, for reference
+    f = fit.pdf_obj.pdf
+    return adaptive_quad(lambda x: g(x) * f(x), lb, ub)[0] / adaptive_quad(f, lb, ub)[0]
+
+
+@pytest.mark.parametrize('rule, rtol', [('adaptive', 1e-9), ('tanh-sinh', 1e-3),
+                                        ('gauss', 1e-3)])
+def test_against_quadrature(fits, rule, rtol):
+    for fit in fits.values():
+        lb, ub = fit.determine_bounds()
+        engine = fit.expectation(rule)
+        np.testing.assert_allclose(engine.weights.sum(), 1.0, rtol=rtol)
+        for g in (np.cos, lambda x: x * x, lambda x: np.exp(-x)):
+            np.testing.assert_allclose(fit.expect(g, rule), quad_expect(fit, g, lb, ub),
+                                       rtol=rtol, atol=rtol)
+
+
+def test_points(fits):
+    fit = fits['gamma']
+    m1 = fit.mom[0]
+    # the jump at m1 falls between nodes, unless split there
+    assert abs(fit.expect(lambda x: (x <= m1) * 1.0) - fit.cdf(m1)) > 1e-4
+    np.testing.assert_allclose(fit.expect(lambda x: (x <= m1) * 1.0, points=[m1]),
+                               fit.cdf(m1), atol=1e-9)
+    lb, ub = fit.determine_bounds()
+    f = fit.pdf_obj.pdf
+    expected = adaptive_quad(lambda x: (x - m1) * f(x), m1, ub)[0] / adaptive_quad(f, lb, ub)[0]
+    np.testing.assert_allclose(fit.expect(lambda x: np.maximum(x - m1, 0), points=[m1]),
+                               expected, rtol=1e-9)
+    # points outside the support are ignored
+    engine = fit.expectation(points=[m1, ub + 1.0])
+    assert engine.points == (m1, ub + 1.0)
+    np.testing.assert_allclose(engine.expect(lambda x: x), fit.expect(lambda x: x), rtol=1e-9)
+
+
+def test_shapes(fits):
+    fit = fits['student']
+    powers = fit.expect(lambda x: x ** np.arange(1, 5)[:, None])
+    assert powers.shape == (4,)
+    np.testing.assert_allclose(powers, [fit.expect(lambda x, n=n: x ** n) for n in range(1, 5)])
+    several = fit.expect([np.sin, lambda x: 1.0, lambda x: x])
+    assert several.shape == (3,)
+    np.testing.assert_allclose(several[1], 1.0)
+    assert isinstance(fit.expect(lambda x: x), float)
+
+
+def test_cached(fits):
+    fit = fits['beta']
+    engine = fit.expectation()
+    fit.expect(np.sin)
+    assert fit.expectation() is engine
+    assert fit.expectation(points=[0.0]) is not engine
+    assert fit.expectation(rule='gauss', n=51).nodes.shape == (51,)
+    with pytest.raises(ValueError):
+        Expect8(fit.pdf_obj.pdf, -1.0, 1.0, rule='simpson')
+
+
+def test_adaptive_rule():
+    f = lambda x: np.exp(-x * x) / (1 + x * x)
+    for lb, ub in [(-1.0, 2.0), (-np.inf, np.inf), (0.5, np.inf)]:
+        nodes, weights, values, _ = adaptive_rule(f, lb, ub)
+        np.testing.assert_allclose(values, f(nodes))
+        np.testing.assert_allclose(values @ weights, adaptive_quad(f, lb, ub)[0], rtol=1e-13)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from pearsondist import FitCache, Pearson8
+from pearsondist.fitcache import quantize
+from pearsondist.stdmom import destandardize
+
+
+def test_quantize(moments):
+    mom = moments['gamma']
+    assert quantize(mom) == quantize([m * (1 + 1e-14) for m in mom])
+    assert quantize(mom) != quantize([m * (1 + 1e-6) for m in mom])
+    assert quantize(mom) == quantize(mom + [1.0, 2.0])
+
+
+def test_hits(moments):
+    cache = FitCache(maxsize=2)
+    first = cache.fit(moments['normal'])
+    assert cache.fit(moments['normal']) is first
+    np.testing.assert_allclose(first.coef, Pearson8(moments['normal']).coef)
+    cache.fit(moments['gamma'])
+    cache.fit(moments['beta'])  # evicts normal, the least recently used
+    assert len(cache) == 2
+    assert cache.fit(moments['normal']) is not first
+    assert cache.info() == {'hits': 1, 'misses': 4, 'currsize': 2, 'maxsize': 2}
+    cache.clear()
+    assert cache.info() == {'hits': 0, 'misses': 0, 'currsize': 0, 'maxsize': 2}
+    with pytest.raises(ValueError):
+        FitCache(maxsize=0)
+
+
+def test_canonical(moments):
+    cache = FitCache(tol=1e-6, canonical=True)  # above the rounding of the round trips
+    std = moments['student']
+    for loc, sigma in [(0.0, 1.0), (2.0, 0.5), (-1.0, 3.0)]:
+        mom = destandardize(std, loc, sigma)
+        fit = cache.fit(mom)
+        np.testing.assert_allclose(fit.coef, Pearson8(mom).coef, rtol=1e-6, atol=1e-10)
+        np.testing.assert_allclose(fit.mom, mom)
+    assert len(cache) == 1 and cache.hits == 2
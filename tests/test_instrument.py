@@ -0,0 +1,64 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8, Pearson8Batch, instrument
+
+
+def test_batch_records(moment_matrix):
+    with instrument.record() as stats:
+        assert instrument.enabled()
+        batch = Pearson8Batch(moment_matrix)
+        batch.determine_bounds()
+    assert not instrument.enabled()
+    for name in ('mom_to_coef', 'roots', 'catalog', 'pfd', 'support', 'adjust_lb_ub'):
+        assert stats.timings[name] >= 0.0 and stats.calls[name] >= 1
+    assert stats.counts['newton_iterations'] > 0
+    types, n = np.unique(batch.type_no, return_counts=True)
+    assert stats.types == dict(zip(types.tolist(), n.tolist()))
+    records = stats.as_dict()
+    assert records['type.44'] == stats.types[44] and records['warnings'] == []
+
+
+def test_pearson8_records(moments):
+    stats = instrument.Stats()
+    for name in ('normal', 'beta'):
+        with instrument.record(stats):
+            fit = Pearson8(moments[name])
+            fit.determine_bounds()
+            fit.normalize()
+    assert stats.calls['support'] == stats.calls['normalize'] == 2
+    assert stats.types == {42: 1, 49: 1}
+    assert sum(v for k, v in stats.counts.items() if k.startswith('bound_')) == 4
+
+
+def test_disabled(moment_matrix, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('recorded outside of record()')
+
+    # no stage timer, counter or root type is made or touched
+    monkeypatch.setattr(instrument, '_Stage', fail)
+    monkeypatch.setattr(instrument.Stats, '__init__', fail)
+    assert not instrument.enabled()
+    assert instrument.stage('a') is instrument.stage('b')
+    batch = Pearson8Batch(moment_matrix)
+    batch.determine_bounds()
+    batch.moments(10)
+    fit = Pearson8(list(moment_matrix[0]))
+    fit.determine_bounds()
+    fit.normalize()
+
+
+def test_warnings():
+    with pytest.warns(UserWarning, match='first'):
+        with instrument.record() as stats:
+            warnings.warn('first')
+    assert stats.warnings == ['UserWarning: first']
+    # re-issued when the block raises too
+    with pytest.warns(UserWarning, match='second'), pytest.raises(ZeroDivisionError):
+        with instrument.record() as stats:
+            warnings.warn('second')
+            1 / 0
+    assert stats.warnings == ['UserWarning: second']
+    assert not instrument.enabled()
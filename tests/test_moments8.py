@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8, Pearson8Batch
+from pearsondist.moments8 import (natural_support, quad_moments, recurrence_moments,
+                                  trusted_orders)
+from pearsondist.pdf import Pdf
+from pearsondist.pfdecom4 import PFDecom4
+from pearsondist.rootcatalog4 import RootCatalog4
+
+
+@pytest.fixture(scope='module')
+def exact(roots):
+    """Moment vectors of densities of types 44 and 49, between their real roots"""
+    rng = np.random.default_rng(3)
+    out = []
+    for type_no in (44, 49):
+        for z in roots[type_no][:3]:
+            z = RootCatalog4(z).ordered_z
+            # c0 = 0.2, such that the density vanishes smoothly at the roots
+            coef = [rng.normal(0, 0.2)] + list((0.2 * np.poly(z).real / np.prod(-z).real)[::-1])
+            pdf = Pdf(PFDecom4(coef, z, type_no).pfd, coef).pdf
+            real = np.sort(z.real[z.imag == 0])
+            lb, ub = real[real < 0].max(), real[real > 0].min()
+            out.append((quad_moments(pdf, lb, ub, range(1, 13), rtol=1e-12), lb, ub))
+    return out
+
+
+def test_first_eight(moments):
+    for mom in moments.values():
+        fit = Pearson8(mom)
+        sigma = np.sqrt(mom[1] - mom[0] ** 2)
+        for k in (9, 12):
+            m = np.array(fit.moments(k))
+            assert len(m) == k
+            np.testing.assert_allclose(m[:8] / sigma ** np.arange(1, 9),
+                                       np.array(mom) / sigma ** np.arange(1, 9), atol=1e-6)
+
+
+def test_student():
+    # the lower orders stay those of the recurrence when a higher one is integrated
+    x = np.random.default_rng(12).standard_t(12, size=10 ** 6)
+    x -= x.mean()
+    mom = [np.mean(x ** p) for p in range(1, 9)]
+    np.testing.assert_allclose(Pearson8(mom).moments(10)[:8], mom, rtol=1e-6)
+
+
+def test_against_quadrature(exact):
+    for mom, _, _ in exact:
+        fit = Pearson8(list(mom[:8]))
+        np.testing.assert_allclose(fit.moments(12), mom, rtol=1e-6, atol=1e-9)
+
+
+def test_natural_support():
+    assert natural_support(np.array([-3.0, -1.0, 2.0, np.nan])) == (-1.0, 2.0)
+    assert natural_support(np.array([1.0, 2.0])) == (-np.inf, 1.0)
+    assert natural_support(np.array([np.nan] * 4)) == (-np.inf, np.inf)
+
+
+def test_trusted_orders():
+    std_mom = np.array([[0.0, 1.0, 0.5, 3.0, 1.0, 15.0],
+                        [0.0, 1.0, 0.5, 3.0, 1.0, 15.0],
+                        [0.0, 1.0, 0.5, 0.5, 1.0, 15.0]])
+    err = np.zeros_like(std_mom)
+    err[1, 4] = 1.0
+    np.testing.assert_array_equal(trusted_orders(std_mom, err), [6, 4, 3])
+    assert trusted_orders(std_mom[0], err[0]) == 6
+
+
+def test_recurrence_shapes(moment_matrix):
+    batch = Pearson8Batch(moment_matrix)
+    mom, err = recurrence_moments(batch.coef, 10, batch.mom[:, 0], batch.mom[:, 1])
+    assert mom.shape == err.shape == (len(batch), 10)
+    single, _ = recurrence_moments(batch.coef[0], 10, batch.mom[0, 0], batch.mom[0, 1])
+    np.testing.assert_allclose(single, mom[0])
+    with pytest.raises(ValueError):
+        recurrence_moments(batch.coef[0], 1)
+
+
+def test_batch(moment_matrix, exact):
+    rows = np.vstack([moment_matrix] + [mom[:8] for mom, _, _ in exact])
+    batch = Pearson8Batch(rows)
+    expected = np.array([Pearson8(list(mom)).moments(12) for mom in rows])
+    np.testing.assert_allclose(batch.moments(12), expected, rtol=1e-6, equal_nan=True)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8
+from pearsondist.quadrature import adaptive_quad
+
+
+@pytest.fixture(scope='module')
+def fits(moments):
+    out = {name: Pearson8(mom) for name, mom in moments.items()}
+    out['canonical'] = Pearson8.canonical(moments['gamma'])
+    return out
+
+
+def test_integrates_to_one(fits):
+    for fit in fits.values():
+        lb, ub = fit.determine_bounds()
+        total, _ = adaptive_quad(lambda x: fit.pdf(x, normalized=True), lb, ub)
+        np.testing.assert_allclose(total, 1.0, rtol=1e-8)
+
+
+def test_log_pdf(fits):
+    for fit in fits.values():
+        lb, ub = fit.determine_bounds()
+        x = lb + (ub - lb) * np.linspace(0.01, 0.99, 25)
+        np.testing.assert_allclose(fit.log_pdf(x, normalized=True),
+                                   np.log(fit.pdf(x, normalized=True)), rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(fit.log_pdf(x[3], normalized=True),
+                                   np.log(fit.pdf(x[3], normalized=True)), atol=1e-12)
+        np.testing.assert_allclose(fit.log_pdf(x, normalized=True),
+                                   fit.log_pdf(x) - fit.normalize()[1], atol=1e-12)
+
+
+def test_shared_constant(fits):
+    for fit in fits.values():
+        norm_const, log_norm_const = fit.normalize()
+        assert fit.normalize() == (norm_const, log_norm_const)
+        assert fit.cdf_table().norm_const == norm_const
+        assert fit.expectation(rule='gauss').norm_const == norm_const
+        lb, ub = fit.determine_bounds()
+        x = lb + (ub - lb) * np.array([0.2, 0.5, 0.8])
+        expected = [adaptive_quad(lambda y: fit.pdf(y, normalized=True), lb, xi)[0] for xi in x]
+        np.testing.assert_allclose(fit.cdf(x), expected, atol=1e-9)
+        np.testing.assert_allclose(fit.expect(lambda y: (y <= x[1]) * 1.0, points=[x[1]]),
+                                   expected[1], atol=1e-9)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8Batch
+from pearsondist.outofcore import fit_npy, load_columns, to_npz
+from pearsondist.pearson8batch import COLUMNS
+
+
+@pytest.fixture(scope='module')
+def src(moment_matrix, tmp_path_factory):
+    path = tmp_path_factory.mktemp('src') / 'moments.npy'
+    np.save(path, np.tile(moment_matrix, (3, 1)))
+    return path
+
+
+def assert_fitted(out_dir, src):
+    expected = Pearson8Batch(np.load(src))
+    expected.determine_bounds()
+    columns = load_columns(out_dir)
+    assert columns['done'].all()
+    for key, _, _ in COLUMNS:
+        np.testing.assert_array_equal(columns[key], getattr(expected, key), err_msg=key)
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_against_batch(src, tmp_path, n_jobs):
+    assert fit_npy(src, tmp_path, chunk_size=7, n_jobs=n_jobs) == 4
+    assert_fitted(tmp_path, src)
+
+
+def test_resume(src, tmp_path):
+    assert fit_npy(src, tmp_path, chunk_size=7, chunks=[1, 3]) == 2
+    assert load_columns(tmp_path)['done'].tolist() == [False, True, False, True]
+    assert fit_npy(src, tmp_path, chunk_size=7, chunks=[3]) == 0
+    assert fit_npy(src, tmp_path, chunk_size=7) == 2
+    assert_fitted(tmp_path, src)
+    with pytest.raises(ValueError):
+        fit_npy(src, tmp_path, chunk_size=8)
+    with pytest.raises(IndexError):
+        fit_npy(src, tmp_path, chunk_size=7, chunks=[4])
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_to_npz(src, tmp_path):
+    fit_npy(src, tmp_path / 'fits', chunk_size=100)
+    to_npz(tmp_path / 'fits', tmp_path / 'fits.npz', compressed=True)
+    with np.load(tmp_path / 'fits.npz') as packed:
+        for key, column in load_columns(tmp_path / 'fits').items():
+            np.testing.assert_array_equal(packed[key], column)
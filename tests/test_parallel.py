@@ -0,0 +1,56 @@
+import concurrent.futures
+
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8, Pearson8Batch, parallel
+from pearsondist.pearson8batch import COLUMNS
+from pearsondist.validate import FitStatus
+
+
+@pytest.fixture(scope='module')
+def rows(moment_matrix):
+    bad = np.array(moment_matrix[0])
+    bad[1] = -1.0  # negative variance
+    return np.vstack([moment_matrix, bad, moment_matrix])
+
+
+def assert_same(batch, expected):
+    for key, _, _ in COLUMNS:
+        value, other = getattr(batch, key), getattr(expected, key)
+        if other is None:
+            assert value is None, key
+        else:
+            np.testing.assert_array_equal(value, other, err_msg=key)
+
+
+@pytest.mark.parametrize('bounds', [True, False])
+def test_against_batch(rows, bounds):
+    expected = Pearson8Batch(rows)
+    if bounds:
+        expected.determine_bounds()
+    for n_jobs in (1, 2):
+        batch = parallel.fit_many(rows, n_jobs, chunk_size=4, bounds=bounds)
+        assert_same(batch, expected)
+        np.testing.assert_array_equal(batch.mom, expected.mom)
+
+
+def test_validate(rows):
+    n = len(rows) // 2
+    for n_jobs in (1, 2):
+        batch = Pearson8.fit_many(rows, n_jobs=n_jobs, validate=True)
+        assert batch.status[n] == FitStatus.VARIANCE
+        assert (np.delete(batch.status, n) == FitStatus.OK).all()
+
+
+def test_shared_pool(rows):
+    expected = parallel.fit_many(rows, 2)
+    with concurrent.futures.ProcessPoolExecutor(2) as pool:
+        for _ in range(2):
+            assert_same(parallel.fit_many(rows, 2, chunk_size=5, pool=pool), expected)
+
+
+def test_shape():
+    with pytest.raises(ValueError):
+        parallel.fit_many(np.zeros((4, 5)), 2)
+    assert len(parallel.fit_many(np.zeros((0, 8)), 2)) == 0
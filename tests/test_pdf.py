@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8
+from pearsondist.pdf import ddpdf_coef, eval_log_pdf, horner, log_pdf_terms
+
+
+@pytest.fixture(scope='module')
+def fits(moments):
+    return [Pearson8(mom) for mom in moments.values()]
+
+
+def grids(fit, shape=(5, 7)):
+    """A few grids of the same shape inside the support"""
+    lb, ub = fit.determine_bounds()
+    s = np.linspace(0.02, 0.98, np.prod(shape)).reshape(shape)
+    return [lb + (ub - lb) * s ** p for p in (1.0, 0.5, 2.0)]
+
+
+def test_pdf_buffers(fits):
+    for fit in fits:
+        xs = grids(fit)
+        out, work = np.empty_like(xs[0]), np.empty((3,) + xs[0].shape)
+        for x in xs:
+            expected = fit.pdf_obj.pdf(x)
+            assert fit.pdf_obj.pdf(x, out=out, work=work) is out
+            np.testing.assert_array_equal(out, expected)
+            assert fit.pdf_obj.log_pdf(x, out=out, work=work) is out
+            np.testing.assert_array_equal(out, fit.pdf_obj.log_pdf(x))
+            np.testing.assert_array_equal(fit.pdf_obj.pdf(x, work=work), expected)
+
+
+def test_eval_log_pdf_buffers(fits):
+    for fit in fits:
+        terms = log_pdf_terms(fit.pfd)
+        xs = grids(fit, (11,))
+        out, work = np.empty(11), np.empty((3, 11))
+        for x in xs:
+            expected = eval_log_pdf(x, terms)
+            # out is overwritten, not accumulated into
+            out[:] = np.nan
+            assert eval_log_pdf(x, terms, out, work) is out
+            np.testing.assert_array_equal(out, expected)
+            np.testing.assert_allclose(expected - fit.pdf_obj.scale,
+                                       [fit.pdf_obj.log_pdf(float(xi)) for xi in x],
+                                       rtol=1e-12, atol=1e-12)
+
+
+def test_normalized_buffers(fits):
+    fit = fits[0]
+    x = grids(fit)[0]
+    out, work = np.empty_like(x), np.empty((3,) + x.shape)
+    expected = fit.pdf(x, normalized=True)
+    assert fit.pdf(x, out, work, normalized=True) is out
+    np.testing.assert_array_equal(out, expected)
+
+
+def derivs_before(pdf_obj, x):
+    """dpdf and ddpdf as computed before eval_derivs, from the expanded polynomials"""
+    a, c0, c1, c2, c3, c4 = pdf_obj.coef
+    den = c0 + c1 * x + c2 * (x ** 2) + c3 * (x ** 3) + c4 * (x ** 4)
+    dpdf = - ((a + x) / den) * pdf_obj.pdf(x)
+    num = (a + x) * den
+    den2 = ((3 * c4) * x ** 4
+            + (2 * c3 + 4 * c4 * a) * x ** 3
+            + (c2 + 3 * c3 * a + 1) * x ** 2
+            + 2 * a * (c2 + 1) * x
+            + (a ** 2 + c1 * a - c0))
+    return dpdf, dpdf / (- num / den2)
+
+
+def test_eval_derivs(fits):
+    for fit in fits:
+        pdf_obj = fit.pdf_obj
+        x = grids(fit)[0]
+        log_pdf, pdf, dpdf, ddpdf = pdf_obj.eval_derivs(x)
+        assert all(v.shape == x.shape for v in (log_pdf, pdf, dpdf, ddpdf))
+        np.testing.assert_allclose(log_pdf, pdf_obj.log_pdf(x), rtol=1e-14)
+        np.testing.assert_allclose(pdf, pdf_obj.pdf(x), rtol=1e-14)
+        before = derivs_before(pdf_obj, x)
+        np.testing.assert_allclose(dpdf, before[0], rtol=1e-10)
+        np.testing.assert_allclose(ddpdf, before[1], rtol=1e-8,
+                                   atol=1e-10 * np.abs(ddpdf).max())
+        np.testing.assert_array_equal(pdf_obj.dpdf(x), dpdf)
+        # central differences
+        lb, ub = fit.determine_bounds()
+        h = 1e-4 * (ub - lb)
+        up, down = pdf_obj.pdf(x + h), pdf_obj.pdf(x - h)
+        np.testing.assert_allclose(dpdf, (up - down) / (2 * h), rtol=1e-4,
+                                   atol=1e-5 * np.abs(dpdf).max())
+        np.testing.assert_allclose(ddpdf, (up - 2 * pdf + down) / h ** 2, rtol=1e-4,
+                                   atol=1e-4 * np.abs(ddpdf).max())
+
+
+def test_eval_derivs_orders(fits):
+    pdf_obj = fits[0].pdf_obj
+    full = pdf_obj.eval_derivs(np.array([[0.3, -0.2], [0.0, 1.1]]))
+    for x in (0.3, np.float64(0.3), np.array(0.3)):
+        for order in (0, 1, 2):
+            values = pdf_obj.eval_derivs(x, order)
+            assert len(values) == order + 2
+            assert all(np.ndim(v) == 0 for v in values)
+            np.testing.assert_allclose(values, [v[0, 0] for v in full[:order + 2]],
+                                       rtol=1e-14)
+    for order in (-1, 3, 1.5):
+        with pytest.raises(ValueError):
+            pdf_obj.eval_derivs(0.3, order)
+
+
+def test_horner(fits):
+    x = np.linspace(-2.0, 2.0, 9)
+    for p in ([2.0], [1.0, -3.0], [3.0, 0.5, -1.0, 2.0, 0.25]):
+        np.testing.assert_allclose(horner(p, x), np.polyval(p, x), rtol=1e-14)
+        assert horner(p, 0.7) == pytest.approx(np.polyval(p, 0.7), rel=1e-14)
+    coef = np.array([fit.pdf_obj.coef for fit in fits])
+    p = ddpdf_coef(coef)
+    assert p.shape == (len(fits), 5)
+    for i, fit in enumerate(fits):
+        np.testing.assert_array_equal(ddpdf_coef(fit.pdf_obj.coef), p[i])
+        np.testing.assert_allclose(horner(p[i], x), fit.pdf_obj.ddpdf_num(x), rtol=1e-14)
@@ -0,0 +1,17 @@
+import numpy as np
+
+from pearsondist import Pearson8
+
+
+def test_lazy(moments):
+    for mom in moments.values():
+        fit = Pearson8(mom)
+        assert not {'coef', 'roots', 'type_no', 'pfd', 'pdf_obj'} & fit.__dict__.keys()
+        # the root type without the partial fractions or the density
+        assert fit.type_no in (42, 44, 49) and len(fit.roots) == 4
+        assert 'pfd' not in fit.__dict__ and 'pdf_obj' not in fit.__dict__
+        assert fit.pfd['type'] == fit.type_no
+        assert 'pdf_obj' not in fit.__dict__
+        fit.determine_bounds()
+        assert fit.pdf_obj is fit.__dict__['pdf_obj']
+        np.testing.assert_array_equal(fit.coef, Pearson8(mom).coef)
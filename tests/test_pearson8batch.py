@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8, Pearson8Batch
+from pearsondist.validate import FitStatus
+
+
+@pytest.fixture(scope='module')
+def batch(moment_matrix):
+    batch = Pearson8Batch(moment_matrix)
+    batch.determine_bounds()
+    return batch
+
+
+def test_types(batch):
+    assert {42, 44, 49} <= set(batch.type_no.tolist())
+
+
+def test_against_pearson8(batch, moment_matrix):
+    for i, mom in enumerate(moment_matrix):
+        fit = Pearson8(list(mom))
+        assert batch.status[i] == FitStatus.OK
+        assert batch.type_no[i] == fit.type_no
+        np.testing.assert_allclose(batch.coef[i], fit.coef, rtol=1e-8)
+        np.testing.assert_allclose(batch.roots[i], fit.roots, rtol=1e-8)
+        np.testing.assert_allclose(batch.scale[i], fit.pdf_obj.scale, rtol=1e-8, atol=1e-12)
+        lb, ub = fit.determine_bounds()
+        width = ub - lb
+        assert abs(batch.lower_bound[i] - lb) <= 1e-4 * width
+        assert abs(batch.upper_bound[i] - ub) <= 1e-4 * width
+
+
+def test_pdf(batch, moment_matrix):
+    x = np.linspace(-2, 2, 41)
+    values = batch.pdf(x)
+    for i, mom in enumerate(moment_matrix):
+        np.testing.assert_allclose(values[i], Pearson8(list(mom)).pdf(x), rtol=1e-8)
+
+
+def test_pdf_per_row_grid(batch):
+    grid = batch.lower_bound[:, None] + np.linspace(0.1, 0.9, 9) * (
+        batch.upper_bound - batch.lower_bound)[:, None]
+    shared = np.array([batch.pdf(row)[i] for i, row in enumerate(grid)])
+    np.testing.assert_allclose(batch.pdf(grid), shared)
+
+
+def test_bad_rows(moment_matrix):
+    mom = np.vstack([moment_matrix[:2], np.full(8, np.nan), moment_matrix[2:3]])
+    batch = Pearson8Batch(mom)
+    assert batch.status[2] == FitStatus.NONFINITE
+    assert np.isnan(batch.coef[2]).all() and batch.type_no[2] == 0
+    np.testing.assert_allclose(batch.coef[[0, 1, 3]], Pearson8Batch(mom[[0, 1, 3]]).coef)
+
+
+def test_shape():
+    with pytest.raises(ValueError):
+        Pearson8Batch(np.zeros((3, 7)))
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from pearsondist.pfdecom4 import PFD_RESIDUES, PFDecom4, pfd_dict, pfd_residues_many
+from pearsondist.rootcatalog4 import RootCatalog4
+
+
+def coef_of(z, rng):
+    # a, c0, ..., c4 of Q with roots z
+    c4 = rng.uniform(0.5, 2) * rng.choice([-1, 1])
+    return np.concatenate([[rng.normal()], (np.poly(z).real * c4)[::-1]])
+
+
+@pytest.mark.parametrize('type_no', range(41, 50))
+def test_against_pfdecom4(roots, type_no):
+    rng = np.random.default_rng(type_no)
+    z = np.array([RootCatalog4(zi).ordered_z for zi in roots[type_no]])
+    coef = np.array([coef_of(zi, rng) for zi in z])
+    residues = pfd_residues_many(type_no, z, coef)
+    for zi, ci, ri in zip(z, coef, residues):
+        expected = PFDecom4(list(ci), zi, type_no).pfd
+        pfd = pfd_dict(type_no, zi, ri)
+        assert pfd.keys() == expected.keys()
+        for key in PFD_RESIDUES[type_no]:
+            np.testing.assert_allclose(pfd[key], expected[key], rtol=1e-8, atol=1e-12)
+        assert np.isnan(ri[len(PFD_RESIDUES[type_no]):]).all()
+
+
+def test_unknown_type():
+    with pytest.raises(ValueError):
+        pfd_residues_many(40, np.zeros((1, 4)), np.ones((1, 6)))
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8
+
+
+@pytest.fixture(scope='module')
+def fits(moments):
+    return {name: Pearson8(mom) for name, mom in moments.items()}
+
+
+def test_round_trip(fits):
+    q = np.linspace(0.001, 0.999, 99)
+    for fit in fits.values():
+        x = fit.ppf(q)
+        assert (np.diff(x) > 0).all()
+        np.testing.assert_allclose(fit.cdf(x), q, atol=1e-9)
+        lb, ub = fit.determine_bounds()
+        x = np.linspace(lb, ub, 21)[1:-1]
+        np.testing.assert_allclose(fit.ppf(fit.cdf(x)), x, atol=1e-6 * (ub - lb))
+
+
+def test_ends(fits):
+    fit = fits['beta']
+    lb, ub = fit.determine_bounds()
+    assert fit.ppf(0.0) == lb and fit.ppf(1.0) == ub
+    assert np.isnan(fit.ppf([-0.1, 1.1])).all()
+    assert fit.ppf(0.5).ndim == 0
+    assert fit.ppf(np.full((2, 3), 0.5)).shape == (2, 3)
+
+
+@pytest.mark.parametrize('method', ['inverse', 'rejection'])
+def test_rvs(fits, method):
+    for name in ('normal', 'gamma', 'beta', 'bimodal'):
+        fit = fits[name]
+        x = fit.rvs(200000, rng=1, method=method)
+        mom = fit.expect(lambda y: y ** np.arange(1, 5)[:, None])
+        var = mom[1] - mom[0] ** 2
+        # within five standard errors of the mean and variance of the density
+        assert abs(x.mean() - mom[0]) < 5 * np.sqrt(var / len(x))
+        assert abs(np.mean(x ** 2) - mom[1]) < 5 * np.sqrt((mom[3] - mom[1] ** 2) / len(x))
+
+
+def test_rvs_reproducible(fits):
+    fit = fits['student']
+    np.testing.assert_array_equal(fit.rvs((3, 4), rng=7), fit.rvs((3, 4), rng=7))
+    with pytest.raises(ValueError):
+        fit.rvs(3, method='other')
@@ -0,0 +1,42 @@
+import numpy as np
+
+from pearsondist.quartic import polish_roots, quartic_roots
+
+
+def test_against_numpy():
+    rng = np.random.default_rng(0)
+    p = rng.normal(size=(200, 5))
+    z = quartic_roots(p)
+    for pi, zi in zip(p, z):
+        np.testing.assert_allclose(zi, np.roots(pi), rtol=1e-12, atol=1e-12)
+
+
+def test_single(roots):
+    for type_no, sets in roots.items():
+        for z in sets:
+            p = np.poly(z).real
+            np.testing.assert_allclose(quartic_roots(p), quartic_roots(p[None])[0])
+            if type_no in (42, 44, 49):  # distinct roots
+                np.testing.assert_allclose(np.sort_complex(quartic_roots(p)),
+                                           np.sort_complex(z), atol=1e-10)
+
+
+def test_degenerate():
+    p = np.array([[0.0, 1, -3, 2, 0], [1, 0, 0, 0, -1], [0, 0, 0, 1, -2]])
+    z = quartic_roots(p)
+    np.testing.assert_allclose(np.sort(z[0, :3].real), [0, 1, 2], atol=1e-12)
+    assert np.isnan(z[0, 3])
+    np.testing.assert_allclose(z[1], np.roots(p[1]))
+    np.testing.assert_allclose(z[2, 0], 2.0)
+    assert np.isnan(z[2, 1:]).all()
+
+
+def test_polish(roots):
+    z = roots[44][0]
+    p = np.poly(z).real
+    seeds = z + 1e-4 * np.array([1, -1, 1j, -1j])
+    polished, converged = polish_roots(p, seeds)
+    assert converged
+    np.testing.assert_allclose(polished, z, rtol=1e-12)
+    _, converged = polish_roots(p, seeds, iter_max=1)
+    assert not converged
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8, instrument
+from pearsondist.stdmom import destandardize
+
+NORMAL = np.array([0.0, 1.0, 0.0, 3.0, 0.0, 15.0, 0.0, 105.0])
+
+
+def nearby(mom, t=1e-3):
+    """Moments of the mixture with weight t of a normal of the same variance"""
+    mom = np.asarray(mom)
+    return list((1 - t) * mom + t * NORMAL * mom[1] ** (np.arange(1, 9) / 2))
+
+
+def assert_same_fit(fit, cold):
+    assert fit.type_no == cold.type_no
+    np.testing.assert_allclose(fit.roots, cold.roots, rtol=1e-10, atol=1e-12)
+    lb, ub = cold.determine_bounds()
+    np.testing.assert_allclose(fit.determine_bounds(), (lb, ub), rtol=0,
+                               atol=1e-4 * (ub - lb))
+
+
+@pytest.mark.parametrize('name, type_no', [('normal', 42), ('student', 42), ('gamma', 44),
+                                           ('lognormal', 44), ('beta', 49),
+                                           ('bimodal', 49)])
+def test_warm(moments, name, type_no):
+    fit = Pearson8(moments[name])
+    fit.determine_bounds()
+    mom = nearby(moments[name])
+    with instrument.record() as stats:
+        warm = fit.refit(mom)
+        warm.determine_bounds()
+    cold = Pearson8(mom)
+    assert cold.type_no == type_no
+    assert stats.counts['refit_warm'] == 1 and 'refit_cold' not in stats.counts
+    assert_same_fit(warm, cold)
+    # the extrema of dpdf searched from those of this fit, if bounded from them
+    cold.determine_bounds()
+    if cold.support_obj.argmax_dpdf is not None:
+        np.testing.assert_allclose(warm.support_obj.warm_extrema(fit.support_obj),
+                                   [cold.support_obj.argmax_dpdf,
+                                    cold.support_obj.argmin_dpdf], rtol=1e-8)
+    # this fit is left unchanged
+    np.testing.assert_array_equal(fit.mom, moments[name])
+
+
+def test_type_change(moments):
+    fit = Pearson8(moments['gamma'])
+    fit.determine_bounds()
+    with instrument.record() as stats:
+        new = fit.refit(moments['beta'])
+    assert stats.counts['refit_cold'] == 1 and 'refit_warm' not in stats.counts
+    assert (fit.type_no, new.type_no) == (44, 49)
+    assert_same_fit(new, Pearson8(moments['beta']))
+
+
+def test_repeated_roots(moments):
+    # Newton from the type 44 roots of gamma ends up twice on the same real root
+    fit = Pearson8(moments['gamma'])
+    mom = nearby(moments['gamma'], 1e-2)
+    with instrument.record() as stats:
+        new = fit.refit(mom)
+    assert stats.counts['refit_cold'] == 1
+    assert_same_fit(new, Pearson8(mom))
+
+
+def test_canonical(moments):
+    loc, sigma = 2.0, 0.5
+    fit = Pearson8.canonical(destandardize(moments['gamma'], loc, sigma))
+    fit.determine_bounds()
+    mom = destandardize(nearby(moments['gamma']), loc, sigma)
+    with instrument.record() as stats:
+        new = fit.refit(mom)
+    assert stats.counts['refit_warm'] == 1
+    assert new.standard is not None
+    cold = Pearson8.canonical(mom)
+    np.testing.assert_allclose([new.loc, new.sigma], [cold.loc, cold.sigma])
+    assert_same_fit(new, cold)
+    assert_same_fit(new.standard, cold.standard)
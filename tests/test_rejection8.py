@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8
+from pearsondist.rejection8 import Rejection8
+
+
+@pytest.fixture(scope='module')
+def fits(moments):
+    return {name: Pearson8(mom) for name, mom in moments.items()}
+
+
+def test_support(fits):
+    for fit in fits.values():
+        lb, ub = fit.determine_bounds()
+        sampler = Rejection8(fit.pdf_obj, lb, ub)
+        x = sampler.rvs((200, 50), rng=3)
+        assert x.shape == (200, 50)
+        assert (x >= lb).all() and (x <= ub).all()
+
+
+def test_acceptance_rate(fits):
+    for name in ('normal', 'gamma', 'beta', 'bimodal'):
+        fit = fits[name]
+        lb, ub = fit.determine_bounds()
+        sampler = Rejection8(fit.pdf_obj, lb, ub)
+        assert math.isnan(sampler.acceptance_rate)
+        sampler.rvs(50000, rng=4)
+        assert sampler.n_accepted >= 50000
+        # the area under the density over that of the envelope
+        rate = fit.normalize()[0] / (sampler.height * (ub - lb))
+        assert abs(sampler.acceptance_rate - rate) < 5 * math.sqrt(
+            rate * (1 - rate) / sampler.n_proposed)
+    fit = fits['student']
+    fit.rvs(100, rng=5, method='rejection')
+    assert fit.rejection_sampler().n_proposed > 0
+
+
+def test_envelope(fits):
+    for fit in fits.values():
+        lb, ub = fit.determine_bounds()
+        sampler = Rejection8(fit.pdf_obj, lb, ub)
+        x = np.linspace(lb, ub, 2001)
+        assert fit.pdf_obj.pdf(x).max() <= sampler.height * (1 + 1e-12)
+
+
+def test_unbounded(fits):
+    fit = fits['gamma']
+    lb, ub = fit.determine_bounds()
+    with pytest.raises(NotImplementedError):
+        Rejection8(fit.pdf_obj, -np.inf, ub)
+    with pytest.raises(NotImplementedError):
+        Rejection8(fit.pdf_obj, lb, np.nan)
+    # type 49 with -a the argmin: the density has poles at the roots
+    fit = fits['beta']
+    real = np.sort(fit.roots.real[fit.roots.imag == 0])
+    with np.errstate(divide='ignore'), pytest.raises(NotImplementedError):
+        Rejection8(fit.pdf_obj, real[real < 0].max(), real[real > 0].min())
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8, Rolling8
+from pearsondist.rolling8 import rolling_power_sums
+
+
+@pytest.fixture(scope='module')
+def series():
+    rng = np.random.default_rng(5)
+    return np.concatenate([rng.standard_t(8, size=3000), rng.gamma(4, size=3000) - 4,
+                           rng.normal(size=3000)]) + 50.0
+
+
+def test_power_sums(series):
+    window, step = 700, 130
+    sums = rolling_power_sums(series - 50, window, 8, step)
+    for i, start in enumerate(range(0, len(series) - window + 1, step)):
+        x = series[start:start + window] - 50
+        np.testing.assert_allclose(sums[i], [np.sum(x ** p) for p in range(1, 9)],
+                                   rtol=1e-9)
+    assert len(sums) == len(range(0, len(series) - window + 1, step))
+
+
+def test_against_pearson8(series):
+    window, step = 2000, 500
+    rolling = Rolling8(series, window, step)
+    for i in range(len(rolling)):
+        x = series[i * step:i * step + window]
+        loc, sigma = x.mean(), x.std()
+        np.testing.assert_allclose([rolling.loc[i], rolling.sigma[i]], [loc, sigma],
+                                   rtol=1e-10)
+        z = (x - loc) / sigma
+        fit = Pearson8.from_standard(Pearson8([np.mean(z ** p) for p in range(1, 9)]), loc,
+                                     sigma)
+        assert rolling.type_no[i] == fit.type_no
+        np.testing.assert_allclose(rolling.coef[i], fit.coef, rtol=1e-6, atol=1e-8)
+        lb, ub = fit.determine_bounds()
+        np.testing.assert_allclose([rolling.lower_bound[i], rolling.upper_bound[i]], [lb, ub],
+                                   rtol=1e-4)
+
+
+def test_flat_window():
+    x = np.concatenate([np.zeros(20), np.random.default_rng(0).normal(size=40)])
+    rolling = Rolling8(x, 15, 5, bounds=False)
+    assert rolling.type_no[0] == 0 and np.isnan(rolling.coef[0]).all()
+    with pytest.raises(ValueError):
+        Rolling8(x, 8)
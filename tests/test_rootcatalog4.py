@@ -0,0 +1,33 @@
+import numpy as np
+
+from pearsondist.rootcatalog4 import RootCatalog4, catalog_roots, keeps_type
+
+
+def test_against_rootcatalog4(roots):
+    rng = np.random.default_rng(1)
+    z = np.array([rng.permutation(zi) for sets in roots.values() for zi in sets])
+    type_no, ordered_z = catalog_roots(z)
+    for i, zi in enumerate(z):
+        catalog = RootCatalog4(zi)
+        assert type_no[i] == catalog.type_no
+        np.testing.assert_array_equal(ordered_z[i], catalog.ordered_z)
+
+
+def test_types(roots):
+    for no, sets in roots.items():
+        type_no, _ = catalog_roots(np.array(sets))
+        assert (type_no == no).all()
+
+
+def test_odd_complex():
+    type_no, ordered_z = catalog_roots([[1, 2, 3 + 1j, 4]])
+    assert type_no[0] == 0
+    assert np.isnan(ordered_z[0]).all()
+
+
+def test_keeps_type(roots):
+    for no in (42, 44, 49):
+        z = RootCatalog4(roots[no][0]).ordered_z
+        assert keeps_type(z, no)
+    z = RootCatalog4(roots[44][0]).ordered_z
+    assert not keeps_type(z[[0, 0, 2, 3]], 44)
@@ -0,0 +1,160 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from pearsondist import Pearson8Batch, Support8
+from pearsondist.adjust_lb_ub import adjust_lb_ub, adjust_lb_ub_many, real_roots
+from pearsondist.pdf import Pdf
+from pearsondist.pfdecom4 import PFDecom4
+from pearsondist.rootcatalog4 import RootCatalog4
+from pearsondist.support8 import BoundStatus, newton_bisect, support_bounds, u_bounds_many
+
+
+def pdf_of(z, type_no, a=0.1):
+    # un-normalized PDF whose denominator, of c0 = 1, has the roots z
+    z = RootCatalog4(z).ordered_z
+    coef = [a] + list((np.poly(z).real / np.prod(-z).real)[::-1])
+    return Pdf(PFDecom4(coef, z, type_no).pfd, coef)
+
+
+@pytest.fixture(scope='module')
+def batch(moment_matrix):
+    batch = Pearson8Batch(moment_matrix)
+    batch.determine_bounds()
+    return batch
+
+
+def test_batch_against_support8(batch):
+    for i in range(len(batch)):
+        pfd = batch.pfd(i)
+        support = Support8(Pdf(pfd, list(batch.coef[i])))
+        lb, ub = adjust_lb_ub(support.lower_bound, support.upper_bound, pfd)
+        width = ub - lb
+        assert abs(batch.lower_bound[i] - lb) <= 1e-4 * width
+        assert abs(batch.upper_bound[i] - ub) <= 1e-4 * width
+        assert tuple(batch.bound_status[i]) == support.status
+    assert BoundStatus.ROOT in batch.bound_status  # the beta and bimodal fits
+
+
+def test_adjust_lb_ub(roots):
+    for type_no, sets in roots.items():
+        for z in sets:
+            pfd = pdf_of(z, type_no).pfd
+            for lb, ub in [(-5.0, 5.0), (-1.5, 1.5), (-0.5, 0.5), (-np.inf, np.inf)]:
+                lbub = adjust_lb_ub(lb, ub, pfd)
+                assert all(type(v) is float for v in lbub)
+                many = adjust_lb_ub_many([lb], [ub], [real_roots(pfd)])
+                assert lbub == [many[0][0], many[1][0]]
+    with pytest.raises(ValueError):
+        adjust_lb_ub(0.5, 1.0, pdf_of(roots[44][0], 44).pfd)
+
+
+def test_adjust_type_44():
+    # both real roots on one side of 0 lower the upper bound only
+    pfd = pdf_of(np.array([1.0, 2.0, 1 + 1j, 1 - 1j]), 44).pfd
+    assert adjust_lb_ub(-3.0, 3.0, pfd) == [-3.0, 1.0 - 1e-5]
+    assert adjust_lb_ub(-3.0, 0.5, pfd) == [-3.0, 0.5]
+    pfd = pdf_of(np.array([-2.0, -1.0, 1 + 1j, 1 - 1j]), 44).pfd
+    assert adjust_lb_ub(-3.0, 3.0, pfd) == [-1.0 + 1e-5, 3.0]
+
+
+def test_newton_bisect():
+    c = np.array([2.0, 9.0, 0.5, 4.0, -1.0])
+
+    def ratio(x, k):
+        return (x * x - c[k]) / (2 * x)
+
+    def fun(x, k):
+        return x * x - c[k]
+
+    x0 = np.array([1.0, 1.0, 1.0, 1.0, 1.0])
+    lo = np.array([0.5, 0.5, 0.1, 3.0, 0.5])
+    hi = np.array([3.0, 4.0, 2.0, 5.0, 3.0])
+    x, status, n_iter = newton_bisect(ratio, x0, lo, hi, fun, eps=1e-12, iter_max=50)
+    np.testing.assert_allclose(x[:3], np.sqrt(c[:3]), rtol=1e-12)
+    assert (status[:3] == BoundStatus.CONVERGED).all() and (n_iter[:3] > 0).all()
+    # no zero in [3, 5], the first Newton step leaves it; no real zero at all
+    assert status[3] == BoundStatus.CLIPPED and x[3] == 3.0
+    assert status[4] == BoundStatus.CLIPPED
+    _, status, n_iter = newton_bisect(ratio, x0[:1], lo[:1], hi[:1], fun, eps=1e-12,
+                                      iter_max=2)
+    assert status[0] == BoundStatus.MAX_ITER and n_iter[0] == 2
+    _, status, _ = newton_bisect(lambda x, k: np.full(len(k), np.nan), x0, lo, hi)
+    assert (status == BoundStatus.FAILED).all()
+    # the scalar Support8.newton_bisect agrees
+    support = Support8.__new__(Support8)
+    x, status, n_iter = newton_bisect(ratio, x0, lo, hi, fun, eps=1e-12, iter_max=50)
+    for k in range(5):
+        xk, sk, nk = support.newton_bisect(lambda y: ratio(y, k), x0[k], lo[k], hi[k],
+                                           lambda y: fun(y, k), eps=1e-12, iter_max=50)
+        assert (sk, nk) == (status[k], n_iter[k])
+        np.testing.assert_allclose(xk, x[k], rtol=1e-12)
+
+
+def test_u_bounds_many():
+    roots = np.array([[-3.0, -1.0, 2.0, np.nan],
+                      [1.0, 2.0, np.nan, np.nan],
+                      [np.nan] * 4])
+    lb, ub = u_bounds_many(roots, margin=0.0)
+    np.testing.assert_array_equal(lb, [-1.0, -np.inf, -np.inf])
+    np.testing.assert_array_equal(ub, [2.0, 1.0, np.inf])
+    lb, ub = u_bounds_many(roots[:1])
+    np.testing.assert_allclose([lb[0], ub[0]], [-1.0 + 1e-7, 2.0 - 1e-7])
+
+
+@pytest.mark.filterwarnings('ignore::UserWarning')
+def test_support_bounds(roots):
+    for type_no in (41, 42, 44, 49):
+        for z in roots[type_no]:
+            pdf_obj = pdf_of(z, type_no)
+            real = np.full(4, np.nan)
+            x = real_roots(pdf_obj.pfd)
+            real[:len(x)] = x
+            lb, ub, status = support_bounds([pdf_obj.coef], [type_no], [real])
+            try:
+                support = Support8(pdf_obj)
+            except NotImplementedError:
+                # types 41 and 42 with -a the argmin, no real root to bound the support,
+                # or no extrema of dpdf to search it from
+                assert np.isnan([lb[0], ub[0]]).all()
+                assert (status == BoundStatus.FAILED).all()
+                continue
+            assert tuple(status[0]) == support.status
+            np.testing.assert_allclose([lb[0], ub[0]],
+                                       [support.lower_bound, support.upper_bound],
+                                       rtol=1e-6)
+            if type_no == 49:
+                assert support.status == (BoundStatus.ROOT, BoundStatus.ROOT)
+                below, above = x[x < 0].max(), x[x > 0].min()
+                np.testing.assert_allclose([lb[0], ub[0]], [below + 1e-7, above - 1e-7])
+
+
+def test_root_bounds(roots):
+    support = Support8.__new__(Support8)
+    support.pdf_obj = pdf_of(roots[42][0], 42)
+    support.coef = support.pdf_obj.coef
+    with pytest.raises(NotImplementedError):
+        support.root_bounds()
+    # type 44, both real roots above 0: no lower root bound
+    support.pdf_obj = pdf_of(np.array([1.0, 2.0, 1 + 1j, 1 - 1j]), 44, a=-0.5)
+    support.coef = support.pdf_obj.coef
+    lb, ub = support.root_bounds()
+    assert lb == -np.inf and ub == 1.0 - 1e-7
+
+
+def test_effective_check():
+    support = Support8.__new__(Support8)
+    support.coef = [0.1, 1.0, 0.0, 0.0, 0.0, 0.0]
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        support.effective_check(-1.0, 1.0)
+    with pytest.warns(UserWarning):
+        support.effective_check(-0.05, 1.0)
+    # 0 outside of the support, -a inside
+    support.coef[0] = -0.7
+    with pytest.raises(ValueError):
+        support.effective_check(0.5, 1.0)
+    support.coef[0] = 0.7
+    with pytest.raises(ValueError):
+        support.effective_check(-1.0, -0.5)
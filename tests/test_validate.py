@@ -0,0 +1,49 @@
+import numpy as np
+
+from pearsondist import Pearson8, Pearson8Batch
+from pearsondist.validate import FitStatus, hankel_min_eig, screen
+
+TWO_POINT = [0.0, 1.0, 0.0, 1.0, 0.0, 1.0, 0.0, 1.0]  # +-1 with equal weights
+NORMAL = [0.0, 1.0, 0.0, 3.0, 0.0, 15.0, 0.0, 105.0]
+
+
+def test_screen(moments):
+    good = moments['gamma']
+    rows = np.array([good,
+                     good[:3] + [np.nan] + good[4:],
+                     [0.0, -1.0] + good[2:],
+                     [0.0, 1.0, 2.0, 3.0] + good[4:],
+                     [0.0, 1.0, 0.0, 3.0, 0.0, 1.0, 0.0, 1.0]])
+    expected = [FitStatus.OK, FitStatus.NONFINITE, FitStatus.VARIANCE, FitStatus.KURTOSIS,
+                FitStatus.HANKEL]
+    np.testing.assert_array_equal(screen(rows), expected)
+    assert hankel_min_eig(rows[3:])[1] < 0
+
+
+def test_batch_status(moment_matrix):
+    rows = np.vstack([moment_matrix, TWO_POINT, NORMAL, [np.inf] + TWO_POINT[1:]])
+    batch = Pearson8Batch(rows)
+    n = len(moment_matrix)
+    assert (batch.status[:n] == FitStatus.OK).all()
+    np.testing.assert_array_equal(batch.status[n:], [FitStatus.SINGULAR,
+                                                     FitStatus.UNCLASSIFIED,
+                                                     FitStatus.NONFINITE])
+    assert np.isnan(batch.coef[[n, n + 2]]).all() and (batch.type_no[n:] == 0).all()
+    assert np.isnan(batch.masked('coef')[n:].filled(np.nan)).all()
+    validated = Pearson8Batch(rows, validate=True)
+    np.testing.assert_array_equal(validated.status, batch.status)
+
+
+def test_coefficients(moment_matrix):
+    batch = Pearson8Batch(moment_matrix)
+    for i, mom in enumerate(moment_matrix):
+        np.testing.assert_allclose(batch.coef[i], Pearson8(list(mom)).coef, rtol=1e-9)
+
+
+def test_nearly_singular():
+    rows = np.array(TWO_POINT) * (1 + 1e-14 * np.arange(8)[None, :] * [[1], [-1]])
+    batch = Pearson8Batch(rows)
+    assert (batch.status == FitStatus.SINGULAR).all() and np.isnan(batch.coef).all()
+    batch.status[:] = FitStatus.OK
+    batch.mom_to_coef(rcond=0.0)
+    assert (batch.status == FitStatus.OK).all() and np.isfinite(batch.coef).all()